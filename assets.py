@@ -0,0 +1,190 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+except ImportError:  # optional: without it only .gz variants are written
+    brotli = None
+
+BUILD_DIR = 'dist'
+MANIFEST = 'manifest.json'
+
+# Text formats worth precompressing; images are already compressed
+COMPRESSIBLE = {'.css', '.js', '.svg', '.json', '.txt'}
+FINGERPRINTED = COMPRESSIBLE | {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2'}
+
+ONE_YEAR = 365 * 24 * 3600
+
+
+# ============================================================================
+# Minifiers (conservative: whitespace and comments only)
+# ============================================================================
+def minify_css(source):
+    source = re.sub(r'/\*.*?\*/', '', source, flags=re.S)
+    source = re.sub(r'\s+', ' ', source)
+    # Not around ':' before a selector ("a :hover") nor '+'/'-' (calc())
+    source = re.sub(r'\s*([{};,>])\s*', r'\1', source)
+    source = re.sub(r':\s+', ':', source)
+    return source.replace(';}', '}').strip()
+
+
+def minify_js(source):
+    # Lines are kept so automatic semicolon insertion behaves the same
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if line and not line.startswith('//'):
+            lines.append(line)
+    return '\n'.join(lines)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# ============================================================================
+# Build step
+# ============================================================================
+def _source_files(static_folder, skip):
+    skip = {path.strip('/') for path in skip}
+    for root, dirs, files in os.walk(static_folder):
+        dirs[:] = [d for d in dirs
+                   if os.path.relpath(os.path.join(root, d), static_folder).replace(os.sep, '/') not in skip]
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in FINGERPRINTED:
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, static_folder).replace(os.sep, '/')
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def build(static_folder, exclude=()):
+    """Minify, fingerprint and precompress every asset under `static_folder`.
+
+    Output goes to <static>/dist/ as name.<hash>.ext (+ .gz / .br), with a
+    manifest mapping each original filename to its built one. Folders in
+    `exclude` (paths relative to `static_folder`) are left alone. The
+    previous build's files are kept, since cached pages still link to them;
+    older ones are deleted. Returns the manifest.
+    """
+    out = os.path.join(static_folder, BUILD_DIR)
+    previous = _read_manifest(out)
+
+    manifest = {}
+    for filename in _source_files(static_folder, {BUILD_DIR, *exclude}):
+        base, ext = os.path.splitext(filename)
+        with open(os.path.join(static_folder, filename), 'rb') as f:
+            data = f.read()
+
+        minifier = MINIFIERS.get(ext.lower())
+        if minifier:
+            data = minifier(data.decode('utf-8')).encode('utf-8')
+
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        built = f'{BUILD_DIR}/{base}.{digest}{ext}'
+        path = os.path.join(static_folder, built)
+        _write(path, data)
+
+        if ext.lower() in COMPRESSIBLE:
+            _write(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli is not None:
+                _write(path + '.br', brotli.compress(data, quality=11))
+
+        manifest[filename] = built
+
+    _write(os.path.join(out, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    _prune(static_folder, {*manifest.values(), *previous.values()})
+    return manifest
+
+
+def _read_manifest(out):
+    try:
+        with open(os.path.join(out, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _prune(static_folder, keep):
+    """Delete built files (and their .gz/.br) that neither of the last two builds produced"""
+    out = os.path.join(static_folder, BUILD_DIR)
+    for root, dirs, files in os.walk(out, topdown=False):
+        for name in files:
+            path = os.path.join(root, name)
+            built = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            if name != MANIFEST and built.removesuffix('.gz').removesuffix('.br') not in keep:
+                os.remove(path)
+        if root != out and not os.listdir(root):
+            os.rmdir(root)
+
+
+# ============================================================================
+# Serving
+# ============================================================================
+class StaticAssets:
+    """Serves the built assets in place of Flask's default static handler.
+
+    url_for('static', filename='css/style.css') is rewritten to the
+    fingerprinted file from the manifest, which is then sent with a
+    one-year immutable Cache-Control. When the client accepts br/gzip the
+    precompressed sibling is sent instead. Without a build (development),
+    URLs and caching behave exactly as before.
+    """
+
+    def __init__(self, app=None, immutable=()):
+        self.manifest = {}
+        self.immutable = (BUILD_DIR + '/',)
+        if app is not None:
+            self.init_app(app, immutable)
+
+    def init_app(self, app, immutable=()):
+        # Other content-addressed folders (e.g. image derivatives) cached the same way
+        self.immutable = (BUILD_DIR + '/',) + tuple(immutable)
+        self.static_folder = app.static_folder
+        self.load()
+        app.url_defaults(self.fingerprint_url)
+        app.view_functions['static'] = self.send_static
+
+    def load(self):
+        path = os.path.join(self.static_folder, BUILD_DIR, MANIFEST)
+        try:
+            with open(path, encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        except FileNotFoundError:
+            self.manifest = {}
+        return self.manifest
+
+    def fingerprint_url(self, endpoint, values):
+        if endpoint == 'static' and values.get('filename') in self.manifest:
+            values['filename'] = self.manifest[values['filename']]
+
+    def _encoded_variant(self, filename):
+        accepted = request.accept_encodings
+        for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if accepted[encoding] and os.path.isfile(os.path.join(self.static_folder, filename + suffix)):
+                return encoding, filename + suffix
+        return None, filename
+
+    def send_static(self, filename):
+        if not filename.startswith(self.immutable):
+            return send_from_directory(self.static_folder, filename)
+
+        encoding, path = self._encoded_variant(filename)
+        mimetype = mimetypes.guess_type(filename)[0]
+        response = send_from_directory(self.static_folder, path, mimetype=mimetype, max_age=ONE_YEAR)
+        if encoding:
+            response.content_encoding = encoding
+        if os.path.splitext(filename)[1].lower() in COMPRESSIBLE:
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
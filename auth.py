@@ -0,0 +1,129 @@
+from collections import namedtuple
+from functools import wraps
+
+from flask import flash, g, redirect, session, url_for
+from sqlalchemy import event
+from werkzeug.local import LocalProxy
+
+from cache import LRUCache
+
+
+class SignedInUser(namedtuple('SignedInUser', 'id username email role is_admin')):
+    """Read-only copy of the User columns that views and templates need.
+
+    Plain data, so it can be cached between requests (and pickled into
+    Redis) without dragging a detached ORM instance along.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.email, user.role, bool(user.is_admin))
+
+    def is_coordinator(self):
+        return self.role == 'coordinator'
+
+
+class UserCache:
+    """Signed-in users by id, so most requests skip the user query.
+
+    Entries are dropped when a flush that changed or deleted the User
+    commits. With the default in-process backend, other workers notice
+    only when their copy expires after `ttl` seconds; point CACHE_URL at
+    Redis to share invalidations. Set-based UPDATEs bypass the flush hooks
+    and must call invalidate() themselves.
+    """
+
+    def __init__(self, backend=None, ttl=60, prefix='user:'):
+        self.backend = backend or LRUCache(max_entries=10000)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.session = None
+        self.model = None
+
+    def configure(self, backend, ttl=None):
+        self.backend = backend
+        if ttl is not None:
+            self.ttl = ttl
+
+    def watch(self, session, model):
+        """Load misses through `session`; forget `model` rows changed in it"""
+        self.session = session
+        self.model = model
+
+        @event.listens_for(session, 'after_flush')
+        def collect_changed_users(sess, flush_context):
+            changed = sess.info.setdefault('users_changed', set())
+            changed.update(obj.id for obj in list(sess.dirty) + list(sess.deleted) if isinstance(obj, model))
+
+        @event.listens_for(session, 'after_commit')
+        def forget_changed_users(sess):
+            self.invalidate(*sess.info.pop('users_changed', ()))
+
+        @event.listens_for(session, 'after_rollback')
+        def keep_cached_users(sess):
+            sess.info.pop('users_changed', None)
+
+    def invalidate(self, *user_ids):
+        for user_id in user_ids:
+            self.backend.delete(f'{self.prefix}{user_id}')
+
+    def get(self, user_id):
+        key = f'{self.prefix}{user_id}'
+        user = self.backend.get(key)
+        if user is None:
+            row = self.session.get(self.model, user_id)
+            if row is None:
+                return None
+            user = SignedInUser.from_user(row)
+            self.backend.set(key, user, ttl=self.ttl)
+        return user
+
+
+user_cache = UserCache()
+
+
+def load_current_user():
+    """The signed-in user for this request (or None), looked up at most once.
+
+    Only the user id lives in the session, so a changed role or username
+    takes effect on the next request instead of at the next login.
+    """
+    if 'current_user' not in g:
+        import models  # noqa: F401  (hooks the User table up to user_cache)
+
+        user_id = session.get('user_id')
+        g.current_user = user_cache.get(user_id) if user_id is not None else None
+    return g.current_user
+
+
+current_user = LocalProxy(load_current_user)
+
+
+# ============================================================================
+# View decorators
+# ============================================================================
+def login_required(message='Please login to continue', category='warning'):
+    """Redirect anonymous visitors (and deleted accounts) to the login page"""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_user:
+                flash(message, category)
+                return redirect(url_for('main.login'))
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def admin_required(view):
+    """Send anyone but a signed-in admin to the login page"""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not current_user or not current_user.is_admin:
+            return redirect(url_for('main.login'))
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,12 @@
+"""Synthetic data and route benchmarks.
+
+    DATABASE_URL=sqlite:///bench.db flask --app app init-db
+    DATABASE_URL=sqlite:///bench.db flask --app app seed-data --rows 100000
+    DATABASE_URL=sqlite:///bench.db flask --app app benchmark --save-baseline
+    DATABASE_URL=sqlite:///bench.db flask --app app benchmark --mode http
+
+A run without --save-baseline compares against the stored baseline for its
+mode and exits non-zero on a regression, or when there is no baseline. The
+committed baselines were recorded on `seed-data --rows 20000 --seed 1`
+(1 CPU); re-record them with --save-baseline when the hardware changes.
+"""
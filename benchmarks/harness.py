@@ -0,0 +1,228 @@
+import http.cookiejar
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .seed import ADMIN, PASSWORD
+
+# Measured signed in as the seeded admin, so every page is rendered rather
+# than served from the anonymous page cache
+ROUTES = (
+    ('index', '/'),
+    ('questions', '/questions'),
+    ('community', '/community'),
+    ('members', '/members'),
+    ('search_members', '/search_members?q=union'),
+    ('gallery', '/gallery'),
+    ('volunteer', '/volunteer'),
+    ('search', '/search?q=festival'),
+    ('admin_dashboard', '/admin/dashboard'),
+    ('admin_users', '/admin/users'),
+    ('admin_announcements', '/admin/announcements'),
+    ('admin_volunteers', '/admin/volunteers'),
+)
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return None
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(seconds, statements=None, errors=0):
+    ms = sorted(value * 1000 for value in seconds)
+    summary = {
+        'requests': len(ms),
+        'errors': errors,
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+    }
+    if statements:
+        summary['queries'] = max(statements)
+    return summary
+
+
+# ============================================================================
+# Memory
+# ============================================================================
+def rss_mb(pid):
+    """Resident set size of a process in MB (Linux /proc), or None"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        return None
+    return None
+
+
+def children_of(parent_pid):
+    pids = []
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return pids
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # pid (comm) state ppid ...; comm may contain spaces
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == parent_pid:
+            pids.append(int(entry))
+    return pids
+
+
+# ============================================================================
+# In-process: the Flask test client, with exact SQL counts
+# ============================================================================
+def run_client(app, routes=ROUTES, requests=50, warmup=3):
+    """Time each route through the test client; counts the SQL statements of every request"""
+    client = app.test_client()
+    client.post('/login', data={'username': ADMIN, 'password': PASSWORD})
+
+    executed = [0]
+
+    def count_statement(*args):
+        executed[0] += 1
+
+    results = {}
+    event.listen(Engine, 'before_cursor_execute', count_statement)
+    try:
+        for name, path in routes:
+            for _ in range(warmup):
+                client.get(path)
+            seconds, statements, errors = [], [], 0
+            for _ in range(requests):
+                executed[0] = 0
+                started = time.perf_counter()
+                response = client.get(path)
+                seconds.append(time.perf_counter() - started)
+                statements.append(executed[0])
+                errors += response.status_code != 200
+            results[name] = summarize(seconds, statements, errors)
+    finally:
+        event.remove(Engine, 'before_cursor_execute', count_statement)
+    return {'routes': results, 'rss_mb': {'client': rss_mb(os.getpid())}}
+
+
+# ============================================================================
+# Over HTTP: gunicorn in a subprocess, driven by concurrent clients
+# ============================================================================
+def start_server(database_url, port, workers=2, threads=4, timeout=30):
+    """gunicorn (gunicorn.conf.py) on 127.0.0.1:`port` against `database_url`"""
+    env = dict(os.environ, DATABASE_URL=database_url, BIND=f'127.0.0.1:{port}',
+               WEB_CONCURRENCY=str(workers), WEB_THREADS=str(threads))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application'],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}")
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/login', timeout=1).close()
+            return server
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"gunicorn did not answer on port {port} within {timeout}s")
+
+
+def signed_in_opener(base_url):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    form = urllib.parse.urlencode({'username': ADMIN, 'password': PASSWORD}).encode()
+    opener.open(base_url + '/login', data=form, timeout=30).close()
+    return opener
+
+
+def run_http(base_url, routes=ROUTES, requests=200, concurrency=8, warmup=5, server_pid=None):
+    """Time each route with `concurrency` clients sharing one signed-in session"""
+    opener = signed_in_opener(base_url)
+
+    def fetch(path):
+        started = time.perf_counter()
+        try:
+            with opener.open(base_url + path, timeout=60) as response:
+                response.read()
+                ok = response.status == 200
+        except (urllib.error.URLError, ConnectionError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for name, path in routes:
+            list(pool.map(fetch, [path] * warmup))
+            started = time.perf_counter()
+            timings = list(pool.map(fetch, [path] * requests))
+            elapsed = time.perf_counter() - started
+            summary = summarize([seconds for seconds, _ in timings], errors=sum(not ok for _, ok in timings))
+            summary['requests_per_second'] = round(requests / elapsed, 1)
+            results[name] = summary
+
+    rss = {}
+    if server_pid is not None:
+        rss = {f'worker-{pid}': rss_mb(pid) for pid in children_of(server_pid)}
+    return {'routes': results, 'rss_mb': rss}
+
+
+# ============================================================================
+# Baselines
+# ============================================================================
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(results, baseline, tolerance=0.25, slack_ms=2.0):
+    """Regressions against `baseline`, as readable lines (empty when none).
+
+    A route regresses when its p95 exceeds the baseline by more than
+    `tolerance` (plus `slack_ms`, so sub-millisecond pages don't flap), or
+    when it runs more SQL statements than before. Memory regresses when
+    the largest process grows by more than `tolerance`.
+    """
+    problems = []
+    for name, now in results['routes'].items():
+        before = baseline['routes'].get(name)
+        if before is None:
+            continue
+        limit = before['p95_ms'] * (1 + tolerance) + slack_ms
+        if now['p95_ms'] > limit:
+            problems.append(f"{name}: p95 {now['p95_ms']:.1f} ms, limit {limit:.1f} ms "
+                            f"(baseline {before['p95_ms']:.1f} ms)")
+        if now.get('queries', 0) > before.get('queries', now.get('queries', 0)):
+            problems.append(f"{name}: {now['queries']} SQL statements per request, baseline {before['queries']}")
+        if now['errors'] > before.get('errors', 0):
+            problems.append(f"{name}: {now['errors']} failed requests")
+
+    rss_now = [mb for mb in results['rss_mb'].values() if mb]
+    rss_before = [mb for mb in baseline.get('rss_mb', {}).values() if mb]
+    if rss_now and rss_before and max(rss_now) > max(rss_before) * (1 + tolerance):
+        problems.append(f"memory: {max(rss_now):.0f} MB per process, baseline {max(rss_before):.0f} MB")
+    return problems
@@ -0,0 +1,245 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from extensions import db, passwords
+
+# Every seeded account signs in with this password; the admin is `bench-admin`
+PASSWORD = 'benchmark'
+ADMIN = 'bench-admin'
+
+BATCH_SIZE = 5000
+HISTORY_DAYS = 3 * 365
+
+WORDS = (
+    'ojoto union meeting community school fees volunteer event town hall project road water church market '
+    'harvest festival youth women elders scholarship students exam library clinic health donation fund '
+    'committee chapter members dues report update plan support visit families culture language heritage '
+    'football tournament music dance new year welcome help question answer idea proposal vote budget '
+    'minutes agenda chairman secretary treasurer president lagos houston atlanta dallas chicago home'
+).split()
+LOCATIONS = ('Houston, TX', 'Dallas, TX', 'Atlanta, GA', 'Chicago, IL', 'Newark, NJ', 'Baltimore, MD', 'Onitsha')
+PROFESSIONS = ('Engineer', 'Nurse', 'Teacher', 'Accountant', 'Pharmacist', 'Trader', 'Student', 'Lawyer')
+QUESTION_CATEGORIES = ('general', 'education', 'events', 'membership', 'finance')
+POST_CATEGORIES = ('general', 'events', 'help', 'ideas', 'announcements')
+APPLICATION_STATUSES = ('pending', 'approved', 'rejected')
+
+# Children per parent row, as (possible counts, weights): skewed like real
+# threads, where most get a few replies and a handful get dozens
+ANSWERS = (range(0, 16), (8, 14, 16, 15, 12, 9, 7, 5, 4, 3, 2, 2, 1, 1, 1, 1))
+REPLIES = (range(0, 21), (5, 8, 10, 11, 11, 10, 9, 8, 6, 5, 4, 3, 3, 2, 2, 1, 1, 1, 1, 1, 1))
+COMMENTS = (range(0, 13), (10, 15, 16, 14, 12, 10, 7, 5, 4, 3, 2, 1, 1))
+APPLICATIONS = (range(0, 31), [30 - n for n in range(31)])
+
+# Top-level rows per user
+PER_USER = {
+    'announcement': 0.05,
+    'question': 0.5,
+    'discussion': 0.1,
+    'community_post': 0.2,
+    'volunteer_opportunity': 0.02,
+    'member_profile': 0.6,
+}
+# Rows per user all told: their own, 0.6 profiles, and their share of the
+# rows above with the children each brings (about 4 answers per question)
+ROWS_PER_USER = 6
+
+
+class Generator:
+    """Deterministic synthetic rows for every content table.
+
+    Rows are written with Core INSERTs in batches, which skips the ORM
+    write hooks; seed() rebuilds the counters and search index afterwards.
+    """
+
+    def __init__(self, users, seed=1):
+        self.users = users
+        self.rng = random.Random(seed)
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self.password_hash = passwords.hash(PASSWORD)
+        self.written = {}
+
+    def text(self, low, high):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def title(self):
+        return self.text(3, 8).rstrip('.')
+
+    def moment(self, after=None):
+        start = after or self.now - timedelta(days=HISTORY_DAYS)
+        span = max(1, int((self.now - start).total_seconds()))
+        return start + timedelta(seconds=self.rng.randrange(span))
+
+    def count(self, name):
+        return max(1, round(self.users * PER_USER[name]))
+
+    def fanout(self, spec):
+        counts, weights = spec
+        return self.rng.choices(counts, weights)[0]
+
+    def insert(self, model, rows):
+        rows = iter(rows)
+        table = model.__table__
+        total = 0
+        while True:
+            batch = [row for _, row in zip(range(BATCH_SIZE), rows)]
+            if not batch:
+                break
+            db.session.execute(insert(table), batch)
+            total += len(batch)
+        self.written[table.name] = self.written.get(table.name, 0) + total
+
+    def username(self, user_id):
+        return ADMIN if user_id == 1 else f'member{user_id}'
+
+    def author(self):
+        user_id = self.rng.randint(1, self.users)
+        return user_id, self.username(user_id)
+
+    # ------------------------------------------------------------------
+    def users_rows(self):
+        for user_id in range(1, self.users + 1):
+            yield {
+                'id': user_id, 'username': self.username(user_id), 'email': f'{self.username(user_id)}@example.org',
+                'password_hash': self.password_hash,
+                'role': 'coordinator' if self.rng.random() < 0.05 else 'student',
+                'is_admin': user_id == 1 or self.rng.random() < 0.002,
+                'created_at': self.moment(),
+            }
+
+    def profile_rows(self):
+        chosen = self.rng.sample(range(1, self.users + 1), self.count('member_profile'))
+        for profile_id, user_id in enumerate(chosen, 1):
+            created_at = self.moment()
+            yield {
+                'id': profile_id, 'user_id': user_id, 'full_name': self.title(),
+                'phone': f'555-{self.rng.randrange(10000):04d}', 'location': self.rng.choice(LOCATIONS),
+                'profession': self.rng.choice(PROFESSIONS), 'bio': self.text(10, 40),
+                'is_public': self.rng.random() < 0.9, 'created_at': created_at, 'updated_at': self.moment(created_at),
+            }
+
+    def announcement_rows(self):
+        for announcement_id in range(1, self.count('announcement') + 1):
+            yield {
+                'id': announcement_id, 'title': self.title(), 'content': self.text(20, 120),
+                'author': self.author()[1], 'created_at': self.moment(), 'is_urgent': self.rng.random() < 0.1,
+            }
+
+    def thread_rows(self, parent_count, parent_row, child_row, child_spec):
+        """(parents, children) batches for a parent table whose rows get `child_spec` children each"""
+        child_id = 0
+        for first in range(1, parent_count + 1, BATCH_SIZE):
+            parents, children = [], []
+            for parent_id in range(first, min(first + BATCH_SIZE, parent_count + 1)):
+                parent = parent_row(parent_id)
+                parents.append(parent)
+                for _ in range(self.fanout(child_spec)):
+                    child_id += 1
+                    children.append(child_row(child_id, parent))
+            yield parents, children
+
+    def questions_and_answers(self):
+        def question(question_id):
+            user_id, author = self.author()
+            return {
+                'id': question_id, 'title': self.title() + '?', 'content': self.text(15, 80),
+                'category': self.rng.choice(QUESTION_CATEGORIES), 'author': author, 'user_id': user_id,
+                'created_at': self.moment(), 'is_resolved': self.rng.random() < 0.3,
+                'is_urgent': self.rng.random() < 0.05,
+            }
+
+        def answer(answer_id, parent):
+            user_id, author = self.author()
+            return {
+                'id': answer_id, 'content': self.text(10, 60), 'author': author, 'user_id': user_id,
+                'question_id': parent['id'], 'created_at': self.moment(parent['created_at']),
+                'is_accepted': parent['is_resolved'] and self.rng.random() < 0.3,
+            }
+
+        return self.thread_rows(self.count('question'), question, answer, ANSWERS)
+
+    def discussions_and_replies(self):
+        def discussion(discussion_id):
+            user_id, author = self.author()
+            return {
+                'id': discussion_id, 'title': self.title(), 'content': self.text(20, 100),
+                'topic': self.rng.choice(POST_CATEGORIES), 'author': author, 'user_id': user_id,
+                'created_at': self.moment(),
+            }
+
+        def reply(reply_id, parent):
+            user_id, author = self.author()
+            return {
+                'id': reply_id, 'content': self.text(5, 50), 'author': author, 'user_id': user_id,
+                'discussion_id': parent['id'], 'created_at': self.moment(parent['created_at']),
+            }
+
+        return self.thread_rows(self.count('discussion'), discussion, reply, REPLIES)
+
+    def posts_and_comments(self):
+        def post(post_id):
+            return {
+                'id': post_id, 'title': self.title(), 'content': self.text(20, 120), 'author': self.author()[1],
+                'category': self.rng.choice(POST_CATEGORIES), 'created_at': self.moment(),
+                'is_pinned': self.rng.random() < 0.02,
+            }
+
+        def comment(comment_id, parent):
+            return {
+                'id': comment_id, 'content': self.text(5, 40), 'author': self.author()[1],
+                'post_id': parent['id'], 'created_at': self.moment(parent['created_at']),
+            }
+
+        return self.thread_rows(self.count('community_post'), post, comment, COMMENTS)
+
+    def opportunities_and_applications(self):
+        def opportunity(opportunity_id):
+            created_at = self.moment()
+            return {
+                'id': opportunity_id, 'title': self.title(), 'description': self.text(30, 150),
+                'organization': self.title(), 'location': self.rng.choice(LOCATIONS),
+                'contact_email': f'volunteer{opportunity_id}@example.org', 'skills_needed': self.text(3, 10),
+                'time_commitment': f'{self.rng.randint(1, 20)} hours/week', 'is_urgent': self.rng.random() < 0.15,
+                'is_active': self.rng.random() < 0.8, 'created_by': self.author()[1],
+                'created_at': created_at, 'updated_at': created_at,
+            }
+
+        def application(application_id, parent):
+            user_id = self.rng.randint(1, self.users)
+            return {
+                'id': application_id, 'opportunity_id': parent['id'], 'applicant_name': self.title(),
+                'applicant_email': f'{self.username(user_id)}@example.org', 'message': self.text(10, 60),
+                'skills': self.text(2, 8), 'status': self.rng.choices(APPLICATION_STATUSES, (6, 3, 1))[0],
+                'applied_at': self.moment(parent['created_at']),
+            }
+
+        return self.thread_rows(self.count('volunteer_opportunity'), opportunity, application, APPLICATIONS)
+
+
+def seed(rows, seed=1):
+    """Fill an empty database with about `rows` rows. Returns rows written per table."""
+    from models import (Announcement, Answer, CommunityComment, CommunityPost, Discussion, DiscussionReply,
+                        MemberProfile, Question, User, VolunteerApplication, VolunteerOpportunity, counters,
+                        search_index)
+
+    generator = Generator(max(2, rows // ROWS_PER_USER), seed)
+    generator.insert(User, generator.users_rows())
+    generator.insert(MemberProfile, generator.profile_rows())
+    generator.insert(Announcement, generator.announcement_rows())
+    for parent_model, child_model, batches in (
+        (Question, Answer, generator.questions_and_answers()),
+        (Discussion, DiscussionReply, generator.discussions_and_replies()),
+        (CommunityPost, CommunityComment, generator.posts_and_comments()),
+        (VolunteerOpportunity, VolunteerApplication, generator.opportunities_and_applications()),
+    ):
+        for parents, children in batches:
+            generator.insert(parent_model, parents)
+            generator.insert(child_model, children)
+    db.session.commit()
+
+    # The Core INSERTs skipped the write hooks; derive their data in one pass each
+    counters.reconcile(db.session)
+    search_index.rebuild(db.session)
+    return generator.written
@@ -0,0 +1,107 @@
+"""Startup benchmark: how long a worker takes to import, build and serve.
+
+Each phase runs in a fresh interpreter so module caches don't hide costs:
+
+    python benchmarks/startup.py            # 10 runs per phase
+    python benchmarks/startup.py --runs 20 --budget-ms 400 --importtime
+
+--budget-ms fails the run (exit 1) if the median of `import app` +
+create_app() exceeds it. --importtime lists the slowest modules.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each snippet prints a JSON dict of phase -> seconds
+PHASES = {
+    'import': """
+import time
+t0 = time.perf_counter()
+import app
+print(json.dumps({'import': time.perf_counter() - t0}))
+""",
+    'create_app': """
+import time
+import app
+t0 = time.perf_counter()
+application = app.create_app()
+print(json.dumps({'create_app': time.perf_counter() - t0}))
+""",
+    'first_request': """
+import time
+import app
+application = app.create_app()
+client = application.test_client()
+t0 = time.perf_counter()
+response = client.get('/')
+assert response.status_code == 200, response.status_code
+print(json.dumps({'first_request': time.perf_counter() - t0}))
+""",
+}
+
+
+def run_phase(code, env):
+    result = subprocess.run(
+        [sys.executable, '-c', 'import json\n' + code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(env, limit=15):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app; app.create_app()'],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--budget-ms', type=float, help='fail if median import + create_app exceeds this')
+    parser.add_argument('--importtime', action='store_true', help='show the slowest imports')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # A throwaway database so the first-request phase never touches a real one
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tmp, 'startup.db')}")
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'init-db'],
+                       cwd=ROOT, env=env, capture_output=True, check=True)
+
+        # One warm-up so .pyc compilation isn't counted
+        run_phase(PHASES['import'], env)
+
+        medians = {}
+        for phase, code in PHASES.items():
+            timings = [run_phase(code, env)[phase] * 1000 for _ in range(args.runs)]
+            medians[phase] = statistics.median(timings)
+            print(f"⏱️  {phase:<14} median {medians[phase]:7.1f} ms   "
+                  f"min {min(timings):7.1f} ms   max {max(timings):7.1f} ms")
+
+        if args.importtime:
+            print("\nSlowest imports (cumulative / self, ms):")
+            for cumulative_us, self_us, name in slowest_imports(env):
+                print(f"  {cumulative_us / 1000:7.1f} {self_us / 1000:7.1f}  {name}")
+
+    startup = medians['import'] + medians['create_app']
+    print(f"\n🚀 Worker startup (import + create_app): {startup:.1f} ms")
+    if args.budget_ms is not None and startup > args.budget_ms:
+        print(f"❌ Over budget ({args.budget_ms:.0f} ms)")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
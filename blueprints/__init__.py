@@ -0,0 +1,12 @@
+from importlib import import_module
+
+# One package per area of the site. Each declares its URLs and a Policy
+# (cache TTL, page size, primary or replica reads) in its __init__, keeps
+# its list/aggregate queries in queries.py and its view functions in
+# views.py, which is only imported when the first request is dispatched.
+BLUEPRINTS = ['main', 'qa', 'community', 'members', 'gallery', 'volunteer', 'admin']
+
+
+def register_blueprints(app):
+    for name in BLUEPRINTS:
+        app.register_blueprint(import_module(f'blueprints.{name}').bp)
@@ -0,0 +1,17 @@
+from blueprints.base import Policy, make_blueprint
+
+# Admin panel: never cached (pages are per-user anyway), always current
+URLS = [
+    ('/dashboard', 'dashboard', None),
+    ('/users', 'users', None),
+    ('/announcements', 'announcements', None),
+    ('/volunteers', 'volunteers', None),
+    ('/jobs', 'job_metrics', None),
+    ('/export/<kind>', 'export', None),
+    ('/import', 'import_data', ['GET', 'POST']),
+    ('/moderate/<kind>', 'moderate', ['POST']),
+    ('/archive', 'archive', ['GET', 'POST']),
+    ('/archive/<name>', 'archived_rows', None),
+]
+
+bp = make_blueprint('admin', __name__, Policy(page_size=50), URLS, url_prefix='/admin')
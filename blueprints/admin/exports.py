@@ -0,0 +1,127 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from extensions import db
+from models import Announcement, User, VolunteerApplication, VolunteerOpportunity
+
+# Rows fetched (and written out) per round trip
+BATCH_SIZE = 1000
+
+
+class Export:
+    """A downloadable table: its columns, the date the range filter applies
+    to, and the query-string filters it accepts (name -> (column, type))"""
+
+    def __init__(self, columns, date_column, filters=None, joins=()):
+        self.columns = columns
+        self.date_column = date_column
+        self.filters = filters or {}
+        self.joins = joins
+
+    @property
+    def names(self):
+        return [column.key for column in self.columns]
+
+    def statement(self, args):
+        """SELECT for the request's filters, in index order so rows stream as they are read.
+
+        `since` and `until` are dates (YYYY-MM-DD), both inclusive. Raises
+        ValueError for a filter value that doesn't parse.
+        """
+        statement = select(*self.columns)
+        for target, onclause in self.joins:
+            statement = statement.join(target, onclause)
+        if args.get('since'):
+            statement = statement.where(self.date_column >= parse_date(args['since']))
+        if args.get('until'):
+            statement = statement.where(self.date_column < parse_date(args['until']) + timedelta(days=1))
+        for name, (column, kind) in self.filters.items():
+            if args.get(name):
+                statement = statement.where(column == kind(args[name]))
+        primary_key = self.columns[0]
+        return statement.order_by(self.date_column, primary_key).execution_options(yield_per=BATCH_SIZE)
+
+
+def parse_date(value):
+    try:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time())
+    except ValueError:
+        raise ValueError(f"Dates are YYYY-MM-DD, got {value!r}") from None
+
+
+def parse_flag(value):
+    return value.lower() in ('1', 'true', 'yes')
+
+
+# password_hash is never exported
+EXPORTS = {
+    'users': Export(
+        [User.id, User.username, User.email, User.role, User.is_admin, User.created_at],
+        User.created_at,
+        {'role': (User.role, str), 'admin': (User.is_admin, parse_flag)},
+    ),
+    'announcements': Export(
+        [Announcement.id, Announcement.title, Announcement.author, Announcement.is_urgent,
+         Announcement.created_at, Announcement.content],
+        Announcement.created_at,
+        {'urgent': (Announcement.is_urgent, parse_flag)},
+    ),
+    'applications': Export(
+        [VolunteerApplication.id, VolunteerApplication.opportunity_id,
+         VolunteerOpportunity.title.label('opportunity'), VolunteerApplication.applicant_name,
+         VolunteerApplication.applicant_email, VolunteerApplication.applicant_phone, VolunteerApplication.skills,
+         VolunteerApplication.status, VolunteerApplication.applied_at, VolunteerApplication.message],
+        VolunteerApplication.applied_at,
+        {'status': (VolunteerApplication.status, str), 'opportunity': (VolunteerApplication.opportunity_id, int)},
+        joins=[(VolunteerOpportunity, VolunteerApplication.opportunity_id == VolunteerOpportunity.id)],
+    ),
+}
+
+
+# ============================================================================
+# Encoders: each yields the header (if any) at once, then one chunk per batch
+# ============================================================================
+def _cell(value):
+    # Spreadsheets run cells starting with these as formulas
+    if isinstance(value, str) and value[:1] in ('=', '+', '-', '@', '\t', '\r'):
+        return "'" + value
+    return value
+
+
+def csv_chunks(names, statement):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(names)
+    yield drain()
+    for rows in db.session.execute(statement).partitions():
+        writer.writerows([_cell(value) for value in row] for row in rows)
+        yield drain()
+
+
+def _json_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot export {type(value).__name__}")
+
+
+def ndjson_chunks(names, statement):
+    for rows in db.session.execute(statement).partitions():
+        yield ''.join(json.dumps(dict(zip(names, row)), default=_json_value) + '\n' for row in rows)
+
+
+# format -> (encoder, mimetype, file extension)
+FORMATS = {
+    'csv': (csv_chunks, 'text/csv', 'csv'),
+    'ndjson': (ndjson_chunks, 'application/x-ndjson', 'ndjson'),
+}
@@ -0,0 +1,392 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from types import SimpleNamespace
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from werkzeug.security import generate_password_hash
+
+from extensions import db, page_cache, passwords
+from logs import get_logger
+from models import MemberProfile, User, VolunteerOpportunity, content_versions, counters, search_index
+
+log = get_logger(__name__)
+
+CHUNK_SIZE = 1000
+# Fewer passwords than this in a chunk are hashed in-process; starting the
+# pool costs more than it saves
+POOL_MIN_PASSWORDS = 8
+# A report keeps this many row errors in full (the count is always exact)
+MAX_REPORTED_ERRORS = 1000
+
+ROLES = ('student', 'coordinator')
+TRUE = ('1', 'true', 'yes', 'y', 'on')
+FALSE = ('0', 'false', 'no', 'n', 'off', '')
+
+
+class RowError(ValueError):
+    """A record that can't be imported; the message goes into the report"""
+
+
+# ============================================================================
+# Reading: CSV, a JSON array or NDJSON, as (row number, dict) pairs
+# ============================================================================
+def detect_format(filename):
+    extension = os.path.splitext(filename or '')[1].lower()
+    return {'.csv': 'csv', '.json': 'json', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}.get(extension)
+
+
+def read_records(stream, fmt):
+    """Records of a binary or text `stream`, numbered from 1 (CSV: first row after the header)"""
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        return enumerate(reader, 1)
+    if fmt == 'ndjson':
+        return ((number, _json_line(line)) for number, line in enumerate(stream, 1) if line.strip())
+    if fmt == 'json':
+        records = json.load(stream)
+        if not isinstance(records, list):
+            raise ValueError('A JSON import is an array of objects')
+        return enumerate(records, 1)
+    raise ValueError(f"Unknown import format {fmt!r}; use csv, json or ndjson")
+
+
+def _json_line(line):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        # Reported against its line, like any other bad row
+        return RowError(f'invalid JSON: {e}')
+
+
+# ============================================================================
+# Field cleaning
+# ============================================================================
+def _text(record, name, column, required=False):
+    value = record.get(name)
+    value = '' if value is None else str(value).strip()
+    if not value:
+        if required:
+            raise RowError(f'{name} is required')
+        return None
+    length = column.type.length
+    if length and len(value) > length:
+        raise RowError(f'{name} is longer than {length} characters')
+    return value
+
+
+def _flag(record, name, default):
+    value = record.get(name)
+    if value is None or isinstance(value, bool):
+        return default if value is None else value
+    value = str(value).strip().lower()
+    if value in TRUE:
+        return True
+    if value in FALSE:
+        return default if value == '' else False
+    raise RowError(f'{name} must be true or false')
+
+
+class Importer(ABC):
+    """How one kind of record is checked and written.
+
+    load_existing() reads what uniqueness checks need into memory once,
+    clean(record) turns a record into a row (raising RowError), and
+    prepare(rows) finishes a chunk just before it is inserted.
+    """
+
+    label = None
+    columns = ()
+    model = None
+    search_kind = None
+    cache_tags = ()
+
+    def __init__(self, created_by=None, hasher=None):
+        self.created_by = created_by
+        self.hasher = hasher
+
+    def load_existing(self):
+        pass
+
+    @abstractmethod
+    def clean(self, record):
+        """The row to insert for `record`; raises RowError"""
+
+    def prepare(self, rows):
+        return rows
+
+    def forget(self, rows):
+        """Undo clean()'s bookkeeping for rows whose chunk failed"""
+
+
+class UserImporter(Importer):
+    label = 'Users'
+    columns = ('username', 'email', 'password', 'role')
+    model = User
+
+    def load_existing(self):
+        self.usernames = set(db.session.scalars(select(User.username)))
+        self.emails = set(db.session.scalars(select(User.email)))
+
+    def clean(self, record):
+        username = _text(record, 'username', User.username, required=True)
+        email = _text(record, 'email', User.email, required=True)
+        password = record.get('password')
+        if not password:
+            raise RowError('password is required')
+        role = _text(record, 'role', User.role) or 'student'
+        if '@' not in email:
+            raise RowError(f'{email!r} is not an email address')
+        if role not in ROLES:
+            raise RowError(f"role must be one of {', '.join(ROLES)}")
+        if username in self.usernames:
+            raise RowError(f'username {username!r} already exists')
+        if email in self.emails:
+            raise RowError(f'email {email!r} already exists')
+        self.usernames.add(username)
+        self.emails.add(email)
+        return {'username': username, 'email': email, 'password': str(password), 'role': role,
+                'is_admin': False, 'created_at': datetime.utcnow()}
+
+    def prepare(self, rows):
+        hashes = self.hasher.hash_all([row.pop('password') for row in rows])
+        for row, password_hash in zip(rows, hashes):
+            row['password_hash'] = password_hash
+        return rows
+
+    def forget(self, rows):
+        self.usernames.difference_update(row['username'] for row in rows)
+        self.emails.difference_update(row['email'] for row in rows)
+
+
+class ProfileImporter(Importer):
+    label = 'Member profiles'
+    columns = ('username', 'full_name', 'phone', 'location', 'profession', 'bio', 'is_public')
+    model = MemberProfile
+    search_kind = 'member'
+    cache_tags = ('members',)
+
+    def load_existing(self):
+        self.user_ids = dict(db.session.execute(select(User.username, User.id)).all())
+        self.with_profile = set(db.session.scalars(select(MemberProfile.user_id)))
+
+    def clean(self, record):
+        username = _text(record, 'username', User.username, required=True)
+        user_id = self.user_ids.get(username)
+        if user_id is None:
+            raise RowError(f'no user named {username!r}')
+        if user_id in self.with_profile:
+            raise RowError(f'{username!r} already has a profile')
+        now = datetime.utcnow()
+        row = {
+            'user_id': user_id,
+            'full_name': _text(record, 'full_name', MemberProfile.full_name, required=True),
+            'phone': _text(record, 'phone', MemberProfile.phone),
+            'location': _text(record, 'location', MemberProfile.location),
+            'profession': _text(record, 'profession', MemberProfile.profession),
+            'bio': _text(record, 'bio', MemberProfile.bio),
+            'is_public': _flag(record, 'is_public', True),
+            'created_at': now, 'updated_at': now,
+        }
+        self.with_profile.add(user_id)
+        return row
+
+    def forget(self, rows):
+        self.with_profile.difference_update(row['user_id'] for row in rows)
+
+
+class OpportunityImporter(Importer):
+    label = 'Volunteer opportunities'
+    text_columns = ('title', 'description', 'organization', 'location', 'contact_email', 'contact_phone',
+                    'skills_needed', 'time_commitment')
+    columns = text_columns + ('is_urgent', 'is_active')
+    model = VolunteerOpportunity
+    search_kind = 'opportunity'
+    cache_tags = ('volunteer',)
+
+    def clean(self, record):
+        now = datetime.utcnow()
+        row = {
+            name: _text(record, name, getattr(VolunteerOpportunity, name), required=name in (
+                'title', 'description', 'organization'))
+            for name in self.text_columns
+        }
+        row.update(is_urgent=_flag(record, 'is_urgent', False), is_active=_flag(record, 'is_active', True),
+                   created_by=self.created_by, created_at=now, updated_at=now)
+        return row
+
+
+IMPORTERS = {
+    'users': UserImporter,
+    'profiles': ProfileImporter,
+    'opportunities': OpportunityImporter,
+}
+
+
+# ============================================================================
+# Password hashing in worker processes
+# ============================================================================
+class PasswordHasher:
+    """Hashes with the configured PasswordPolicy method on a process pool.
+
+    The KDF is the whole cost of importing users, and each hash holds the
+    GIL for part of its run, so threads don't scale; processes do.
+    """
+
+    def __init__(self, method, workers=None):
+        self.method = method
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+
+    def hash_all(self, secrets):
+        hash_one = partial(generate_password_hash, method=self.method)
+        if self.workers == 1 or len(secrets) < POOL_MIN_PASSWORDS:
+            return [hash_one(secret) for secret in secrets]
+        if self._pool is None:
+            # spawn, not fork: the caller has threads and open DB connections
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        return list(self._pool.map(hash_one, secrets, chunksize=max(1, len(secrets) // (self.workers * 4))))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+# ============================================================================
+# The pipeline
+# ============================================================================
+class ImportReport:
+    def __init__(self, kind):
+        self.kind = kind
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def error(self, number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((number, message))
+
+    def as_dict(self):
+        return {'kind': self.kind, 'imported': self.imported, 'error_count': self.error_count,
+                'errors': self.errors}
+
+
+def _insert(importer, rows):
+    """INSERT prepared `rows` and the derived data the ORM hooks would have written"""
+    model = importer.model
+    table = model.__table__
+    ids = db.session.execute(
+        insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars().all()
+    saved = [SimpleNamespace(id=row_id, **row) for row_id, row in zip(ids, rows)]
+
+    counters.adjust(db.session.connection(), model, saved)
+    if importer.search_kind:
+        search_index.add(db.session, importer.search_kind, saved)
+
+
+def _write_chunk(importer, numbers, rows, report):
+    """Insert one chunk in one transaction.
+
+    If the database rejects it (e.g. a username registered meanwhile), the
+    rows are retried one by one, each in a SAVEPOINT, so only those that
+    fail are skipped.
+    """
+    rows = importer.prepare(rows)
+    try:
+        _insert(importer, rows)
+        imported = len(rows)
+    except IntegrityError:
+        db.session.rollback()
+        imported = 0
+        for number, row in zip(numbers, rows):
+            try:
+                with db.session.begin_nested():
+                    _insert(importer, [row])
+                imported += 1
+            except IntegrityError as e:
+                importer.forget([row])
+                report.error(number, f'rejected by the database: {e.orig}')
+    tags = content_versions.model_tags.get(importer.model)
+    if imported and tags:
+        content_versions.bump(db.session.connection(), *tags)
+    db.session.commit()
+    report.imported += imported
+
+
+def run_import(kind, records, created_by='import', chunk_size=CHUNK_SIZE, workers=None):
+    """Import `records` ((row number, dict) pairs) of `kind`, one transaction per chunk.
+
+    Rows that fail a check, or that the database rejects, are skipped and
+    listed in the report; the rest of the chunk still goes in.
+    """
+    hasher = PasswordHasher(passwords.method, workers)
+    importer = IMPORTERS[kind](created_by=created_by, hasher=hasher)
+    importer.load_existing()
+    report = ImportReport(kind)
+    records = iter(records)
+    try:
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                break
+            numbers, rows = [], []
+            for number, record in chunk:
+                try:
+                    if isinstance(record, RowError):
+                        raise record
+                    if not isinstance(record, dict):
+                        raise RowError('not an object')
+                    rows.append(importer.clean(record))
+                    numbers.append(number)
+                except RowError as e:
+                    report.error(number, str(e))
+            if rows:
+                _write_chunk(importer, numbers, rows, report)
+    finally:
+        hasher.close()
+
+    if report.imported and importer.cache_tags:
+        page_cache.invalidate(*importer.cache_tags)
+    log.info('import finished', extra={'kind': kind, 'imported': report.imported, 'error_count': report.error_count})
+    return report
+
+
+# ============================================================================
+# Uploads from the admin panel, imported by a background job
+# ============================================================================
+def upload_path(folder, token, fmt):
+    return os.path.join(folder, f'{token}.upload.{fmt}')
+
+
+def write_report(folder, token, **fields):
+    path = os.path.join(folder, f'{token}.report.json')
+    partial_path = path + '.tmp'
+    with open(partial_path, 'w', encoding='utf-8') as f:
+        json.dump({'token': token, **fields}, f)
+    os.replace(partial_path, path)
+
+
+def recent_reports(folder, limit=10):
+    """The latest upload reports, newest first"""
+    try:
+        names = [name for name in os.listdir(folder) if name.endswith('.report.json')]
+    except FileNotFoundError:
+        return []
+    paths = sorted((os.path.join(folder, name) for name in names), key=os.path.getmtime, reverse=True)
+    reports = []
+    for path in paths[:limit]:
+        with open(path, encoding='utf-8') as f:
+            reports.append(json.load(f))
+    return reports
@@ -0,0 +1,194 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from sqlalchemy import and_, delete, func, select, update
+
+from extensions import db, page_cache
+from models import (CommunityPost, Discussion, DiscussionReply, VolunteerApplication, VolunteerOpportunity,
+                    content_versions, counters, search_index)
+
+from .exports import parse_date, parse_flag
+
+# Most ids one request may name; larger sets are chosen with filters
+MAX_IDS = 5000
+
+
+class Target:
+    """A table bulk actions apply to, and how a request picks its rows.
+
+    Rows are chosen by `ids` (repeated or comma-separated), by the
+    `filters` (name -> (column, type)), and by `before` (a YYYY-MM-DD date
+    compared with `date_column`). At least one must be given, so an empty
+    form never means "every row". `actions` maps an action name to
+    (function(condition) -> rows changed, past tense for the message).
+    """
+
+    def __init__(self, model, date_column, filters, actions, return_to):
+        self.model = model
+        self.date_column = date_column
+        self.filters = filters
+        self.actions = actions
+        self.return_to = return_to
+
+    def condition(self, form):
+        """WHERE clause for the rows `form` selects; raises ValueError for bad or missing input"""
+        ids = [int(value) for raw in form.getlist('ids') for value in raw.split(',') if value.strip()]
+        if len(ids) > MAX_IDS:
+            raise ValueError(f"At most {MAX_IDS} ids at a time; use filters for larger sets")
+        clauses = [self.model.id.in_(ids)] if ids else []
+        if form.get('before'):
+            clauses.append(self.date_column < parse_date(form['before']))
+        for name, (column, kind) in self.filters.items():
+            if form.get(name):
+                clauses.append(column == kind(form[name]))
+        if not clauses:
+            raise ValueError('Select some rows or give a filter')
+        return and_(*clauses)
+
+
+def _finish(*tags):
+    """Commit, then drop the cached pages the ORM hooks would have (set-based SQL skips them)"""
+    if tags:
+        content_versions.bump(db.session.connection(), *tags)
+    db.session.commit()
+    if tags:
+        page_cache.invalidate(*tags)
+
+
+def _stat_rows(count, **values):
+    # Stand-ins for `count` rows with `values`, for Counters.adjust
+    return [SimpleNamespace(**values)] * count
+
+
+# ============================================================================
+# Volunteer applications
+# ============================================================================
+def set_application_status(status):
+    def apply(condition):
+        was_pending = db.session.scalar(
+            select(func.count()).select_from(VolunteerApplication)
+            .where(condition, VolunteerApplication.status == 'pending'))
+        result = db.session.execute(
+            update(VolunteerApplication).where(condition, VolunteerApplication.status != status)
+            .values(status=status).execution_options(synchronize_session=False))
+        counters.adjust(db.session.connection(), VolunteerApplication,
+                        _stat_rows(was_pending, status='pending'), delta=-1)
+        _finish()
+        return result.rowcount
+    return apply
+
+
+# ============================================================================
+# Volunteer opportunities
+# ============================================================================
+SEARCH_COLUMNS = (VolunteerOpportunity.id, VolunteerOpportunity.title, VolunteerOpportunity.organization,
+                  VolunteerOpportunity.description, VolunteerOpportunity.skills_needed,
+                  VolunteerOpportunity.location, VolunteerOpportunity.is_active)
+
+
+def set_opportunity_active(active):
+    def apply(condition):
+        changed = db.session.execute(
+            update(VolunteerOpportunity).where(condition, VolunteerOpportunity.is_active != active)
+            .values(is_active=active, updated_at=datetime.utcnow())
+            .returning(*SEARCH_COLUMNS).execution_options(synchronize_session=False)).all()
+        counters.adjust(db.session.connection(), VolunteerOpportunity,
+                        _stat_rows(len(changed), is_active=True), delta=1 if active else -1)
+        # Only active opportunities are searchable
+        if active:
+            search_index.add(db.session, 'opportunity', changed)
+        else:
+            search_index.remove(db.session, 'opportunity', [row.id for row in changed])
+        _finish('volunteer')
+        return len(changed)
+    return apply
+
+
+def delete_opportunities(condition):
+    # The applications go with them (migration 9); count the pending ones first
+    chosen = select(VolunteerOpportunity.id).where(condition)
+    pending = db.session.scalar(
+        select(func.count()).select_from(VolunteerApplication)
+        .where(VolunteerApplication.opportunity_id.in_(chosen), VolunteerApplication.status == 'pending'))
+    deleted = db.session.execute(
+        delete(VolunteerOpportunity).where(condition)
+        .returning(VolunteerOpportunity.id, VolunteerOpportunity.is_active)
+        .execution_options(synchronize_session=False)).all()
+    connection = db.session.connection()
+    counters.adjust(connection, VolunteerOpportunity, deleted, delta=-1)
+    counters.adjust(connection, VolunteerApplication, _stat_rows(pending, status='pending'), delta=-1)
+    search_index.remove(db.session, 'opportunity', [row.id for row in deleted])
+    _finish('volunteer')
+    return len(deleted)
+
+
+# ============================================================================
+# Community posts and discussions
+# ============================================================================
+def set_post_pinned(pinned):
+    def apply(condition):
+        result = db.session.execute(
+            update(CommunityPost).where(condition, CommunityPost.is_pinned != pinned)
+            .values(is_pinned=pinned).execution_options(synchronize_session=False))
+        _finish('community')
+        return result.rowcount
+    return apply
+
+
+def delete_posts(condition):
+    # Comments are deleted by the database (migration 9) and aren't indexed
+    ids = db.session.execute(
+        delete(CommunityPost).where(condition).returning(CommunityPost.id)
+        .execution_options(synchronize_session=False)).scalars().all()
+    search_index.remove(db.session, 'post', ids)
+    _finish('community')
+    return len(ids)
+
+
+def delete_discussions(condition):
+    # The database deletes the replies; their search entries are ours to drop
+    reply_ids = db.session.scalars(
+        select(DiscussionReply.id).where(DiscussionReply.discussion_id.in_(select(Discussion.id).where(condition)))
+    ).all()
+    ids = db.session.execute(
+        delete(Discussion).where(condition).returning(Discussion.id)
+        .execution_options(synchronize_session=False)).scalars().all()
+    search_index.remove(db.session, 'discussion', ids)
+    search_index.remove(db.session, 'discussion_reply', reply_ids)
+    _finish()
+    return len(ids)
+
+
+TARGETS = {
+    'applications': Target(
+        VolunteerApplication, VolunteerApplication.applied_at,
+        {'status': (VolunteerApplication.status, str), 'opportunity': (VolunteerApplication.opportunity_id, int)},
+        {'approve': (set_application_status('approved'), 'approved'),
+         'reject': (set_application_status('rejected'), 'rejected')},
+        return_to='admin.volunteers',
+    ),
+    'opportunities': Target(
+        VolunteerOpportunity, VolunteerOpportunity.created_at,
+        {'active': (VolunteerOpportunity.is_active, parse_flag),
+         'organization': (VolunteerOpportunity.organization, str)},
+        {'deactivate': (set_opportunity_active(False), 'deactivated'),
+         'activate': (set_opportunity_active(True), 'reactivated'),
+         'delete': (delete_opportunities, 'deleted')},
+        return_to='admin.volunteers',
+    ),
+    'posts': Target(
+        CommunityPost, CommunityPost.created_at,
+        {'category': (CommunityPost.category, str), 'author': (CommunityPost.author, str),
+         'pinned': (CommunityPost.is_pinned, parse_flag)},
+        {'pin': (set_post_pinned(True), 'pinned'),
+         'unpin': (set_post_pinned(False), 'unpinned'),
+         'delete': (delete_posts, 'deleted')},
+        return_to='community.community',
+    ),
+    'discussions': Target(
+        Discussion, Discussion.created_at,
+        {'topic': (Discussion.topic, str), 'author': (Discussion.author, str)},
+        {'delete': (delete_discussions, 'deleted')},
+        return_to='community.community_forum',
+    ),
+}
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+from flask import current_app, request
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from extensions import db
+from models import (
+    Announcement, User, VolunteerApplication, VolunteerOpportunity, announcement_month_key, counters, retention,
+)
+from pagination import page_size, paginate_keyset
+from stats import aggregate, count_distinct, count_of, count_where, month_start
+
+
+def dashboard_stats():
+    """Counters are maintained on write, so this is a single primary-key lookup"""
+    month_key = announcement_month_key(datetime.utcnow())
+    values = counters.get_many('users', 'active_opportunities', 'pending_applications', month_key)
+    return {
+        'total_users': values['users'],
+        'volunteer_opportunities': values['active_opportunities'],
+        'pending_approvals': values['pending_applications'],
+        'recent_announcements': values[month_key]
+    }
+
+
+def recent_announcements(limit=5):
+    return Announcement.query.order_by(Announcement.created_at.desc()).limit(limit).all()
+
+
+def user_page():
+    return paginate_keyset(User.query, [
+        (User.created_at, True),
+        (User.id, True),
+    ])
+
+
+def user_stats():
+    return aggregate(
+        User.query,
+        total=func.count(User.id),
+        coordinators=count_where(User.role == 'coordinator'),
+        students=count_where(User.role == 'student'),
+        admins=count_where(User.is_admin == True),
+    )
+
+
+def announcement_page():
+    return paginate_keyset(Announcement.query, [
+        (Announcement.created_at, True),
+        (Announcement.id, True),
+    ])
+
+
+def announcement_stats():
+    return aggregate(
+        Announcement.query,
+        total=func.count(Announcement.id),
+        urgent=count_where(Announcement.is_urgent == True),
+        this_month=count_where(Announcement.created_at >= month_start()),
+        authors=count_distinct(Announcement.author),
+    )
+
+
+# Each tab pages independently so both cursors can live in the same URL
+def opportunity_page():
+    return paginate_keyset(VolunteerOpportunity.query, [
+        (VolunteerOpportunity.created_at, True),
+        (VolunteerOpportunity.id, True),
+    ], cursor_arg='after')
+
+
+def application_page():
+    return paginate_keyset(VolunteerApplication.query.options(joinedload(VolunteerApplication.opportunity)), [
+        (VolunteerApplication.applied_at, True),
+        (VolunteerApplication.id, True),
+    ], cursor_arg='apps_after')
+
+
+def volunteer_stats():
+    return aggregate(
+        VolunteerApplication.query,
+        opportunities=count_of(VolunteerOpportunity),
+        active_opportunities=count_of(VolunteerOpportunity, VolunteerOpportunity.is_active == True),
+        applications=func.count(VolunteerApplication.id),
+        pending=count_where(VolunteerApplication.status == 'pending'),
+        approved=count_where(VolunteerApplication.status == 'approved'),
+    )
+
+
+def retention_summary():
+    """Each retention policy with its cutoff, the rows now due and the rows already archived"""
+    months = current_app.config['RETENTION_MONTHS']
+    summary = []
+    for name, policy in retention.policies.items():
+        cutoff = retention.cutoff(months.get(name, 0))
+        summary.append({
+            'name': name,
+            'months': months.get(name, 0),
+            'cutoff': cutoff,
+            'due': retention.due_count(db.session, policy, cutoff) if cutoff else 0,
+            'archived': retention.archived_count(policy),
+        })
+    return summary
+
+
+def archived_page(policy):
+    return retention.archived_page(policy, request.args.get('after', ''), page_size())
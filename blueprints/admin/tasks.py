@@ -0,0 +1,30 @@
+import os
+
+from flask import current_app
+
+from logs import get_logger
+
+from .imports import read_records, run_import, write_report
+
+log = get_logger(__name__)
+
+
+def import_upload(path, token, kind, fmt, filename, created_by):
+    """Import a file uploaded at /admin/import, writing its report next to it"""
+    folder = os.path.dirname(path)
+    started = {'kind': kind, 'filename': filename, 'created_by': created_by}
+    write_report(folder, token, status='running', **started)
+    try:
+        with open(path, 'rb') as f:
+            report = run_import(kind, read_records(f, fmt), created_by=created_by,
+                                chunk_size=current_app.config['IMPORT_CHUNK_SIZE'],
+                                workers=current_app.config['IMPORT_HASH_WORKERS'])
+    except Exception as e:
+        # Not retried: chunks already imported stay, and a second pass would
+        # report them all as duplicates
+        log.exception('import failed', extra={'token': token})
+        write_report(folder, token, status='failed', error=str(e), **started)
+        return
+    finally:
+        os.remove(path)
+    write_report(folder, token, **{**started, **report.as_dict(), 'status': 'done'})
@@ -0,0 +1,148 @@
+import os
+import secrets
+from datetime import datetime
+
+from flask import (Response, abort, current_app, flash, g, redirect, render_template, request, stream_with_context,
+                   url_for)
+
+from auth import admin_required, current_user
+from extensions import jobs
+from logs import get_logger
+from models import retention
+from routing import REPLICA
+
+from . import exports, imports, moderation, queries
+
+log = get_logger(__name__)
+
+
+# Admin Routes
+@admin_required
+def dashboard():
+    recent_activity = [
+        {
+            'username': ann.author,
+            'action': f'Posted: {ann.title}',
+            'timestamp': ann.created_at.strftime('%Y-%m-%d %H:%M')
+        }
+        for ann in queries.recent_announcements()
+    ]
+
+    return render_template('admin/dashboard.html', stats=queries.dashboard_stats(), recent_activity=recent_activity)
+
+
+@admin_required
+def users():
+    return render_template('admin/users.html', users=queries.user_page(), user_stats=queries.user_stats())
+
+
+@admin_required
+def announcements():
+    return render_template('admin/announcements.html', announcements=queries.announcement_page(),
+                           announcement_stats=queries.announcement_stats())
+
+
+@admin_required
+def volunteers():
+    return render_template('admin/volunteers.html', opportunities=queries.opportunity_page(),
+                           applications=queries.application_page(),
+                           volunteer_stats=queries.volunteer_stats())
+
+
+@admin_required
+def job_metrics():
+    return render_template('admin/jobs.html', metrics=jobs.metrics())
+
+
+@admin_required
+def export(kind):
+    """Stream a table as CSV or NDJSON, one batch of rows at a time"""
+    table = exports.EXPORTS.get(kind) or abort(404)
+    fmt = request.args.get('format', 'csv')
+    if fmt not in exports.FORMATS:
+        abort(400, f"Unknown export format {fmt!r}")
+    try:
+        statement = table.statement(request.args)
+    except ValueError as e:
+        abort(400, str(e))
+
+    # A long read: keep it off the primary's pool
+    g.database = REPLICA
+    chunks, mimetype, extension = exports.FORMATS[fmt]
+    response = Response(stream_with_context(chunks(table.names, statement)), mimetype=mimetype)
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename={kind}-{datetime.utcnow():%Y%m%d}.{extension}')
+    response.headers['X-Accel-Buffering'] = 'no'  # let nginx pass batches straight through
+    return response
+
+
+@admin_required
+def import_data():
+    """Upload users, member profiles or volunteer opportunities; a background job imports them"""
+    folder = current_app.config['IMPORT_FOLDER']
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        kind = request.form.get('kind')
+        fmt = imports.detect_format(upload.filename if upload else None)
+        if kind not in imports.IMPORTERS or fmt is None:
+            flash('Please choose what to import and a .csv, .json or .ndjson file', 'error')
+            return redirect(url_for('admin.import_data'))
+
+        os.makedirs(folder, exist_ok=True)
+        token = secrets.token_hex(8)
+        path = imports.upload_path(folder, token, fmt)
+        upload.save(path)
+        imports.write_report(folder, token, status='queued', kind=kind, filename=upload.filename,
+                             created_by=current_user.username)
+        # Not durable: the file is on this machine's disk
+        if not jobs.enqueue('blueprints.admin.tasks.import_upload', durable=False, path=path, token=token,
+                            kind=kind, fmt=fmt, filename=upload.filename, created_by=current_user.username):
+            os.remove(path)
+            imports.write_report(folder, token, status='failed', error='The job queue is full; try again later',
+                                 kind=kind, filename=upload.filename, created_by=current_user.username)
+        flash('Import started. Refresh this page to see the report.', 'info')
+        return redirect(url_for('admin.import_data'))
+
+    return render_template('admin/import.html', kinds=imports.IMPORTERS, reports=imports.recent_reports(folder))
+
+
+@admin_required
+def moderate(kind):
+    """Apply one action to many rows (chosen by id or filter) with a single UPDATE/DELETE"""
+    target = moderation.TARGETS.get(kind) or abort(404)
+    action = target.actions.get(request.form.get('action')) or abort(400, 'Unknown action')
+    try:
+        condition = target.condition(request.form)
+    except ValueError as e:
+        flash(str(e), 'error')
+        return redirect(url_for(target.return_to))
+
+    apply, done = action
+    changed = apply(condition)
+    log.info('bulk moderation', extra={'kind': kind, 'action': request.form['action'], 'rows': changed,
+                                       'admin': current_user.username})
+    flash(f'{changed} {kind} {done}', 'success')
+    return redirect(url_for(target.return_to))
+
+
+@admin_required
+def archive():
+    """What each retention policy has archived and has due; POST archives the due rows in the background"""
+    if not retention.enabled:
+        flash('No archive database is configured (ARCHIVE_DATABASE_URL)', 'error')
+        return redirect(url_for('admin.dashboard'))
+    if request.method == 'POST':
+        jobs.enqueue('tasks.archive_old_content', unique=True)
+        log.info('archiving started', extra={'admin': current_user.username})
+        flash('Archiving started. Refresh this page to follow it.', 'info')
+        return redirect(url_for('admin.archive'))
+    return render_template('admin/archive.html', policies=queries.retention_summary())
+
+
+@admin_required
+def archived_rows(name):
+    """Browse one policy's archived rows, newest first"""
+    policy = retention.policies.get(name) or abort(404)
+    if not retention.enabled:
+        abort(404)
+    return render_template('admin/archive_rows.html', policy=policy, rows=queries.archived_page(policy))
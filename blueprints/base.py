@@ -0,0 +1,53 @@
+from flask import Blueprint, g
+from werkzeug.utils import cached_property, import_string
+
+from pagination import DEFAULT_PAGE_SIZE
+
+
+class LazyView:
+    """Imports the real view function the first time the route is hit"""
+
+    def __init__(self, import_name):
+        self.__module__, self.__name__ = import_name.rsplit('.', 1)
+        self.import_name = import_name
+
+    @cached_property
+    def view(self):
+        return import_string(self.import_name)
+
+    def __call__(self, *args, **kwargs):
+        return self.view(*args, **kwargs)
+
+
+class Policy:
+    """Per-blueprint tuning, published on `g` before each of its requests.
+
+    cache_ttl: seconds a rendered page stays in the page cache (None: app default)
+    page_size: rows per page when the request doesn't ask for ?limit=
+    database:  'replica' for read-mostly pages that may trail writes by a
+               moment, 'primary' for flows that write or must be current
+    """
+
+    def __init__(self, cache_ttl=None, page_size=DEFAULT_PAGE_SIZE, database='primary'):
+        assert database in ('primary', 'replica')
+        self.cache_ttl = cache_ttl
+        self.page_size = page_size
+        self.database = database
+
+    def apply(self):
+        g.cache_ttl = self.cache_ttl
+        g.page_size = self.page_size
+        g.database = self.database
+
+
+def make_blueprint(name, import_name, policy, urls, url_prefix=None):
+    """Blueprint whose views live in <import_name>.views and load lazily.
+
+    `urls` is a list of (rule, view function name, methods).
+    """
+    blueprint = Blueprint(name, import_name, url_prefix=url_prefix)
+    for rule, view, methods in urls:
+        blueprint.add_url_rule(rule, view, LazyView(f'{import_name}.views.{view}'), methods=methods)
+    blueprint.before_request(policy.apply)
+    blueprint.policy = policy
+    return blueprint
@@ -0,0 +1,13 @@
+from blueprints.base import Policy, make_blueprint
+
+# Community posts and discussions
+URLS = [
+    ('/community', 'community', None),
+    ('/community-forum', 'community_forum', None),
+    ('/create-discussion', 'create_discussion', ['GET', 'POST']),
+    ('/create_post', 'create_post', ['GET', 'POST']),
+    ('/comment_post/<int:post_id>', 'comment_post', ['POST']),
+    ('/delete_post/<int:post_id>', 'delete_post', None),
+]
+
+bp = make_blueprint('community', __name__, Policy(cache_ttl=300, database='replica'), URLS)
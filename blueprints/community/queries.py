@@ -0,0 +1,20 @@
+from sqlalchemy.orm import selectinload
+
+from models import CommunityPost, Discussion
+from pagination import paginate_keyset
+
+
+def post_page():
+    """Pinned posts first, then newest, comments loaded in one extra query"""
+    return paginate_keyset(CommunityPost.query.options(selectinload(CommunityPost.comments)), [
+        (CommunityPost.is_pinned, True),
+        (CommunityPost.created_at, True),
+        (CommunityPost.id, True),
+    ])
+
+
+def discussion_page():
+    return paginate_keyset(Discussion.query, [
+        (Discussion.created_at, True),
+        (Discussion.id, True),
+    ])
@@ -0,0 +1,105 @@
+from flask import render_template, request, redirect, url_for, flash
+
+from auth import current_user, login_required
+from extensions import db, page_cache
+from logs import get_logger
+from models import Discussion, CommunityComment, CommunityPost, content_versions
+
+from .queries import discussion_page, post_page
+
+log = get_logger(__name__)
+
+
+# Community Forum Routes
+@content_versions.conditional('community')
+@page_cache.cached('community')
+def community():
+    try:
+        posts = post_page()
+        return render_template('community.html', posts=posts)
+    except Exception:
+        log.exception('loading community posts failed')
+        return render_template('community.html', posts=[])
+
+
+# Alternative Community Forum (Discussion-based)
+@login_required('Please login to access the Community Forum', 'warning')
+def community_forum():
+    discussions = discussion_page()
+    return render_template('community_forum.html', discussions=discussions)
+
+
+@login_required('Please login to create a discussion', 'warning')
+def create_discussion():
+    if request.method == 'POST':
+        title = request.form['title']
+        content = request.form['content']
+        topic = request.form.get('topic', 'general')
+
+        new_discussion = Discussion(
+            title=title,
+            content=content,
+            topic=topic,
+            author=current_user.username,
+            user_id=current_user.id
+        )
+
+        db.session.add(new_discussion)
+        db.session.commit()
+        flash('Discussion started successfully!', 'success')
+        return redirect(url_for('community.community_forum'))
+
+    return render_template('create_discussion.html')
+
+
+@login_required('Please login to create a post', 'error')
+def create_post():
+    if request.method == 'POST':
+        title = request.form['title']
+        content = request.form['content']
+        category = request.form.get('category', 'general')
+
+        new_post = CommunityPost(
+            title=title,
+            content=content,
+            author=current_user.username,
+            category=category
+        )
+
+        db.session.add(new_post)
+        db.session.commit()
+        flash('Post created successfully!', 'success')
+        return redirect(url_for('community.community'))
+
+    return render_template('create_post.html')
+
+
+@login_required('Please login to comment', 'error')
+def comment_post(post_id):
+    content = request.form['content']
+
+    new_comment = CommunityComment(
+        content=content,
+        author=current_user.username,
+        post_id=post_id
+    )
+
+    db.session.add(new_comment)
+    db.session.commit()
+    flash('Comment posted successfully!', 'success')
+    return redirect(url_for('community.community'))
+
+
+@login_required('Please login to delete posts', 'error')
+def delete_post(post_id):
+    post = CommunityPost.query.get_or_404(post_id)
+
+    # Only allow author or admin to delete
+    if post.author == current_user.username or current_user.is_admin:
+        db.session.delete(post)
+        db.session.commit()
+        flash('Post deleted successfully!', 'success')
+    else:
+        flash('You can only delete your own posts', 'error')
+
+    return redirect(url_for('community.community'))
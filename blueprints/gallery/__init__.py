@@ -0,0 +1,9 @@
+from blueprints.base import Policy, make_blueprint
+
+# Photo gallery; pages change only when a photo or its thumbnails land
+URLS = [
+    ('/gallery', 'gallery', None),
+    ('/gallery/upload', 'upload_gallery_image', ['GET', 'POST']),
+]
+
+bp = make_blueprint('gallery', __name__, Policy(cache_ttl=3600, page_size=12, database='replica'), URLS)
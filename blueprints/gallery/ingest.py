@@ -0,0 +1,52 @@
+import os
+from datetime import datetime
+
+from flask import current_app
+
+from extensions import db
+from images import file_sha256, read_metadata
+from models import GalleryImage
+
+# The photos the gallery shipped with, imported into GalleryImage by `flask init-db`
+LEGACY_GALLERY_IMAGES = [
+    ('Image1.jpg', 'Community Gathering', 'Our recent community event showcasing unity and collaboration.'),
+    ('Image2.jpg', 'Annual Meeting', 'Members gathered for our annual general meeting and planning session.'),
+    ('Image3.jpg', 'Cultural Celebration', 'Celebrating our rich cultural heritage and traditions.'),
+    ('Image4.jpg', 'Youth Empowerment', 'Empowering the next generation through mentorship programs.'),
+    ('Image5.jpg', 'Community Service', 'Giving back to our community through volunteer initiatives.'),
+    ('Image6.jpg', 'Networking Event', 'Building connections and professional relationships.'),
+    ('Image7.jpg', 'Family Day', 'Bringing families together for fun and bonding activities.'),
+]
+
+
+def add_gallery_image(filename, content_hash, size_bytes, title, description=None, uploaded_by=None):
+    """Record an image already stored at static/<filename>; metadata is read once, here"""
+    path = os.path.join(current_app.static_folder, filename)
+    width, height, taken_at = read_metadata(path)
+    image = GalleryImage(
+        filename=filename,
+        title=title,
+        description=description,
+        content_hash=content_hash,
+        size_bytes=size_bytes,
+        width=width,
+        height=height,
+        taken_at=taken_at or datetime.utcnow(),
+        uploaded_by=uploaded_by
+    )
+    db.session.add(image)
+    return image
+
+
+def import_legacy_gallery():
+    imported = 0
+    # Newest first on the page, so import in reverse to keep the original order
+    for name, title, description in reversed(LEGACY_GALLERY_IMAGES):
+        filename = f'images/{name}'
+        path = os.path.join(current_app.static_folder, filename)
+        if not os.path.isfile(path):
+            continue
+        add_gallery_image(filename, file_sha256(path), os.path.getsize(path), title, description)
+        imported += 1
+    db.session.commit()
+    return imported
@@ -0,0 +1,14 @@
+from models import GalleryImage
+from pagination import paginate_keyset
+
+
+def image_page():
+    """Most recently taken photos first"""
+    return paginate_keyset(GalleryImage.query, [
+        (GalleryImage.taken_at, True),
+        (GalleryImage.id, True),
+    ])
+
+
+def find_by_hash(content_hash):
+    return GalleryImage.query.filter_by(content_hash=content_hash).first()
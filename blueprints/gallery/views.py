@@ -0,0 +1,77 @@
+import os
+
+from flask import current_app, render_template, request, redirect, url_for, flash
+from sqlalchemy.exc import IntegrityError
+
+from auth import current_user, login_required
+from extensions import db, image_pipeline, page_cache
+from images import store_upload
+
+from .ingest import add_gallery_image
+from .queries import find_by_hash, image_page
+
+
+def static_url(filename):
+    return url_for('static', filename=filename)
+
+
+# Gallery Route
+@page_cache.cached('gallery')
+def gallery():
+    images = image_page()
+    responsive = {
+        image.id: image_pipeline.responsive(os.path.join(current_app.static_folder, image.filename),
+                                            static_url, image.content_hash)
+        for image in images
+    }
+    return render_template('gallery.html', gallery_images=images, responsive=responsive)
+
+
+@login_required('Please login to upload photos', 'error')
+def upload_gallery_image():
+    if request.method == 'POST':
+        upload = request.files.get('image')
+        title = request.form.get('title', '').strip()
+        description = request.form.get('description', '').strip()
+        extension = os.path.splitext(upload.filename if upload else '')[1].lower()
+
+        if not title or extension not in ('.jpg', '.jpeg', '.png', '.webp', '.gif'):
+            flash('Please choose a JPEG, PNG, WebP or GIF image and give it a title', 'error')
+            return redirect(url_for('gallery.upload_gallery_image'))
+
+        folder = current_app.config['GALLERY_UPLOAD_FOLDER']
+        try:
+            # Streamed to disk in chunks while hashing; never held in memory whole
+            tmp_path, content_hash, size = store_upload(
+                upload.stream, os.path.join(current_app.static_folder, folder), current_app.config['GALLERY_MAX_BYTES'])
+        except ValueError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('gallery.upload_gallery_image'))
+
+        if find_by_hash(content_hash):
+            os.remove(tmp_path)
+            flash('That photo is already in the gallery', 'info')
+            return redirect(url_for('gallery.gallery'))
+
+        filename = f'{folder}/{content_hash}{extension}'
+        path = os.path.join(current_app.static_folder, filename)
+        os.replace(tmp_path, path)
+        try:
+            add_gallery_image(filename, content_hash, size, title, description, current_user.username)
+            db.session.commit()
+        except ValueError as e:
+            db.session.rollback()
+            os.remove(path)
+            flash(str(e), 'error')
+            return redirect(url_for('gallery.upload_gallery_image'))
+        except IntegrityError:
+            # The same file uploaded concurrently; the other request recorded it
+            db.session.rollback()
+            flash('That photo is already in the gallery', 'info')
+            return redirect(url_for('gallery.gallery'))
+
+        image_pipeline.submit(path, content_hash)
+        flash('Photo uploaded successfully!', 'success')
+        return redirect(url_for('gallery.gallery'))
+
+    return render_template('upload_gallery_image.html')
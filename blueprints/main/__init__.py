@@ -0,0 +1,17 @@
+from blueprints.base import Policy, make_blueprint
+
+# Home page, accounts, announcements, site search and debug pages
+URLS = [
+    ('/debug/db', 'debug_db', None),
+    ('/debug/users', 'debug_users', None),
+    ('/debug_announcements', 'debug_announcements', None),
+
+    ('/', 'index', None),
+    ('/register', 'register', ['GET', 'POST']),
+    ('/login', 'login', ['GET', 'POST']),
+    ('/logout', 'logout', None),
+    ('/post_announcement', 'post_announcement', ['GET', 'POST']),
+    ('/search', 'search', None),
+]
+
+bp = make_blueprint('main', __name__, Policy(), URLS)
@@ -0,0 +1,10 @@
+from models import Announcement
+from pagination import paginate_keyset
+
+
+def announcement_page():
+    """Newest announcements first"""
+    return paginate_keyset(Announcement.query, [
+        (Announcement.created_at, True),
+        (Announcement.id, True),
+    ])
@@ -0,0 +1,188 @@
+from flask import current_app, render_template, request, redirect, url_for, flash, session
+
+from auth import current_user, login_required
+import migrations
+from extensions import db, login_limiter, page_cache
+from logs import get_logger
+from models import User, Announcement, content_versions, search_index
+from pagination import page_size
+
+from .queries import announcement_page
+
+log = get_logger(__name__)
+
+
+@content_versions.conditional('announcements')
+@page_cache.cached('announcements')
+def index():
+    try:
+        announcements = announcement_page()
+        return render_template('index.html', announcements=announcements)
+    except Exception:
+        log.exception('loading announcements failed')
+        return render_template('index.html', announcements=[])
+
+
+def register():
+    if request.method == 'POST':
+        try:
+            username = request.form['username']
+            email = request.form['email']
+            password = request.form['password']
+            role = request.form.get('role', 'student')
+
+            # Check if user already exists
+            if User.query.filter_by(username=username).first():
+                flash('Username already exists!', 'error')
+                return redirect(url_for('main.register'))
+
+            if User.query.filter_by(email=email).first():
+                flash('Email already exists!', 'error')
+                return redirect(url_for('main.register'))
+
+            new_user = User(username=username, email=email, role=role)
+            new_user.set_password(password)
+
+            db.session.add(new_user)
+            db.session.commit()
+
+            log.info('user registered', extra={'username': username})
+            flash('Registration successful! Please login.', 'success')
+            return redirect(url_for('main.login'))
+
+        except Exception as e:
+            db.session.rollback()
+            log.exception('registration failed', extra={'username': username})
+            flash(f'Registration failed: {str(e)}', 'error')
+            return redirect(url_for('main.register'))
+
+    return render_template('register.html')
+
+
+def login():
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+
+        # Checked before touching the password hash, so guessing costs no CPU
+        ip_key, user_key = f'ip:{request.remote_addr}', f'user:{username.lower()}'
+        if login_limiter.blocked(ip_key, current_app.config['LOGIN_IP_LIMIT']) or \
+                login_limiter.blocked(user_key, current_app.config['LOGIN_USER_LIMIT']):
+            flash('Too many failed login attempts. Please wait a few minutes and try again.', 'error')
+            return render_template('login.html'), 429
+
+        user = User.query.filter_by(username=username).first()
+
+        if user and user.check_password(password):
+            login_limiter.reset(user_key)
+            if user.password_needs_rehash():
+                # Stored with an outdated method; the plaintext is at hand only now
+                user.set_password(password)
+                db.session.commit()
+                log.info('password hash upgraded', extra={'user_id': user.id})
+            # The session only holds the id; current_user loads the rest
+            session.regenerate()
+            session['user_id'] = user.id
+            flash('Login successful!', 'success')
+            return redirect(url_for('main.index'))
+        else:
+            login_limiter.hit(ip_key)
+            login_limiter.hit(user_key)
+            flash('Invalid username or password!', 'error')
+
+    return render_template('login.html')
+
+
+def logout():
+    session.clear()
+    session.regenerate()
+    flash('You have been logged out.', 'info')
+    return redirect(url_for('main.index'))
+
+
+@login_required('Please login to post announcements', 'error')
+def post_announcement():
+    if request.method == 'POST':
+        title = request.form['title']
+        content = request.form['content']
+        is_urgent = 'is_urgent' in request.form
+
+        new_announcement = Announcement(
+            title=title,
+            content=content,
+            author=current_user.username,
+            is_urgent=is_urgent
+        )
+
+        db.session.add(new_announcement)
+        db.session.commit()
+
+        flash('Announcement posted successfully!', 'success')
+        return redirect(url_for('main.index'))
+
+    return render_template('post_announcement.html')
+
+
+# Site-wide search
+def search():
+    query = request.args.get('q', '').strip()
+    kind = request.args.get('kind', '')
+    results = search_index.search(
+        db.session, query,
+        kinds=[kind] if kind else None,
+        after=request.args.get('after', ''),
+        limit=page_size(),
+    )
+    return render_template('search.html', results=results, search_query=query, kind=kind)
+
+
+def debug_db():
+    """Check database status and tables"""
+    try:
+        # Check if tables exist and have correct columns
+        users_count = User.query.count()
+
+        result = f"""
+        <h1>Database Status</h1>
+        <p><strong>Total Users:</strong> {users_count}</p>
+        <p><strong>Database File:</strong> ojoto_union.db</p>
+        <p><strong>Tables Created:</strong> ✅</p>
+        <p><strong>Schema Version:</strong> {migrations.latest_version()}</p>
+        <hr>
+        <p><a href='/register'>Register New User</a></p>
+        <p><a href='/debug/users'>View All Users</a></p>
+        """
+        return result
+    except Exception as e:
+        return f"<h1>Database Error</h1><p>{e}</p>"
+
+
+def debug_users():
+    """Display all users in the database"""
+    try:
+        users = User.query.all()
+        result = f"<h1>Total Users: {len(users)}</h1>"
+        for user in users:
+            result += f"""
+            <div style='border: 1px solid #ccc; padding: 10px; margin: 10px;'>
+                <p><strong>ID:</strong> {user.id}</p>
+                <p><strong>Username:</strong> {user.username}</p>
+                <p><strong>Email:</strong> {user.email}</p>
+                <p><strong>Role:</strong> {user.role}</p>
+                <p><strong>Is Admin:</strong> {user.is_admin}</p>
+            </div>
+            """
+        return result + "<p><a href='/register'>Register Another User</a></p>"
+    except Exception as e:
+        return f"<h1>Error: {e}</h1>"
+
+
+def debug_announcements():
+    try:
+        announcements = Announcement.query.all()
+        result = f"Total announcements: {len(announcements)}<br><br>"
+        for ann in announcements:
+            result += f"Title: {ann.title}<br>Content: {ann.content}<br>Author: {ann.author}<br><br>"
+        return result
+    except Exception as e:
+        return f"Error: {e}"
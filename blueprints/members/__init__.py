@@ -0,0 +1,11 @@
+from blueprints.base import Policy, make_blueprint
+
+# Member directory: the most read, least written part of the site
+URLS = [
+    ('/members', 'members', None),
+    ('/member/<int:member_id>', 'member_detail', None),
+    ('/edit_profile', 'edit_profile', ['GET', 'POST']),
+    ('/search_members', 'search_members', None),
+]
+
+bp = make_blueprint('members', __name__, Policy(cache_ttl=600, page_size=24, database='replica'), URLS)
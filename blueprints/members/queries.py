@@ -0,0 +1,17 @@
+from models import MemberProfile, search_index
+from pagination import paginate_keyset
+
+
+def member_page(search=None):
+    """Public profiles, newest first, optionally narrowed by a full-text search"""
+    members = MemberProfile.query.filter_by(is_public=True)
+    if search:
+        members = members.filter(MemberProfile.id.in_(search_index.matching_ids('member', search)))
+    return paginate_keyset(members, [
+        (MemberProfile.created_at, True),
+        (MemberProfile.id, True),
+    ])
+
+
+def last_updated(member_id):
+    return MemberProfile.query.with_entities(MemberProfile.updated_at).filter_by(id=member_id).scalar()
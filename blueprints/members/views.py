@@ -0,0 +1,73 @@
+from datetime import datetime
+
+from flask import render_template, request, redirect, url_for, flash
+
+from auth import current_user, login_required
+from extensions import db, page_cache
+from logs import get_logger
+from models import MemberProfile, content_versions
+
+from .queries import last_updated, member_page
+
+log = get_logger(__name__)
+
+
+# Member Directory Routes
+@page_cache.cached('members')
+def members():
+    try:
+        members = member_page()
+        return render_template('members.html', members=members)
+    except Exception:
+        log.exception('loading members failed')
+        return render_template('members.html', members=[])
+
+
+@content_versions.conditional(extra=last_updated)
+def member_detail(member_id):
+    try:
+        member = MemberProfile.query.get_or_404(member_id)
+        if not member.is_public:
+            flash('This member profile is not public', 'error')
+            return redirect(url_for('members.members'))
+        return render_template('member_detail.html', member=member)
+    except Exception as e:
+        flash('Error loading member profile', 'error')
+        return redirect(url_for('members.members'))
+
+
+@login_required('Please login to edit your profile', 'error')
+def edit_profile():
+    # Get or create profile for current user
+    profile = MemberProfile.query.filter_by(user_id=current_user.id).first()
+    if not profile:
+        profile = MemberProfile(
+            user_id=current_user.id,
+            full_name=current_user.username,
+            profession="Member",
+            bio="",
+            is_public=True
+        )
+        db.session.add(profile)
+        db.session.commit()
+
+    if request.method == 'POST':
+        profile.full_name = request.form['full_name']
+        profile.phone = request.form['phone']
+        profile.location = request.form['location']
+        profile.profession = request.form['profession']
+        profile.bio = request.form['bio']
+        profile.is_public = 'is_public' in request.form
+        profile.updated_at = datetime.utcnow()
+
+        db.session.commit()
+        flash('Profile updated successfully!', 'success')
+        return redirect(url_for('members.member_detail', member_id=profile.id))
+
+    return render_template('edit_profile.html', profile=profile)
+
+
+def search_members():
+    query = request.args.get('q', '')
+    members = member_page(search=query)
+    return render_template('members.html', members=members, search_query=query)
@@ -0,0 +1,13 @@
+from blueprints.base import Policy, make_blueprint
+
+# Q&A forum: read-mostly lists, answers arrive as small POSTs
+URLS = [
+    ('/questions', 'questions', None),
+    ('/ask_question', 'ask_question', ['GET', 'POST']),
+    ('/answer_question/<int:question_id>', 'answer_question', ['POST']),
+    ('/question/<int:question_id>', 'question_detail', None),
+    ('/answer/<int:question_id>', 'post_answer', ['POST']),
+    ('/accept-answer/<int:answer_id>', 'accept_answer', None),
+]
+
+bp = make_blueprint('qa', __name__, Policy(database='replica'), URLS)
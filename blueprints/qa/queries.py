@@ -0,0 +1,12 @@
+from sqlalchemy.orm import selectinload
+
+from models import Question
+from pagination import paginate_keyset
+
+
+def question_page():
+    """Newest questions first, answers loaded in one extra query"""
+    return paginate_keyset(Question.query.options(selectinload(Question.answers)), [
+        (Question.created_at, True),
+        (Question.id, True),
+    ])
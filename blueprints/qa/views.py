@@ -0,0 +1,111 @@
+from flask import render_template, request, redirect, url_for, flash
+from sqlalchemy.orm import joinedload
+
+from auth import current_user, login_required
+from extensions import db
+from logs import get_logger
+from models import Question, Answer, content_versions
+
+from .queries import question_page
+
+log = get_logger(__name__)
+
+
+# Q&A Forum Routes
+@login_required('Please login to access the Q&A Forum', 'warning')
+@content_versions.conditional('questions')
+def questions():
+    try:
+        questions = question_page()
+        return render_template('questions.html', questions=questions)
+    except Exception:
+        log.exception('loading questions failed')
+        return render_template('questions.html', questions=[])
+
+
+@login_required('Please login to ask a question', 'error')
+def ask_question():
+    if request.method == 'POST':
+        title = request.form['title']
+        content = request.form['content']
+        category = request.form.get('category', 'general')
+        is_urgent = 'is_urgent' in request.form
+
+        new_question = Question(
+            title=title,
+            content=content,
+            category=category,
+            author=current_user.username,
+            user_id=current_user.id,
+            is_urgent=is_urgent
+        )
+
+        db.session.add(new_question)
+        db.session.commit()
+        flash('Question posted successfully!', 'success')
+        return redirect(url_for('qa.questions'))
+
+    return render_template('ask_question.html')
+
+
+@login_required('Please login to answer questions', 'error')
+def answer_question(question_id):
+    content = request.form['content']
+
+    new_answer = Answer(
+        content=content,
+        author=current_user.username,
+        user_id=current_user.id,
+        question_id=question_id
+    )
+
+    db.session.add(new_answer)
+    db.session.commit()
+    flash('Answer posted successfully!', 'success')
+    return redirect(url_for('qa.questions'))
+
+
+# Q&A Forum Detail View
+@login_required('Please login to view questions', 'warning')
+def question_detail(question_id):
+    question = Question.query.get_or_404(question_id)
+    return render_template('question_detail.html', question=question)
+
+
+# Post Answer Route
+@login_required('Please login to post an answer', 'warning')
+def post_answer(question_id):
+    question = Question.query.get_or_404(question_id)
+    content = request.form['content']
+
+    new_answer = Answer(
+        content=content,
+        author=current_user.username,
+        user_id=current_user.id,
+        question_id=question_id
+    )
+
+    db.session.add(new_answer)
+    db.session.commit()
+    flash('Your answer has been posted!', 'success')
+    return redirect(url_for('qa.question_detail', question_id=question_id))
+
+
+# Mark Answer as Accepted
+@login_required('Please login to perform this action', 'warning')
+def accept_answer(answer_id):
+    # The question comes with the answer: ownership is checked and it is updated below
+    answer = db.get_or_404(Answer, answer_id, options=[joinedload(Answer.question)])
+
+    # Check if user owns the question
+    if answer.question.user_id != current_user.id:
+        flash('You can only accept answers for your own questions', 'error')
+        return redirect(url_for('qa.question_detail', question_id=answer.question_id))
+
+    # Mark as resolved
+    answer.question.is_resolved = True
+    answer.is_accepted = True
+    db.session.commit()
+
+    flash('Answer accepted! Question marked as resolved.', 'success')
+    return redirect(url_for('qa.question_detail', question_id=answer.question_id))
@@ -0,0 +1,13 @@
+from blueprints.base import Policy, make_blueprint
+
+# Volunteer opportunities and applications; applicants expect to see their
+# own submission straight away, so everything reads from the primary
+URLS = [
+    ('/volunteer', 'volunteer_opportunities', None),
+    ('/volunteer/<int:opportunity_id>', 'volunteer_detail', None),
+    ('/post_opportunity', 'post_opportunity', ['GET', 'POST']),
+    ('/apply_volunteer/<int:opportunity_id>', 'apply_volunteer', ['GET', 'POST']),
+    ('/my_applications', 'my_applications', None),
+]
+
+bp = make_blueprint('volunteer', __name__, Policy(cache_ttl=120), URLS)
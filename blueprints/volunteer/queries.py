@@ -0,0 +1,30 @@
+from sqlalchemy.orm import joinedload
+
+from models import VolunteerApplication, VolunteerOpportunity
+from pagination import paginate_keyset
+from queries import status_counts
+
+
+def opportunity_page():
+    """Active opportunities, urgent ones first"""
+    return paginate_keyset(VolunteerOpportunity.query.filter_by(is_active=True), [
+        (VolunteerOpportunity.is_urgent, True),
+        (VolunteerOpportunity.created_at, True),
+        (VolunteerOpportunity.id, True),
+    ])
+
+
+def application_stats(opportunity):
+    """{status: count} of the applications to one opportunity"""
+    return status_counts(
+        VolunteerApplication.opportunity_id, VolunteerApplication.status, [opportunity]
+    )[opportunity.id]
+
+
+def application_page(email):
+    return paginate_keyset(VolunteerApplication.query.filter_by(
+        applicant_email=email
+    ).options(joinedload(VolunteerApplication.opportunity)), [
+        (VolunteerApplication.applied_at, True),
+        (VolunteerApplication.id, True),
+    ])
@@ -0,0 +1,23 @@
+from extensions import db
+from mail import send_mail
+from models import VolunteerApplication
+
+
+def send_application_confirmation(application_id, detail_url):
+    """Email the applicant that their application was received.
+
+    `detail_url` is built by the request, which knows the public host name.
+    """
+    application = db.session.get(VolunteerApplication, application_id)
+    if application is None:
+        return
+    opportunity = application.opportunity
+    send_mail(
+        application.applicant_email,
+        f'We received your application: {opportunity.title}',
+        f"Hello {application.applicant_name},\n\n"
+        f"Thank you for applying to volunteer for \"{opportunity.title}\" with {opportunity.organization}.\n"
+        f"The coordinator will contact you at this address soon.\n\n"
+        f"Opportunity details: {detail_url}\n\n"
+        f"Ojoto Union NA1\n",
+    )
@@ -0,0 +1,126 @@
+from flask import render_template, request, redirect, url_for, flash
+
+from auth import current_user, login_required
+from extensions import db, jobs, page_cache
+from logs import get_logger
+from models import VolunteerOpportunity, VolunteerApplication, content_versions
+
+from .queries import application_page, application_stats, opportunity_page
+
+log = get_logger(__name__)
+
+
+# Volunteer Opportunities Routes
+@content_versions.conditional('volunteer')
+@page_cache.cached('volunteer')
+def volunteer_opportunities():
+    try:
+        opportunities = opportunity_page()
+        return render_template('volunteer.html', opportunities=opportunities)
+    except Exception:
+        log.exception('loading volunteer opportunities failed')
+        return render_template('volunteer.html', opportunities=[])
+
+
+def volunteer_detail(opportunity_id):
+    try:
+        opportunity = VolunteerOpportunity.query.get_or_404(opportunity_id)
+        if not opportunity.is_active:
+            flash('This volunteer opportunity is no longer available', 'error')
+            return redirect(url_for('volunteer.volunteer_opportunities'))
+        stats = application_stats(opportunity)
+        return render_template('volunteer_detail.html', opportunity=opportunity,
+                               application_stats=stats)
+    except Exception as e:
+        flash('Error loading volunteer opportunity', 'error')
+        return redirect(url_for('volunteer.volunteer_opportunities'))
+
+
+@login_required('Please login to post volunteer opportunities', 'error')
+def post_opportunity():
+    if request.method == 'POST':
+        title = request.form['title']
+        description = request.form['description']
+        organization = request.form['organization']
+        location = request.form['location']
+        contact_email = request.form['contact_email']
+        contact_phone = request.form['contact_phone']
+        skills_needed = request.form['skills_needed']
+        time_commitment = request.form['time_commitment']
+        is_urgent = 'is_urgent' in request.form
+
+        new_opportunity = VolunteerOpportunity(
+            title=title,
+            description=description,
+            organization=organization,
+            location=location,
+            contact_email=contact_email,
+            contact_phone=contact_phone,
+            skills_needed=skills_needed,
+            time_commitment=time_commitment,
+            is_urgent=is_urgent,
+            created_by=current_user.username
+        )
+
+        db.session.add(new_opportunity)
+        db.session.commit()
+        flash('Volunteer opportunity posted successfully!', 'success')
+        return redirect(url_for('volunteer.volunteer_opportunities'))
+
+    return render_template('post_opportunity.html')
+
+
+def apply_volunteer(opportunity_id):
+    opportunity = VolunteerOpportunity.query.get_or_404(opportunity_id)
+
+    if not opportunity.is_active:
+        flash('This volunteer opportunity is no longer available', 'error')
+        return redirect(url_for('volunteer.volunteer_opportunities'))
+
+    if request.method == 'POST':
+        applicant_name = request.form['applicant_name']
+        applicant_email = request.form['applicant_email']
+        applicant_phone = request.form['applicant_phone']
+        message = request.form['message']
+        skills = request.form['skills']
+
+        # Check if user already applied
+        existing_application = VolunteerApplication.query.filter_by(
+            opportunity_id=opportunity_id,
+            applicant_email=applicant_email
+        ).first()
+
+        if existing_application:
+            flash('You have already applied for this opportunity', 'error')
+            return redirect(url_for('volunteer.volunteer_detail', opportunity_id=opportunity_id))
+
+        new_application = VolunteerApplication(
+            opportunity_id=opportunity_id,
+            applicant_name=applicant_name,
+            applicant_email=applicant_email,
+            applicant_phone=applicant_phone,
+            message=message,
+            skills=skills
+        )
+
+        db.session.add(new_application)
+        db.session.flush()
+        # Sent by a background worker once the application is committed
+        jobs.enqueue('blueprints.volunteer.tasks.send_application_confirmation',
+                     application_id=new_application.id,
+                     detail_url=url_for('volunteer.volunteer_detail', opportunity_id=opportunity_id, _external=True))
+        db.session.commit()
+        flash('Application submitted successfully! We will contact you soon.', 'success')
+        return redirect(url_for('volunteer.volunteer_detail', opportunity_id=opportunity_id))
+
+    return render_template('apply_volunteer.html', opportunity=opportunity)
+
+
+@login_required('Please login to view your applications', 'error')
+def my_applications():
+    try:
+        applications = application_page(current_user.email)
+        return render_template('my_applications.html', applications=applications)
+    except Exception:
+        log.exception('loading applications failed')
+        return render_template('my_applications.html', applications=[])
@@ -0,0 +1,235 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, g, request, session
+from sqlalchemy import event
+
+try:
+    import redis
+except ImportError:  # optional: only needed for a shared cache
+    redis = None
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+class LRUCache:
+    """In-process cache with a size bound and per-entry expiry.
+
+    Counters (see incr) live outside the LRU so they are never evicted; a
+    tag version silently resetting could resurrect stale pages.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._counters:
+                return self._counters[key]
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        # Counters are kept: pages cached after a clear must not reuse old versions
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCache:
+    """Shared cache for multi-process / multi-node deployments.
+
+    Values are pickled, except counters (see incr), which are plain
+    integers so Redis can increment them itself.
+    """
+
+    def __init__(self, url, prefix='ojoto:'):
+        if redis is None:
+            raise RuntimeError("CACHE_URL points at Redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    @staticmethod
+    def _load(raw):
+        if raw is None:
+            return None
+        # Every pickle starts with the PROTO opcode; anything else is a counter
+        if raw[:1] != b'\x80':
+            return int(raw)
+        return pickle.loads(raw)
+
+    def get(self, key):
+        return self._load(self.client.get(self.prefix + key))
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return [self._load(raw) for raw in self.client.mget([self.prefix + key for key in keys])]
+
+    def set(self, key, value, ttl=None):
+        self.client.set(self.prefix + key, pickle.dumps(value), ex=ttl)
+
+    def incr(self, key):
+        try:
+            return self.client.incr(self.prefix + key)
+        except redis.ResponseError:
+            # Pickled by an earlier release; carry the count over once
+            self.client.set(self.prefix + key, self.get(key) or 0)
+            return self.client.incr(self.prefix + key)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        for key in self.client.scan_iter(self.prefix + '*'):
+            self.client.delete(key)
+
+
+def make_backend(url=None, max_entries=1024):
+    """Pick a backend from a CACHE_URL-style setting ('memory://' or 'redis://...')"""
+    if url and url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisCache(url)
+    return LRUCache(max_entries=max_entries)
+
+
+# ============================================================================
+# Tagged page cache
+# ============================================================================
+class PageCache:
+    """Caches rendered pages for anonymous visitors, invalidated by tag.
+
+    Every tag has a version number in the backend. A page's key embeds the
+    current version of each of its tags, so invalidating a tag is a single
+    increment and stale pages simply stop being addressed (and age out).
+    This works the same for the in-process and the shared backend.
+    """
+
+    def __init__(self, backend=None, default_ttl=300):
+        self.backend = backend or LRUCache()
+        self.default_ttl = default_ttl
+        self.model_tags = {}
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, backend, default_ttl=None):
+        self.backend = backend
+        if default_ttl is not None:
+            self.default_ttl = default_ttl
+
+    # ------------------------------------------------------------------
+    # Tags
+    # ------------------------------------------------------------------
+    def _tag_versions(self, tags):
+        versions = self.backend.get_many([f'tag:{tag}' for tag in tags])
+        return [version or 0 for version in versions]
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.incr(f'tag:{tag}')
+
+    def invalidate_on(self, model, *tags):
+        """Invalidate `tags` whenever a row of `model` is committed"""
+        self.model_tags.setdefault(model, set()).update(tags)
+
+    def watch(self, session):
+        """Hook the session so commits invalidate the tags of changed models"""
+
+        @event.listens_for(session, 'after_flush')
+        def collect_changed_models(sess, flush_context):
+            changed = sess.info.setdefault('page_cache_changed', set())
+            for obj in list(sess.new) + list(sess.dirty) + list(sess.deleted):
+                changed.add(type(obj))
+
+        @event.listens_for(session, 'after_commit')
+        def invalidate_changed_models(sess):
+            changed = sess.info.pop('page_cache_changed', set())
+            tags = set()
+            for model in changed:
+                tags.update(self.model_tags.get(model, ()))
+            if tags:
+                self.invalidate(*tags)
+
+        @event.listens_for(session, 'after_rollback')
+        def forget_changed_models(sess):
+            sess.info.pop('page_cache_changed', None)
+
+    # ------------------------------------------------------------------
+    # Pages
+    # ------------------------------------------------------------------
+    def _key(self, tags):
+        versions = '.'.join(str(v) for v in self._tag_versions(tags))
+        return f'page:{request.endpoint}:{request.full_path}:{versions}'
+
+    @staticmethod
+    def cacheable():
+        """Only anonymous GETs with no pending flash messages are shared"""
+        return request.method == 'GET' and 'user_id' not in session and '_flashes' not in session
+
+    def cached(self, *tags, ttl=None):
+        """Decorator: serve the view from cache for anonymous visitors.
+
+        Entries live for `ttl` seconds, else the blueprint policy's
+        g.cache_ttl, else the default.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.cacheable():
+                    return view(*args, **kwargs)
+
+                key = self._key(tags)
+                entry = self.backend.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    body, status, mimetype = entry
+                    response = Response(body, status=status, mimetype=mimetype)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                self.misses += 1
+                response = view(*args, **kwargs)
+                if not isinstance(response, Response):
+                    response = Response(response)
+                if response.status_code == 200 and not response.direct_passthrough:
+                    self.backend.set(key, (response.get_data(), response.status_code, response.mimetype),
+                                     ttl or g.get('cache_ttl') or self.default_ttl)
+                    response.headers['X-Cache'] = 'MISS'
+                return response
+
+            return wrapper
+
+        return decorator
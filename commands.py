@@ -0,0 +1,414 @@
+import os
+import sys
+import time
+from datetime import datetime
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+import migrations
+from extensions import db, image_pipeline, jobs, static_assets
+
+# Models (and the write hooks registered with them) are imported inside each
+# command so that creating the app for a web worker does not load them.
+
+
+# ============================================================================
+# Database setup
+# ============================================================================
+def init_db():
+    """Create or migrate the schema, then backfill anything derived from it"""
+    from blueprints.gallery.ingest import import_legacy_gallery
+    from models import GalleryImage, SiteStat, counters, search_index
+
+    applied = migrations.upgrade(db)
+    print("✅ Database schema is up to date!")
+
+    if 3 in applied:
+        indexed = search_index.rebuild(db.session)
+        print(f"✅ Search index built ({indexed} entries)")
+
+    # Fill counter columns/stats for databases created before they existed
+    if SiteStat.query.count() == 0:
+        counters.reconcile(db.session)
+        print("✅ Counters rebuilt")
+
+    if GalleryImage.query.first() is None:
+        imported = import_legacy_gallery()
+        print(f"✅ Gallery seeded with {imported} images")
+
+    if counters.get('users') == 0:
+        print("ℹ️  No users found, database is fresh")
+
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create or upgrade the database and seed derived data"""
+    init_db()
+
+
+@click.command('db-upgrade')
+@with_appcontext
+def db_upgrade_command():
+    """Apply pending schema migrations"""
+    import models  # noqa: F401  (registers the tables on db.metadata)
+
+    applied = migrations.upgrade(db)
+    print(f"✅ Schema at version {migrations.latest_version()} ({len(applied)} migrations applied)")
+
+
+@click.command('rebuild-search')
+@with_appcontext
+def rebuild_search_command():
+    """Repopulate the full-text search index from the base tables"""
+    from models import search_index
+
+    indexed = search_index.rebuild(db.session)
+    print(f"✅ Search index rebuilt ({indexed} entries)")
+
+
+@click.command('reconcile-counters')
+@with_appcontext
+def reconcile_counters_command():
+    """Recompute every denormalized counter from the base tables"""
+    from models import counters
+
+    written = counters.reconcile(db.session)
+    print(f"✅ Counters reconciled ({written} site stats)")
+
+
+@click.command('calibrate-passwords')
+@click.option('--target-ms', default=250.0, help='Longest acceptable time for one hash')
+@click.option('--algorithm', type=click.Choice(['scrypt', 'pbkdf2']), default='scrypt')
+@with_appcontext
+def calibrate_passwords_command(target_ms, algorithm):
+    """Time password-hash costs on this machine and suggest PASSWORD_HASH_METHOD"""
+    from passwords import calibrate
+
+    method, results = calibrate(target_ms, algorithm)
+    for candidate, ms in results:
+        print(f"⏱️  {candidate:<24} {ms:7.1f} ms")
+    print(f"\n✅ PASSWORD_HASH_METHOD={method}")
+    if method != current_app.config['PASSWORD_HASH_METHOD']:
+        print(f"ℹ️  Currently {current_app.config['PASSWORD_HASH_METHOD']}; "
+              f"existing hashes are upgraded as users log in")
+
+
+@click.command('purge-sessions')
+@with_appcontext
+def purge_sessions_command():
+    """Delete expired rows from the web_session table (SESSION_STORE=database)"""
+    store = current_app.session_interface.store
+    if not hasattr(store, 'purge_expired'):
+        print("ℹ️  Cache session stores expire entries on their own; nothing to purge")
+        return
+    print(f"✅ Purged {store.purge_expired()} expired sessions")
+
+
+# ============================================================================
+# Data retention and upkeep
+# ============================================================================
+@click.command('maintain')
+@click.option('--every', default=0.0, help='Hours between runs; 0 runs once (e.g. from cron)')
+@click.option('--batch-size', default=None, type=int, help='Rows per transaction (default RETENTION_BATCH_SIZE)')
+@click.option('--pause', default=0.05, help='Seconds to wait between batches so the site can write')
+@click.option('--no-archive', is_flag=True, help='Only ANALYZE/VACUUM')
+@with_appcontext
+def maintain_command(every, batch_size, pause, no_archive):
+    """Move rows past their retention period to the archive database, then ANALYZE/VACUUM"""
+    from models import retention
+
+    config = current_app.config
+    if not no_archive and not retention.enabled:
+        print("❌ No archive database: set ARCHIVE_DATABASE_URL (or use --no-archive)")
+        sys.exit(1)
+    while True:
+        started = time.perf_counter()
+        if not no_archive:
+            moved = retention.archive_all(db.session, config['RETENTION_MONTHS'],
+                                          batch_size or config['RETENTION_BATCH_SIZE'],
+                                          pause=lambda: time.sleep(pause))
+            for name, count in moved.items():
+                months = config['RETENTION_MONTHS'].get(name, 0)
+                kept = f"older than {months} months" if months else "kept forever"
+                print(f"📦 {name:<22} {count:>7} archived ({kept})")
+        for name, stats in retention.optimize(db.session, config['VACUUM_FREE_RATIO']).items():
+            print(f"🧹 {name:<22} {stats['pages']:>7} pages, {stats['free_pages']} free"
+                  f"{', vacuumed' if stats['vacuumed'] else ''}")
+        print(f"✅ Maintenance done in {time.perf_counter() - started:.1f}s")
+        if not every:
+            break
+        time.sleep(every * 3600)
+
+
+# ============================================================================
+# Static files
+# ============================================================================
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Minify, fingerprint and precompress static files into static/dist"""
+    from assets import build
+
+    manifest = build(current_app.static_folder,
+                     exclude=(image_pipeline.root, current_app.config['GALLERY_UPLOAD_FOLDER']))
+    static_assets.load()
+    print(f"✅ Built {len(manifest)} static assets")
+
+
+@click.command('build-gallery')
+@with_appcontext
+def build_gallery_command():
+    """Generate thumbnails and WebP copies for every gallery image"""
+    from models import GalleryImage
+
+    if not image_pipeline.enabled:
+        print("❌ Pillow is not installed; gallery images are served as-is")
+        sys.exit(1)
+    paths = [os.path.join(current_app.static_folder, filename)
+             for (filename,) in GalleryImage.query.with_entities(GalleryImage.filename)]
+    built = image_pipeline.generate_all(paths)
+    print(f"✅ Gallery derivatives built for {built} of {len(paths)} images")
+
+
+# ============================================================================
+# Background jobs and mail
+# ============================================================================
+@click.command('run-jobs')
+@with_appcontext
+def run_jobs_command():
+    """Work through the durable job table until interrupted"""
+    import models  # noqa: F401  (hooks the job table up to the queue)
+
+    if not jobs.durable:
+        print("❌ Set JOBS_DURABLE=1; in-memory jobs run inside the web workers")
+        sys.exit(1)
+    jobs.run_worker()
+
+
+@click.command('mail-sink')
+@click.option('--host', default='localhost')
+@click.option('--port', default=1025, type=int)
+def mail_sink_command(host, port):
+    """Local SMTP stand-in that prints every message it receives"""
+    from mail import MailSink
+
+    def show(sender, recipients, message):
+        print(f"📧 {sender} -> {', '.join(recipients)}: {message['Subject']}")
+        print(message.get_content())
+
+    print(f"📮 Mail sink listening on {host}:{port}")
+    with MailSink(host, port, show) as server:
+        server.serve_forever()
+
+
+# ============================================================================
+# Query plan check for the hot list routes
+# ============================================================================
+# Indexes the admin stats panels read whole on purpose: each panel is one
+# aggregate over a narrow covering index. Any other index scan without a
+# LIMIT fails explain-hot-routes.
+WHOLE_INDEX_SCANS = (
+    'ix_user_role_is_admin',
+    'ix_announcement_author_stats',
+    'ix_volunteer_application_status',
+    'ix_volunteer_opportunity_created_at_id',
+)
+
+
+def hot_route_urls():
+    """First page and a deep page of every paginated route"""
+    from pagination import encode_cursor
+
+    far = datetime(9999, 1, 1)
+    deep = encode_cursor([far, sys.maxsize])
+    deep_flagged = encode_cursor([True, far, sys.maxsize])
+    return [
+        '/', f'/?after={deep}',
+        '/questions', f'/questions?after={deep}',
+        '/community', f'/community?after={deep_flagged}',
+        '/community-forum', f'/community-forum?after={deep}',
+        '/members', f'/members?after={deep}',
+        '/gallery', f'/gallery?after={deep}',
+        '/volunteer', f'/volunteer?after={deep_flagged}',
+        '/my_applications', f'/my_applications?after={deep}',
+        '/admin/dashboard',
+        '/admin/users', f'/admin/users?after={deep}',
+        '/admin/announcements', f'/admin/announcements?after={deep}',
+        '/admin/volunteers', f'/admin/volunteers?after={deep}&apps_after={deep}',
+    ]
+
+
+@click.command('explain-hot-routes')
+@with_appcontext
+def explain_hot_routes_command():
+    """EXPLAIN QUERY PLAN every query behind the hot routes; fail on full scans"""
+    from models import User
+    from query_plans import check_routes
+
+    # Admin pages need a real admin now that the session only carries the id
+    admin = User.query.filter_by(is_admin=True).first()
+    temporary = admin is None
+    if temporary:
+        admin = User(username='explain-hot-routes', email='explain@example.com', is_admin=True, password_hash='!')
+        db.session.add(admin)
+        db.session.commit()
+    try:
+        results = check_routes(current_app._get_current_object(), db, hot_route_urls(),
+                               session_values={'user_id': admin.id}, allowed_indexes=WHOLE_INDEX_SCANS)
+    finally:
+        if temporary:
+            db.session.delete(admin)
+            db.session.commit()
+
+    failures = 0
+    for url, statement, details, problems in results:
+        status = '❌' if problems else '✅'
+        print(f"{status} {url}: {' | '.join(details)}")
+        if problems:
+            failures += 1
+            print(f"   {' '.join(statement.split())}")
+
+    print(f"{len(results)} queries checked, {failures} with full scans")
+    if failures:
+        sys.exit(1)
+
+
+# ============================================================================
+# Bulk import
+# ============================================================================
+@click.command('import-data')
+@click.argument('kind', type=click.Choice(['users', 'profiles', 'opportunities']))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'json', 'ndjson']), default=None,
+              help='Default: from the file extension')
+@click.option('--created-by', default='import', help='Recorded as the creator of imported opportunities')
+@click.option('--chunk-size', default=None, type=int, help='Rows per transaction (default IMPORT_CHUNK_SIZE)')
+@click.option('--workers', default=None, type=int, help='Password hashing processes (default IMPORT_HASH_WORKERS)')
+@with_appcontext
+def import_data_command(kind, path, fmt, created_by, chunk_size, workers):
+    """Import users, member profiles or volunteer opportunities from CSV/JSON"""
+    from blueprints.admin.imports import detect_format, read_records, run_import
+
+    fmt = fmt or detect_format(path)
+    if fmt is None:
+        print("❌ Can't tell the format from the file name; pass --format")
+        sys.exit(1)
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        report = run_import(kind, read_records(f, fmt), created_by=created_by,
+                            chunk_size=chunk_size or current_app.config['IMPORT_CHUNK_SIZE'],
+                            workers=workers or current_app.config['IMPORT_HASH_WORKERS'])
+    for number, message in report.errors:
+        print(f"⚠️  row {number}: {message}")
+    if report.error_count > len(report.errors):
+        print(f"⚠️  ... and {report.error_count - len(report.errors)} more")
+    print(f"✅ Imported {report.imported} {kind} in {time.perf_counter() - started:.1f}s; "
+          f"{report.error_count} rows skipped")
+
+
+# ============================================================================
+# Synthetic data and benchmarks (see benchmarks/)
+# ============================================================================
+@click.command('seed-data')
+@click.option('--rows', default=10_000, help='Approximate number of rows to generate')
+@click.option('--seed', default=1, help='Random seed; the same seed gives the same data')
+@with_appcontext
+def seed_data_command(rows, seed):
+    """Fill an empty database with realistic synthetic content"""
+    from benchmarks.seed import ADMIN, PASSWORD, seed as generate
+    from models import User
+
+    if User.query.first() is not None:
+        print("❌ The database already has users; seed a fresh one (DATABASE_URL=sqlite:///bench.db)")
+        sys.exit(1)
+    started = time.perf_counter()
+    written = generate(rows, seed)
+    for table, count in written.items():
+        print(f"   {table:<24} {count:>9}")
+    print(f"✅ Seeded {sum(written.values())} rows in {time.perf_counter() - started:.1f}s; "
+          f"sign in as {ADMIN} / {PASSWORD}")
+
+
+@click.command('benchmark')
+@click.option('--mode', type=click.Choice(['client', 'http']), default='client',
+              help='client: in-process with SQL counts; http: gunicorn under concurrent load')
+@click.option('--requests', default=50, help='Timed requests per route')
+@click.option('--concurrency', default=8, help='Concurrent clients (http mode)')
+@click.option('--workers', default=2, help='gunicorn workers (http mode)')
+@click.option('--threads', default=4, help='Threads per worker (http mode)')
+@click.option('--port', default=8765)
+@click.option('--baseline', 'baseline_path', default=None, help='Default: benchmarks/baseline-<mode>.json')
+@click.option('--save-baseline', is_flag=True, help='Store this run as the new baseline')
+@click.option('--tolerance', default=0.25, help='Allowed slowdown before a route counts as a regression')
+@with_appcontext
+def benchmark_command(mode, requests, concurrency, workers, threads, port, baseline_path, save_baseline,
+                      tolerance):
+    """Measure the hot routes against the seeded database; fail on regressions"""
+    from benchmarks import harness
+
+    if mode == 'client':
+        results = harness.run_client(current_app._get_current_object(), requests=requests)
+    else:
+        server = harness.start_server(db.engine.url.render_as_string(hide_password=False), port, workers, threads)
+        try:
+            results = harness.run_http(f'http://127.0.0.1:{port}', requests=requests, concurrency=concurrency,
+                                       server_pid=server.pid)
+        finally:
+            server.terminate()
+            server.wait()
+    results['mode'] = mode
+    results['rows'] = {table.name: db.session.query(table).count() for table in db.metadata.sorted_tables
+                       if table.name in ('user', 'question', 'answer', 'community_post', 'member_profile')}
+
+    for name, summary in results['routes'].items():
+        queries = f"{summary['queries']:>4} sql" if 'queries' in summary else ''
+        print(f"⏱️  {name:<20} p50 {summary['p50_ms']:8.2f}  p95 {summary['p95_ms']:8.2f}  "
+              f"p99 {summary['p99_ms']:8.2f} ms  {queries}{'  ❌ errors' if summary['errors'] else ''}")
+    for process, mb in results['rss_mb'].items():
+        print(f"🧠 {process}: {mb} MB")
+
+    baseline_path = baseline_path or os.path.join('benchmarks', f'baseline-{mode}.json')
+    if save_baseline:
+        harness.save_baseline(baseline_path, results)
+        print(f"✅ Baseline saved to {baseline_path}")
+        return
+
+    baseline = harness.load_baseline(baseline_path)
+    if baseline is None:
+        print(f"❌ No baseline at {baseline_path}; run with --save-baseline to record one")
+        sys.exit(1)
+    if baseline.get('rows') != results['rows']:
+        print(f"⚠️  Baseline was recorded on different data: {baseline.get('rows')}")
+    problems = harness.compare(results, baseline, tolerance)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if problems:
+        sys.exit(1)
+    print("✅ No regressions against the baseline")
+
+
+COMMANDS = [
+    init_db_command,
+    db_upgrade_command,
+    rebuild_search_command,
+    reconcile_counters_command,
+    calibrate_passwords_command,
+    build_assets_command,
+    build_gallery_command,
+    run_jobs_command,
+    mail_sink_command,
+    purge_sessions_command,
+    maintain_command,
+    explain_hot_routes_command,
+    import_data_command,
+    seed_data_command,
+    benchmark_command,
+]
+
+
+def register_commands(app):
+    for command in COMMANDS:
+        app.cli.add_command(command)
@@ -0,0 +1,102 @@
+import hashlib
+import time
+from functools import wraps
+
+from flask import current_app, make_response, request, session
+from sqlalchemy import case, event, update
+
+from auth import current_user
+
+
+class ContentVersions:
+    """Per-tag version stamps stored in the database, for HTTP validators.
+
+    Whenever a flush touches a tracked model, the versions of its tags are
+    bumped inside the same transaction, so every worker sees the same value
+    the moment the write commits. A version is max(previous + 1, unix time),
+    which keeps it strictly increasing even across a restore or a reset.
+    """
+
+    def __init__(self, version_model):
+        self.version_model = version_model
+        self.model_tags = {}
+
+    def track(self, model, *tags):
+        self.model_tags.setdefault(model, set()).update(tags)
+
+    def watch(self, session):
+        @event.listens_for(session, 'after_flush')
+        def bump_changed_tags(sess, flush_context):
+            tags = set()
+            for obj in list(sess.new) + list(sess.dirty) + list(sess.deleted):
+                tags.update(self.model_tags.get(type(obj), ()))
+            if tags:
+                self.bump(sess.connection(), *tags)
+
+    def bump(self, connection, *tags):
+        """Advance the version of `tags`; also call this after set-based writes"""
+        table = self.version_model.__table__
+        now = int(time.time())
+        # CASE rather than max(a, b): SQLite's two-argument max() is GREATEST elsewhere
+        following = table.c.version + 1
+        for tag in tags:
+            result = connection.execute(
+                update(table).where(table.c.tag == tag).values(version=case((following > now, following), else_=now))
+            )
+            if result.rowcount == 0:
+                connection.execute(table.insert().values(tag=tag, version=now))
+
+    def current(self, *tags):
+        rows = self.version_model.query.filter(self.version_model.tag.in_(tags)).all()
+        versions = {row.tag: row.version for row in rows}
+        return [versions.get(tag, 0) for tag in tags]
+
+    def conditional(self, *tags, extra=None):
+        """Decorator: answer If-None-Match with 304.
+
+        The validator is built from the tag versions (one primary-key query)
+        plus `extra(**view_args)` for per-row state, and is checked before
+        the view runs. Pages are personalised (navbar, owner-only buttons),
+        so the signed-in user's id, name and role are part of the ETag.
+        There is no Last-Modified and If-Modified-Since is ignored: a date
+        can't tell two viewers' pages apart.
+        """
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # Flash messages are one-shot; never let a 304 swallow them
+                if request.method != 'GET' or '_flashes' in session:
+                    return view(*args, **kwargs)
+
+                versions = self.current(*tags)
+                extra_value = extra(**kwargs) if extra else None
+                if extra is not None and extra_value is None:
+                    return view(*args, **kwargs)
+
+                viewer = (current_user.id, current_user.username, current_user.role,
+                          current_user.is_admin) if current_user else None
+                fingerprint = repr((
+                    current_app.config.get('ETAG_SALT', ''), request.endpoint, request.full_path,
+                    versions, extra_value, viewer,
+                ))
+                etag = hashlib.sha1(fingerprint.encode()).hexdigest()
+
+                fresh = bool(request.if_none_match) and request.if_none_match.contains(etag)
+
+                response = make_response('', 304) if fresh else make_response(view(*args, **kwargs))
+                if response.status_code not in (200, 304):
+                    return response
+
+                response.set_etag(etag)
+                response.cache_control.no_cache = True
+                if 'user_id' in session:
+                    response.cache_control.private = True
+                else:
+                    response.cache_control.public = True
+                response.vary.add('Cookie')
+                return response
+
+            return wrapper
+
+        return decorator
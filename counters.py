@@ -0,0 +1,179 @@
+from types import SimpleNamespace
+
+from sqlalchemy import event, func, inspect, select, update
+
+
+def _previous_version(target):
+    """Snapshot of `target` as it was before the pending flush changed it"""
+    state = inspect(target)
+    values = {}
+    for attr in state.mapper.column_attrs:
+        history = state.attrs[attr.key].history
+        if history.deleted:
+            values[attr.key] = history.deleted[0]
+        else:
+            values[attr.key] = getattr(target, attr.key)
+    return SimpleNamespace(**values)
+
+
+class Counters:
+    """Denormalized counters kept in sync by mapper events.
+
+    Two kinds of counter are supported:
+
+    * child counts: an integer column on a parent row (Question.answer_count)
+      bumped whenever a child row is inserted, deleted or re-parented;
+    * site stats: named rows in the `stat_model` table (key/value) whose key is
+      derived from a row, e.g. 'users' or 'announcements:2024-05'.
+
+    Counters are only maintained for ORM flushes. Anything that writes with
+    set-based SQL must call reconcile() (or adjust the counters) itself.
+    """
+
+    def __init__(self, stat_model):
+        self.stat_model = stat_model
+        self.child_counters = []
+        self.stats = []
+        self.stat_keys = []
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+    def child_count(self, fk_column, counter_column):
+        """Keep `counter_column` equal to the number of rows pointing at it"""
+        child = fk_column.class_
+        parent = counter_column.class_
+        self.child_counters.append((fk_column, counter_column))
+
+        def bump(connection, parent_id, delta):
+            if parent_id is None:
+                return
+            pk = inspect(parent).primary_key[0]
+            connection.execute(
+                update(parent.__table__)
+                .where(pk == parent_id)
+                .values({counter_column.key: counter_column + delta})
+            )
+
+        @event.listens_for(child, 'after_insert')
+        def after_insert(mapper, connection, target):
+            bump(connection, getattr(target, fk_column.key), 1)
+
+        @event.listens_for(child, 'after_delete')
+        def after_delete(mapper, connection, target):
+            bump(connection, getattr(target, fk_column.key), -1)
+
+        @event.listens_for(child, 'after_update')
+        def after_update(mapper, connection, target):
+            history = inspect(target).attrs[fk_column.key].history
+            if history.deleted and history.added:
+                bump(connection, history.deleted[0], -1)
+                bump(connection, history.added[0], 1)
+
+    def stat(self, model, key, recount):
+        """Count rows of `model` under the stat name returned by `key(row)`.
+
+        `key` may return None for rows that should not be counted (e.g. an
+        inactive opportunity). `recount()` returns {key: count} from scratch
+        and is used by reconcile().
+        """
+        self.stats.append(recount)
+        self.stat_keys.append((model, key))
+
+        @event.listens_for(model, 'after_insert')
+        def after_insert(mapper, connection, target):
+            self._bump_stat(connection, key(target), 1)
+
+        @event.listens_for(model, 'after_delete')
+        def after_delete(mapper, connection, target):
+            self._bump_stat(connection, key(_previous_version(target)), -1)
+
+        @event.listens_for(model, 'after_update')
+        def after_update(mapper, connection, target):
+            old_key = key(_previous_version(target))
+            new_key = key(target)
+            if old_key != new_key:
+                self._bump_stat(connection, old_key, -1)
+                self._bump_stat(connection, new_key, 1)
+
+    def adjust(self, connection, model, rows, delta=1):
+        """Count `rows` of `model` written with set-based SQL (delta=-1 for deletes).
+
+        `rows` need the attributes the stat keys read; child counts are not
+        touched, so rows that have a counted parent also need adjust_children().
+        """
+        totals = {}
+        for stat_model, key in self.stat_keys:
+            if stat_model is model:
+                for row in rows:
+                    name = key(row)
+                    totals[name] = totals.get(name, 0) + delta
+        for name, change in totals.items():
+            if change:
+                self._bump_stat(connection, name, change)
+
+    def adjust_children(self, connection, model, rows, delta=1):
+        """Child counts on the parents of `rows` of `model` written with set-based SQL"""
+        for fk_column, counter_column in self.child_counters:
+            if fk_column.class_ is not model:
+                continue
+            parent = counter_column.class_
+            pk = inspect(parent).primary_key[0]
+            per_parent = {}
+            for row in rows:
+                parent_id = getattr(row, fk_column.key)
+                if parent_id is not None:
+                    per_parent[parent_id] = per_parent.get(parent_id, 0) + delta
+            for parent_id, change in per_parent.items():
+                connection.execute(
+                    update(parent.__table__)
+                    .where(pk == parent_id)
+                    .values({counter_column.key: counter_column + change})
+                )
+
+    def _bump_stat(self, connection, key, delta):
+        if key is None:
+            return
+        table = self.stat_model.__table__
+        result = connection.execute(
+            update(table).where(table.c.key == key).values(value=table.c.value + delta)
+        )
+        if result.rowcount == 0:
+            connection.execute(table.insert().values(key=key, value=max(delta, 0)))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get_many(self, *keys):
+        """Read several site stats in one query; missing keys read as 0"""
+        rows = self.stat_model.query.filter(self.stat_model.key.in_(keys)).all()
+        values = {row.key: row.value for row in rows}
+        return {key: values.get(key, 0) for key in keys}
+
+    def get(self, key):
+        return self.get_many(key)[key]
+
+    # ------------------------------------------------------------------
+    # Drift repair
+    # ------------------------------------------------------------------
+    def reconcile(self, session):
+        """Recompute every counter from the base tables and commit.
+
+        Returns the number of site stat keys written.
+        """
+        for fk_column, counter_column in self.child_counters:
+            parent = counter_column.class_
+            pk = inspect(parent).primary_key[0]
+            actual = select(func.count()).where(fk_column == pk).scalar_subquery()
+            session.execute(update(parent.__table__).values({counter_column.key: actual}))
+
+        table = self.stat_model.__table__
+        session.execute(table.delete())
+        values = {}
+        for recount in self.stats:
+            values.update(recount())
+        if values:
+            session.execute(table.insert(), [{'key': k, 'value': v} for k, v in values.items()])
+
+        session.commit()
+        return len(values)
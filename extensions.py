@@ -0,0 +1,38 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from assets import StaticAssets
+from cache import PageCache
+from images import ImagePipeline
+from jobs import JobQueue
+from metrics import RequestMetrics
+from passwords import PasswordPolicy
+from ratelimit import RateLimiter
+from routing import RoutingSession
+
+# Created unbound here and attached to an application in create_app(), so
+# importing them (from models, views or scripts) never touches the
+# database, the filesystem or the configuration.
+# db.session routes replica-policy reads to a read-only pool (see routing.py)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+
+# Password hashing cost and check concurrency (PASSWORD_* settings)
+passwords = PasswordPolicy()
+
+# Failed-login counters per IP and per username; counts share CACHE_URL
+login_limiter = RateLimiter(prefix='login:')
+
+# Background work (emails, archiving); see jobs.py
+jobs = JobQueue()
+
+# Page cache for anonymous visitors; the backend is chosen from CACHE_URL
+page_cache = PageCache()
+
+# Resized JPEG/WebP copies of gallery photos, built once per source file in
+# worker processes; cached gallery pages are dropped as each set lands
+image_pipeline = ImagePipeline(on_ready=lambda digest: page_cache.invalidate('gallery'))
+
+# Fingerprinted, precompressed CSS/JS/images once `flask build-assets` has run
+static_assets = StaticAssets()
+
+# Per-endpoint latency, SQL and template timings, served at /metrics
+request_metrics = RequestMetrics()
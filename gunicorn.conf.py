@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+# gunicorn -c gunicorn.conf.py wsgi:application
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# SQLite serialises writers, so a few processes each running several
+# threads scale reads across cores without piling up behind the write lock.
+# WEB_THREADS also sizes the SQLAlchemy pool in app.py; keep them in step.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', 4))
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to cap slow memory growth
+max_requests = 2000
+max_requests_jitter = 200
+
+# Build the app once in the master and fork it; creating it does no DB work,
+# so run `flask --app app init-db` as a deploy step before starting
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Connections opened by the master must not be shared with the children
+    from extensions import db
+    from wsgi import application
+    with application.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
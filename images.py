@@ -0,0 +1,268 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+
+# Widths generated for every gallery image; sources narrower than a width
+# only get the sizes they can fill (plus their own width).
+WIDTHS = (320, 640, 1280)
+JPEG_QUALITY = 82
+WEBP_QUALITY = 78
+META = 'meta.json'
+CHUNK_SIZE = 64 * 1024
+
+# EXIF tags: DateTimeOriginal lives in the Exif sub-IFD, DateTime in IFD0
+EXIF_IFD = 0x8769
+ORIENTATION = 0x0112
+DATE_TIME_ORIGINAL = 36867
+DATE_TIME = 306
+
+
+@lru_cache(maxsize=None)
+def _pillow():
+    """(Image, ImageOps) from Pillow, or (None, None) when it is not installed.
+
+    Imported on first use rather than at module load, so starting the app
+    does not pay for it.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:  # optional: without Pillow the gallery serves the originals
+        return None, None
+    return Image, ImageOps
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_hash(path):
+    return file_sha256(path)[:20]
+
+
+# ============================================================================
+# Ingest
+# ============================================================================
+def store_upload(stream, folder, max_bytes):
+    """Copy `stream` into a temporary file in `folder`, a chunk at a time.
+
+    Returns (path, sha256, size). The caller renames the file into place or
+    removes it. Raises ValueError once more than `max_bytes` have arrived.
+    """
+    os.makedirs(folder, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(dir=folder, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f'Images must be smaller than {max_bytes // (1024 * 1024)} MB')
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest(), size
+
+
+def _exif_datetime(exif):
+    value = exif.get_ifd(EXIF_IFD).get(DATE_TIME_ORIGINAL) or exif.get(DATE_TIME)
+    try:
+        return datetime.strptime(str(value).strip('\x00 '), '%Y:%m:%d %H:%M:%S') if value else None
+    except ValueError:
+        return None
+
+
+def read_metadata(path):
+    """(width, height, taken_at) of an image; taken_at from EXIF when present.
+
+    Raises ValueError if the file is not an image. Without Pillow nothing
+    can be read and (None, None, None) is returned.
+    """
+    Image, _ = _pillow()
+    if Image is None:
+        return None, None, None
+    try:
+        with Image.open(path) as image:
+            image.verify()
+        with Image.open(path) as image:
+            width, height = image.size
+            exif = image.getexif()
+            if exif.get(ORIENTATION) in (5, 6, 7, 8):  # stored rotated a quarter turn
+                width, height = height, width
+            return width, height, _exif_datetime(exif)
+    except (OSError, SyntaxError) as e:
+        raise ValueError('The file is not a supported image') from e
+
+
+def _save(image, path, **options):
+    # Write beside the final name and rename, so readers never see half a file
+    tmp = f'{path}.tmp'
+    image.save(tmp, **options)
+    os.replace(tmp, path)
+
+
+def generate(source_path, out_dir, widths=WIDTHS):
+    """Write resized JPEG and WebP copies of `source_path` into `out_dir`.
+
+    Runs in a worker process. meta.json is written last and marks the set
+    as complete; its contents are returned.
+    """
+    Image, ImageOps = _pillow()
+    os.makedirs(out_dir, exist_ok=True)
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+
+    sizes = sorted({w for w in widths if w < image.width} | {min(image.width, max(widths))})
+    variants = []
+    for width in sizes:
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        _save(resized, os.path.join(out_dir, f'{width}.jpg'), format='JPEG',
+              quality=JPEG_QUALITY, optimize=True, progressive=True)
+        _save(resized, os.path.join(out_dir, f'{width}.webp'), format='WEBP',
+              quality=WEBP_QUALITY, method=6)
+        variants.append({'width': width, 'height': height})
+
+    meta = {'width': image.width, 'height': image.height, 'variants': variants}
+    with open(os.path.join(out_dir, META + '.tmp'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(os.path.join(out_dir, META + '.tmp'), os.path.join(out_dir, META))
+    return meta
+
+
+class ResponsiveImage:
+    """What a template needs to render one image at several sizes"""
+
+    def __init__(self, url_for, base, meta):
+        widths = [variant['width'] for variant in meta['variants']]
+        self.width = meta['width']
+        self.height = meta['height']
+        self.src = url_for(f'{base}/{widths[-1]}.jpg')
+        self.srcset_jpeg = ', '.join(f'{url_for(f"{base}/{w}.jpg")} {w}w' for w in widths)
+        self.srcset_webp = ', '.join(f'{url_for(f"{base}/{w}.webp")} {w}w' for w in widths)
+
+
+class ImagePipeline:
+    """Thumbnail/WebP derivatives cached on disk under static/<root>/<hash>/.
+
+    Directories are keyed by the source file's content hash, so an image is
+    only ever processed once and the URLs can be cached forever. Missing
+    sets are generated in a background process pool; until one is ready
+    the page falls back to the original file, and `on_ready` is called
+    (e.g. to invalidate cached pages) when it lands.
+    """
+
+    def __init__(self, static_folder=None, root='derived', max_workers=2, on_ready=None):
+        self.static_folder = static_folder
+        self.root = root
+        self.max_workers = max_workers
+        self.on_ready = on_ready
+        self._executor = None
+        self._pending = set()
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.static_folder = app.static_folder
+
+    @property
+    def enabled(self):
+        return _pillow()[0] is not None
+
+    def _hash(self, path, content_hash=None):
+        if content_hash:
+            return content_hash[:20]
+        # Hashing reads the whole file; only redo it when the file changes
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        if key not in self._hashes:
+            self._hashes[key] = source_hash(path)
+        return self._hashes[key]
+
+    def _out_dir(self, digest):
+        return os.path.join(self.static_folder, self.root, digest)
+
+    def _meta(self, digest):
+        try:
+            with open(os.path.join(self._out_dir(digest), META), encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _executor_for_jobs(self):
+        if self._executor is None:
+            # spawn, not fork: the web process has threads and open DB connections
+            context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+        return self._executor
+
+    def submit(self, path, content_hash=None):
+        """Queue derivative generation for `path` unless it exists or is queued"""
+        if not self.enabled:
+            return None
+        digest = self._hash(path, content_hash)
+        with self._lock:
+            if digest in self._pending or self._meta(digest) is not None:
+                return digest
+            self._pending.add(digest)
+        future = self._executor_for_jobs().submit(generate, path, self._out_dir(digest))
+        future.add_done_callback(lambda f: self._finished(digest, path, f))
+        return digest
+
+    def _finished(self, digest, path, future):
+        with self._lock:
+            self._pending.discard(digest)
+        error = future.exception()
+        if error is not None:
+            log.error('image derivatives failed', extra={'path': path, 'error': str(error)})
+        elif self.on_ready:
+            self.on_ready(digest)
+
+    def generate_all(self, paths):
+        """Generate every missing set now, in parallel; returns how many were built"""
+        if not self.enabled:
+            return 0
+        jobs = {}
+        for path in paths:
+            digest = self._hash(path)
+            if self._meta(digest) is None and digest not in jobs:
+                jobs[digest] = self._executor_for_jobs().submit(generate, path, self._out_dir(digest))
+        for future in jobs.values():
+            future.result()
+        return len(jobs)
+
+    def responsive(self, path, url_for, content_hash=None):
+        """ResponsiveImage for `path`, or None (queuing the work) if not built yet.
+
+        Pass the file's sha256 when it is already known to skip re-hashing.
+        """
+        if not self.enabled or not os.path.isfile(path):
+            return None
+        digest = self._hash(path, content_hash)
+        meta = self._meta(digest)
+        if meta is None:
+            self.submit(path, content_hash)
+            return None
+        return ResponsiveImage(url_for, f'{self.root}/{digest}', meta)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
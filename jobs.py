@@ -0,0 +1,338 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import has_app_context
+from sqlalchemy import and_, event, func, insert, or_, select, update
+from werkzeug.utils import import_string
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Counters kept per task name for the metrics view
+COUNTS = ('submitted', 'succeeded', 'retried', 'failed', 'rejected')
+
+
+class Job:
+    """One call of a task: the import path of a function and its keyword arguments"""
+
+    def __init__(self, task, kwargs, attempts=0, row_id=None):
+        self.task = task
+        self.kwargs = kwargs
+        self.attempts = attempts
+        self.row_id = row_id
+
+    @property
+    def key(self):
+        return self.task, json.dumps(self.kwargs, sort_keys=True, default=str)
+
+
+def _has_uncommitted_writes(session):
+    return bool(session.new or session.dirty or session.deleted or session.info.get('jobs_uncommitted'))
+
+
+class JobQueue:
+    """Runs slow side effects (emails, archiving) off
+    the request thread.
+
+    A task is a module-level function named by its import path and called
+    with keyword arguments inside an application context. Jobs enqueued
+    while the session has uncommitted writes wait for the commit and are
+    dropped on rollback, so a task never looks for a row that isn't there.
+
+    Jobs run on a thread pool of `max_workers`, which bounds how much CPU
+    they can take from requests (hashlib's KDFs and socket I/O release the
+    GIL). In memory, at most `max_pending` may wait; further jobs are
+    rejected rather than queued without limit. With `durable` they are
+    written to the `job` table instead and a poller thread claims them, so
+    they survive restarts and any worker process may run them. A failed job
+    is retried after `retry_delay` seconds, doubling each time, until it has
+    been tried `max_attempts` times.
+    """
+
+    def __init__(self, max_workers=4, max_pending=1000, max_attempts=3, retry_delay=2.0, durable=False,
+                 poll_interval=1.0, lease=300):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.durable = durable
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.app = None
+        self.session = None
+        self.model = None
+        self._executor = None
+        self._pid = None
+        self._poller_pid = None
+        self._wake = threading.Event()
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._running = 0
+        self._closed = False
+        self._queued = set()
+        self._stats = {}
+
+    def init_app(self, app):
+        self.app = app
+        self.max_workers = app.config['JOBS_WORKERS']
+        self.max_pending = app.config['JOBS_MAX_PENDING']
+        self.max_attempts = app.config['JOBS_MAX_ATTEMPTS']
+        self.durable = app.config['JOBS_DURABLE']
+        if self.durable:
+            # Picks up jobs left in the table by a previous run as soon as this worker serves
+            app.before_request(self._start_poller)
+
+    def watch(self, session, model=None):
+        """Hold jobs enqueued mid-transaction until `session` commits; store durable ones as `model` rows"""
+        self.session = session
+        self.model = model
+
+        @event.listens_for(session, 'after_flush')
+        def note_uncommitted_writes(sess, flush_context):
+            sess.info['jobs_uncommitted'] = True
+
+        @event.listens_for(session, 'after_commit')
+        def submit_held_jobs(sess):
+            sess.info.pop('jobs_uncommitted', None)
+            if sess.info.pop('jobs_stored', False):
+                self._start_poller()
+                self._wake.set()
+            for job in sess.info.pop('jobs', []):
+                self._submit(job)
+
+        @event.listens_for(session, 'after_rollback')
+        def drop_held_jobs(sess):
+            sess.info.pop('jobs_uncommitted', None)
+            sess.info.pop('jobs_stored', None)
+            with self._lock:
+                for job in sess.info.pop('jobs', []):
+                    self._queued.discard(job.key)
+
+    # ------------------------------------------------------------------
+    # Enqueueing
+    # ------------------------------------------------------------------
+    def enqueue(self, task, *, durable=None, unique=False, **kwargs):
+        """Run `task` (an import path) with `kwargs` in the background.
+
+        durable=False keeps a job out of the table even in durable mode, for
+        arguments that must never be written to disk (e.g. a password) or
+        work that only matters to this process. unique=True skips the job if
+        an identical one is already waiting. Returns False if it was rejected.
+        """
+        job = Job(task, kwargs)
+        session = self.session if self.session is not None and has_app_context() else None
+        durable = self.durable if durable is None else durable
+
+        if durable and session is not None and self.model is not None:
+            self._count(task, 'submitted')
+            if _has_uncommitted_writes(session):
+                session.add(self.model(task=task, payload=json.dumps(kwargs)))
+                session.info['jobs_stored'] = True
+            else:
+                with session.get_bind().begin() as connection:
+                    connection.execute(insert(self.model.__table__).values(task=task, payload=json.dumps(kwargs)))
+                self._start_poller()
+                self._wake.set()
+            return True
+
+        if unique:
+            with self._lock:
+                if job.key in self._queued:
+                    return True
+                self._queued.add(job.key)
+        if session is not None and _has_uncommitted_writes(session):
+            session.info.setdefault('jobs', []).append(job)
+            return True
+        return self._submit(job)
+
+    def _started(self):
+        """The pool (and, in durable mode, the poller) for this process"""
+        if self._pid != os.getpid():
+            # First use, or first use in a freshly forked worker
+            self._pid = os.getpid()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job')
+            self._pending = self._running = 0
+            self._queued.clear()
+        return self._executor
+
+    def _start_poller(self):
+        if self.durable and self.model is not None and self._poller_pid != os.getpid():
+            self._poller_pid = os.getpid()
+            threading.Thread(target=self._poll, name='job-poller', daemon=True).start()
+
+    def _submit(self, job, delay=0):
+        executor = self._started()
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._queued.discard(job.key)
+                self._count(job.task, 'rejected')
+                log.warning('job queue full, job dropped', extra={'task': job.task})
+                return False
+            self._pending += 1
+            if job.attempts == 0 and job.row_id is None:
+                self._count(job.task, 'submitted')
+        if delay:
+            timer = threading.Timer(delay, self._start, (executor, job))
+            timer.daemon = True
+            timer.start()
+            return True
+        return self._start(executor, job)
+
+    def _start(self, executor, job):
+        try:
+            executor.submit(self._run, job)
+            return True
+        except RuntimeError:
+            # The pool is shut down (interpreter exit, e.g. a callback after a
+            # CLI command). A stored job goes back to the table for the next
+            # process; an in-memory one is lost.
+            with self._lock:
+                self._pending -= 1
+                self._queued.discard(job.key)
+            self._closed = True
+            self._count(job.task, 'rejected')
+            if job.row_id is None:
+                log.info('job pool shut down, job dropped', extra={'task': job.task})
+            else:
+                with self.app.app_context():
+                    self._finish_row(job, 'pending', run_after=datetime.utcnow())
+            return False
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+    def _run(self, job):
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            self._queued.discard(job.key)
+
+        started = time.perf_counter()
+        error = None
+        with self.app.app_context():
+            try:
+                import_string(job.task)(**job.kwargs)
+            except Exception as e:
+                error = e
+                self.session.rollback()
+            job.attempts += 1
+
+            with self._lock:
+                self._running -= 1
+                self._task_stats(job.task)['seconds'] += time.perf_counter() - started
+
+            if error is None:
+                self._count(job.task, 'succeeded')
+                self._finish_row(job, 'done')
+            elif job.attempts < self.max_attempts:
+                self._count(job.task, 'retried')
+                delay = self.retry_delay * 2 ** (job.attempts - 1)
+                log.warning('job failed, will retry', extra={'task': job.task, 'attempt': job.attempts,
+                                                              'retry_in': delay, 'error': str(error)})
+                if job.row_id is None:
+                    self._submit(job, delay)
+                else:
+                    self._finish_row(job, 'pending', error, run_after=datetime.utcnow() + timedelta(seconds=delay))
+            else:
+                self._count(job.task, 'failed')
+                log.error('job failed', extra={'task': job.task, 'attempts': job.attempts, 'error': str(error)})
+                self._finish_row(job, 'failed', error)
+
+    def _task_stats(self, task):
+        stats = self._stats.get(task)
+        if stats is None:
+            stats = self._stats[task] = dict(dict.fromkeys(COUNTS, 0), seconds=0.0)
+        return stats
+
+    def _count(self, task, name):
+        with self._lock:
+            self._task_stats(task)[name] += 1
+
+    # ------------------------------------------------------------------
+    # Durable queue
+    # ------------------------------------------------------------------
+    def _poll(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._closed:
+                return  # the pool was shut down (interpreter exit)
+            try:
+                with self.app.app_context():
+                    for job in self.claim(self.max_workers - self._pending - self._running):
+                        self._submit(job)
+            except Exception:
+                log.exception('job poller failed')
+
+    def claim(self, limit):
+        """Mark up to `limit` due jobs as running and return them.
+
+        One UPDATE ... RETURNING, so two processes never claim the same row;
+        rows left running longer than `lease` (a worker died) are reclaimed.
+        """
+        if limit <= 0:
+            return []
+        table = self.model.__table__
+        now = datetime.utcnow()
+        due = select(table.c.id).where(or_(
+            and_(table.c.status == 'pending', table.c.run_after <= now),
+            and_(table.c.status == 'running', table.c.updated_at < now - timedelta(seconds=self.lease)),
+        )).order_by(table.c.run_after, table.c.id).limit(limit)
+        with self.session.get_bind().begin() as connection:
+            rows = connection.execute(
+                update(table).where(table.c.id.in_(due.scalar_subquery()))
+                .values(status='running', updated_at=now)
+                .returning(table.c.id, table.c.task, table.c.payload, table.c.attempts)
+            ).all()
+        return [Job(task, json.loads(payload), attempts, row_id) for row_id, task, payload, attempts in rows]
+
+    def _finish_row(self, job, status, error=None, run_after=None):
+        if job.row_id is None:
+            return
+        values = {'status': status, 'attempts': job.attempts, 'updated_at': datetime.utcnow(),
+                  'last_error': str(error)[:1000] if error else None}
+        if run_after is not None:
+            values['run_after'] = run_after
+        table = self.model.__table__
+        with self.session.get_bind().begin() as connection:
+            connection.execute(update(table).where(table.c.id == job.row_id).values(**values))
+
+    def run_worker(self):
+        """Run durable jobs in the foreground (for a dedicated worker process)"""
+        self._start_poller()
+        print(f"👷 Running jobs with {self.max_workers} workers; Ctrl+C to stop")
+        while True:
+            time.sleep(self.poll_interval)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+    def metrics(self):
+        """Counters for this process, plus the durable table's status counts"""
+        with self._lock:
+            snapshot = {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'running': self._running,
+                'durable': self.durable,
+                'tasks': {task: dict(stats) for task, stats in sorted(self._stats.items())},
+            }
+        if self.model is not None:
+            table = self.model.__table__
+            with self.session.get_bind().connect() as connection:
+                snapshot['stored'] = dict(connection.execute(
+                    select(table.c.status, func.count()).group_by(table.c.status)
+                ).all())
+        return snapshot
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+            self._pid = None
@@ -0,0 +1,89 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Everything the app logs goes through loggers under this name
+ROOT = 'ojoto'
+
+# Attributes every LogRecord has; anything else came in through `extra=`
+_STANDARD = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+def get_logger(name):
+    """Logger for a module: get_logger(__name__)"""
+    return logging.getLogger(f'{ROOT}.{name}')
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and any `extra` fields"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name.removeprefix(ROOT + '.'),
+            'message': record.getMessage(),
+            'pid': record.process,
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _STANDARD)
+        if record.exc_info:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['error'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _BackgroundHandler(QueueHandler):
+    """Hands records to a queue; a thread formats and writes them.
+
+    A request thread never waits on stderr (a slow terminal, a full pipe to
+    the log collector). The writer thread is started on first use in each
+    process, so it also exists in gunicorn workers forked after create_app.
+    """
+
+    def __init__(self, target):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self._listener = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def prepare(self, record):
+        # Formatting happens on the writer thread; only freeze the message and traceback text
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def emit(self, record):
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # A fresh queue too: the parent's may have been mid-put when it forked
+                    self.queue = queue.SimpleQueue()
+                    self._listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+                    self._listener.start()
+                    self._pid = os.getpid()
+                    # Write out whatever is still queued when the process exits
+                    atexit.register(self._listener.stop)
+        super().emit(record)
+
+
+def init_logging(app):
+    """Send the app's log records, as JSON lines, to stderr off the request thread"""
+    logger = logging.getLogger(ROOT)
+    logger.setLevel(app.config['LOG_LEVEL'])
+    logger.propagate = False
+    if not any(isinstance(handler, _BackgroundHandler) for handler in logger.handlers):
+        stream = logging.StreamHandler(sys.stderr)
+        stream.setFormatter(JSONFormatter())
+        logger.addHandler(_BackgroundHandler(stream))
+    return logger
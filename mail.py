@@ -0,0 +1,71 @@
+import smtplib
+import socketserver
+from email.message import EmailMessage
+from email.parser import BytesParser
+from email.policy import default
+
+from flask import current_app
+
+
+def send_mail(to, subject, body):
+    """Send one plain-text message through MAIL_SERVER:MAIL_PORT.
+
+    Called from background jobs, so a slow or unreachable server costs a
+    worker thread and a retry, never a request.
+    """
+    config = current_app.config
+    message = EmailMessage()
+    message['From'] = config['MAIL_SENDER']
+    message['To'] = to
+    message['Subject'] = subject
+    message.set_content(body)
+    with smtplib.SMTP(config['MAIL_SERVER'], config['MAIL_PORT'], timeout=config['MAIL_TIMEOUT']) as smtp:
+        smtp.send_message(message)
+
+
+# ============================================================================
+# Local SMTP stand-in for development (`flask mail-sink`)
+# ============================================================================
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: accepts every message and hands it on"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.reply('220 ojoto mail sink')
+        sender, recipients = None, []
+        for raw in self.rfile:
+            command = raw.decode('utf-8', 'replace').strip()
+            verb = command[:4].upper()
+            if verb in ('HELO', 'EHLO'):
+                self.reply('250 ok')
+            elif verb == 'MAIL':
+                sender, recipients = command.partition(':')[2].strip(), []
+                self.reply('250 ok')
+            elif verb == 'RCPT':
+                recipients.append(command.partition(':')[2].strip())
+                self.reply('250 ok')
+            elif verb == 'DATA':
+                self.reply('354 end data with <CR><LF>.<CR><LF>')
+                lines = []
+                for line in self.rfile:
+                    if line.rstrip(b'\r\n') == b'.':
+                        break
+                    lines.append(line[1:] if line.startswith(b'..') else line)
+                self.server.on_message(sender, recipients, BytesParser(policy=default).parsebytes(b''.join(lines)))
+                self.reply('250 queued')
+            elif verb == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class MailSink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host, port, on_message):
+        super().__init__((host, port), _SinkHandler)
+        self.on_message = on_message
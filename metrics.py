@@ -0,0 +1,213 @@
+import hmac
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+from flask import Response, abort, before_render_template, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Seconds; a rendered page should land in the first few buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# SQL statements per request; anything past ~20 is usually an N+1 loop
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Bucket counts, sum and count for one label set"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            yield f'{name}_bucket{_labels(labels, le=bound)} {cumulative}'
+        yield f'{name}_sum{_labels(labels)} {self.sum:.6f}'
+        yield f'{name}_count{_labels(labels)} {self.count}'
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class RequestMetrics:
+    """Per-endpoint latency, SQL statement counts/time and template render time.
+
+    Hooks: before/after/teardown_request for the request timer, the
+    Engine cursor events for SQL, Flask's template signals for rendering.
+    Numbers are kept per process and served at /metrics in the Prometheus
+    text format; under gunicorn each scrape sees one worker, so scrape
+    every worker (or sum over the `pid` label) for the whole picture.
+    Slow requests and statements repeated within one request (the N+1
+    signature) are logged as warnings.
+    """
+
+    def __init__(self):
+        self.slow_request = 1.0
+        self.repeat_threshold = 10
+        self.token = None
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self._statements = defaultdict(lambda: Histogram(STATEMENT_BUCKETS))
+        self._sql_seconds = Counter()
+        self._templates = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self._responses = Counter()
+
+    def init_app(self, app):
+        self.slow_request = app.config['METRICS_SLOW_REQUEST_SECONDS']
+        self.repeat_threshold = app.config['METRICS_REPEATED_STATEMENTS']
+        self.token = app.config['METRICS_TOKEN']
+
+        app.before_request(self._start_request)
+        app.after_request(self._note_status)
+        app.teardown_request(self._finish_request)
+        before_render_template.connect(self._start_template, app)
+        template_rendered.connect(self._finish_template, app)
+        if not event.contains(Engine, 'before_cursor_execute', _start_statement):
+            event.listen(Engine, 'before_cursor_execute', _start_statement)
+            event.listen(Engine, 'after_cursor_execute', _finish_statement)
+        app.add_url_rule('/metrics', 'metrics', self.export)
+
+    # ------------------------------------------------------------------
+    # Request hooks
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _start_request():
+        g.metrics_started = time.perf_counter()
+        g.metrics_sql = Counter()
+        g.metrics_sql_seconds = 0.0
+
+    @staticmethod
+    def _note_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    def _finish_request(self, error=None):
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        status = g.pop('metrics_status', 500)
+        statements = g.pop('metrics_sql', Counter())
+        sql_seconds = g.pop('metrics_sql_seconds', 0.0)
+        total = sum(statements.values())
+
+        with self._lock:
+            self._latency[(('endpoint', endpoint), ('method', request.method))].observe(elapsed)
+            self._responses[(('endpoint', endpoint), ('status', status))] += 1
+            self._statements[(('endpoint', endpoint),)].observe(total)
+            self._sql_seconds[(('endpoint', endpoint),)] += sql_seconds
+
+        if elapsed >= self.slow_request:
+            log.warning('slow request', extra={'endpoint': endpoint, 'path': request.path, 'status': status,
+                                               'seconds': round(elapsed, 3), 'sql_statements': total,
+                                               'sql_seconds': round(sql_seconds, 3)})
+        if statements:
+            statement, repeats = statements.most_common(1)[0]
+            if repeats >= self.repeat_threshold:
+                log.warning('repeated statement', extra={'endpoint': endpoint, 'path': request.path,
+                                                         'repeats': repeats, 'statement': ' '.join(statement.split())})
+
+    def _start_template(self, app, template, context, **extra):
+        g.setdefault('metrics_templates', []).append(time.perf_counter())
+
+    def _finish_template(self, app, template, context, **extra):
+        stack = g.get('metrics_templates')
+        if stack:
+            elapsed = time.perf_counter() - stack.pop()
+            with self._lock:
+                self._templates[(('template', template.name),)].observe(elapsed)
+
+    # ------------------------------------------------------------------
+    # Exposition
+    # ------------------------------------------------------------------
+    def _allowed(self):
+        if self.token:
+            supplied = request.headers.get('Authorization', '').removeprefix('Bearer ')
+            return hmac.compare_digest(supplied, self.token)
+        if request.remote_addr not in ('127.0.0.1', '::1'):
+            return False
+        # Loopback with forwarding headers ProxyFix didn't apply is a local
+        # reverse proxy relaying someone else: the real client is unknown
+        forwarded = 'X-Forwarded-For' in request.headers or 'Forwarded' in request.headers
+        return not forwarded or 'werkzeug.proxy_fix.orig' in request.environ
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        from extensions import jobs, page_cache
+
+        pid = ('pid', os.getpid())
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                if isinstance(value, Histogram):
+                    lines.extend(value.lines(name, (pid,) + labels))
+                else:
+                    lines.append(f'{name}{_labels((pid,) + labels)} {value}')
+
+        with self._lock:
+            family('http_request_duration_seconds', 'histogram', 'Time spent handling a request',
+                   sorted(self._latency.items()))
+            family('http_responses_total', 'counter', 'Responses sent, by status code',
+                   sorted(self._responses.items()))
+            family('db_statements_per_request', 'histogram', 'SQL statements executed per request',
+                   sorted(self._statements.items()))
+            family('db_statement_seconds_total', 'counter', 'Time spent in SQL statements',
+                   [(labels, f'{seconds:.6f}') for labels, seconds in sorted(self._sql_seconds.items())])
+            family('template_render_seconds', 'histogram', 'Time spent rendering a template',
+                   sorted(self._templates.items()))
+
+        family('page_cache_requests_total', 'counter', 'Page cache lookups',
+               [((('result', 'hit'),), page_cache.hits), ((('result', 'miss'),), page_cache.misses)])
+        job_metrics = jobs.metrics()
+        family('jobs_pending', 'gauge', 'Background jobs waiting or running', [((), job_metrics['pending'])])
+        family('process_start_time_seconds', 'gauge', 'When this worker started', [((), f'{self.started_at:.0f}')])
+        return '\n'.join(lines) + '\n'
+
+    def export(self):
+        if not self._allowed():
+            abort(404)
+        return Response(self.render(), mimetype='text/plain; version=0.0.4')
+
+
+# ============================================================================
+# SQL timing, for every engine (primary and replica)
+# ============================================================================
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_started', []).append(time.perf_counter())
+
+
+def _finish_statement(conn, cursor, statement, parameters, context, executemany):
+    stack = conn.info.get('metrics_started')
+    if not stack:
+        return
+    elapsed = time.perf_counter() - stack.pop()
+    # Statements run by background jobs have no request to charge them to
+    if has_request_context() and 'metrics_sql' in g:
+        g.metrics_sql[statement] += 1
+        g.metrics_sql_seconds += elapsed
@@ -0,0 +1,262 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+# Ordered list of (version, description, function). Each function receives a
+# Connection inside the upgrade transaction and the application's MetaData.
+MIGRATIONS = []
+
+# Steps that create objects the models cannot describe (e.g. FTS5 virtual
+# tables); these also run when a brand-new database is created.
+ON_CREATE = set()
+
+
+def migration(version, description, on_create=False):
+    """Register a schema migration step"""
+    def decorator(fn):
+        MIGRATIONS.append((version, description, fn))
+        MIGRATIONS.sort(key=lambda step: step[0])
+        if on_create:
+            ON_CREATE.add(version)
+        return fn
+    return decorator
+
+
+def latest_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def current_version(connection):
+    """Schema version recorded in the database, or None for a brand-new file"""
+    inspector = inspect(connection)
+    if inspector.has_table('schema_version'):
+        return connection.execute(text('SELECT version FROM schema_version')).scalar() or 0
+    # Databases created before migrations existed still have the original
+    # tables; treat them as version 0 so every step runs against them.
+    if inspector.has_table('user'):
+        return 0
+    return None
+
+
+def _stamp(connection, version):
+    connection.execute(text('CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)'))
+    connection.execute(text('DELETE FROM schema_version'))
+    connection.execute(text('INSERT INTO schema_version (version) VALUES (:v)'), {'v': version})
+
+
+def upgrade(db):
+    """Bring the database up to the latest schema.
+
+    A new database is created straight from the models and stamped with the
+    latest version. An existing one runs each pending step in order, each in
+    its own transaction. Returns the list of versions applied.
+    """
+    with db.engine.begin() as connection:
+        version = current_version(connection)
+        if version is None:
+            db.metadata.create_all(connection)
+            for step_version, description, fn in MIGRATIONS:
+                if step_version in ON_CREATE:
+                    fn(connection, db.metadata)
+            _stamp(connection, latest_version())
+            return []
+
+    applied = []
+    for step_version, description, fn in MIGRATIONS:
+        if step_version <= version:
+            continue
+        with db.engine.begin() as connection:
+            fn(connection, db.metadata)
+            _stamp(connection, step_version)
+        print(f"✅ Migration {step_version}: {description}")
+        applied.append(step_version)
+    return applied
+
+
+# ============================================================================
+# Helpers for writing steps
+# ============================================================================
+def add_columns(connection, metadata, table_name, *column_names):
+    """ALTER TABLE ADD COLUMN for model columns missing from the database"""
+    table = metadata.tables[table_name]
+    existing = {column['name'] for column in inspect(connection).get_columns(table_name)}
+    for name in column_names:
+        if name in existing:
+            continue
+        column = table.columns[name]
+        column_type = column.type.compile(dialect=connection.dialect)
+        default = f" DEFAULT {column.server_default.arg}" if column.server_default is not None else ""
+        connection.exec_driver_sql(f'ALTER TABLE "{table_name}" ADD COLUMN "{name}" {column_type}{default}')
+
+
+def alter_column_type(connection, metadata, table_name, column_name):
+    """Change a column to the type declared on its model.
+
+    SQLite ignores VARCHAR lengths, so there is nothing to do there.
+    """
+    if connection.dialect.name == 'sqlite':
+        return
+    column = metadata.tables[table_name].columns[column_name]
+    column_type = column.type.compile(dialect=connection.dialect)
+    if connection.dialect.name == 'mysql':
+        connection.exec_driver_sql(f'ALTER TABLE `{table_name}` MODIFY `{column_name}` {column_type}'
+                                   f'{"" if column.nullable else " NOT NULL"}')
+    else:
+        connection.exec_driver_sql(f'ALTER TABLE "{table_name}" ALTER COLUMN "{column_name}" TYPE {column_type}')
+
+
+def fill_and_require(connection, metadata, table_name, column_name, value):
+    """Set NULLs in a column to `value`, then declare it NOT NULL.
+
+    SQLite can't add NOT NULL to an existing column without rebuilding the
+    table, so there only the NULLs are filled; the model default keeps new
+    rows from adding more.
+    """
+    table = metadata.tables[table_name]
+    column = table.columns[column_name]
+    connection.execute(table.update().where(column.is_(None)).values({column_name: value}))
+    if connection.dialect.name == 'sqlite':
+        return
+    if connection.dialect.name == 'mysql':
+        column_type = column.type.compile(dialect=connection.dialect)
+        connection.exec_driver_sql(f'ALTER TABLE `{table_name}` MODIFY `{column_name}` {column_type} NOT NULL')
+    else:
+        connection.exec_driver_sql(f'ALTER TABLE "{table_name}" ALTER COLUMN "{column_name}" SET NOT NULL')
+
+
+def create_tables(connection, metadata, *table_names):
+    for name in table_names:
+        metadata.tables[name].create(connection, checkfirst=True)
+
+
+def create_indexes(connection, metadata, *index_names):
+    """Create the named indexes declared on the models, if missing"""
+    wanted = set(index_names)
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in wanted:
+                index.create(connection, checkfirst=True)
+                wanted.discard(index.name)
+    if wanted:
+        raise ValueError(f"Unknown indexes: {', '.join(sorted(wanted))}")
+
+
+# ============================================================================
+# Schema history
+# ============================================================================
+@migration(1, 'denormalized counter columns and site_stat table')
+def add_counters(connection, metadata):
+    add_columns(connection, metadata, 'question', 'answer_count')
+    add_columns(connection, metadata, 'discussion', 'reply_count')
+    add_columns(connection, metadata, 'community_post', 'comment_count')
+    add_columns(connection, metadata, 'volunteer_opportunity', 'application_count')
+    create_tables(connection, metadata, 'site_stat')
+    # site_stat is left empty; `flask init-db` reconciles it after migrating
+
+
+@migration(2, 'indexes for list, filter and foreign-key lookups')
+def add_hot_path_indexes(connection, metadata):
+    create_indexes(
+        connection, metadata,
+        'ix_user_created_at_id',
+        'ix_user_role_is_admin',
+        'ix_announcement_created_at_id',
+        'ix_announcement_author_stats',
+        'ix_question_created_at_id',
+        'ix_answer_question_id',
+        'ix_discussion_created_at_id',
+        'ix_discussion_reply_discussion_id',
+        'ix_community_comment_post_id',
+        'ix_community_post_pinned_created_at_id',
+        'ix_member_profile_user_id',
+        'ix_member_profile_public_created_at_id',
+        'ix_volunteer_opportunity_created_at_id',
+        'ix_volunteer_opportunity_active_listing',
+        'ix_volunteer_application_opportunity_email',
+        'ix_volunteer_application_email_applied_at',
+        'ix_volunteer_application_applied_at_id',
+        'ix_volunteer_application_status',
+    )
+
+
+@migration(3, 'full-text search index', on_create=True)
+def add_search_index(connection, metadata):
+    connection.exec_driver_sql(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("
+        "kind UNINDEXED, ref_id UNINDEXED, parent_id UNINDEXED, title, body, "
+        "tokenize='porter unicode61')"
+    )
+    # Populated by `flask init-db`, which rebuilds the index after this step
+    # (`flask db-upgrade` alone leaves it empty)
+
+
+@migration(4, 'content_version table for HTTP validators')
+def add_content_versions(connection, metadata):
+    create_tables(connection, metadata, 'content_version')
+
+
+@migration(5, 'gallery_image table')
+def add_gallery_images(connection, metadata):
+    create_tables(connection, metadata, 'gallery_image')
+    # Seeded with the bundled photos by `flask init-db`
+
+
+@migration(6, 'job table for the durable background queue')
+def add_jobs(connection, metadata):
+    create_tables(connection, metadata, 'job')
+
+
+@migration(7, 'widen user.password_hash for scrypt hashes')
+def widen_password_hash(connection, metadata):
+    alter_column_type(connection, metadata, 'user', 'password_hash')
+
+
+@migration(8, 'web_session table for server-side sessions')
+def add_web_sessions(connection, metadata):
+    create_tables(connection, metadata, 'web_session')
+
+
+# Parent -> child tables whose rows go with the parent. Declared ON DELETE
+# CASCADE on the models for server databases; SQLite only honours that with
+# PRAGMA foreign_keys, which has never been on for these files (and turning
+# it on would reject writes touching old orphaned rows), so there triggers
+# do the same job.
+CASCADES = (
+    ('community_post', 'community_comment', 'post_id'),
+    ('discussion', 'discussion_reply', 'discussion_id'),
+    ('volunteer_opportunity', 'volunteer_application', 'opportunity_id'),
+)
+
+
+@migration(9, 'delete child rows with their parent in the database', on_create=True)
+def add_delete_cascades(connection, metadata):
+    if connection.dialect.name != 'sqlite':
+        return
+    for parent, child, column in CASCADES:
+        connection.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS "{parent}_delete_{child}" AFTER DELETE ON "{parent}" '
+            f'BEGIN DELETE FROM "{child}" WHERE "{column}" = OLD.id; END'
+        )
+
+
+# Columns list pages sort on. A NULL makes the keyset seek's row-value
+# comparison NULL too, so those rows would never show up past page one.
+# Old rows without a date sort last, where NULLs used to.
+SORT_KEYS = (
+    ('user', 'created_at', datetime(1970, 1, 1)),
+    ('announcement', 'created_at', datetime(1970, 1, 1)),
+    ('question', 'created_at', datetime(1970, 1, 1)),
+    ('discussion', 'created_at', datetime(1970, 1, 1)),
+    ('community_post', 'is_pinned', False),
+    ('community_post', 'created_at', datetime(1970, 1, 1)),
+    ('member_profile', 'created_at', datetime(1970, 1, 1)),
+    ('volunteer_opportunity', 'is_urgent', False),
+    ('volunteer_opportunity', 'created_at', datetime(1970, 1, 1)),
+    ('volunteer_application', 'applied_at', datetime(1970, 1, 1)),
+)
+
+
+@migration(10, 'fill and forbid NULLs in list sort columns')
+def require_sort_keys(connection, metadata):
+    for table_name, column_name, value in SORT_KEYS:
+        fill_and_require(connection, metadata, table_name, column_name, value)
@@ -0,0 +1,426 @@
+from datetime import datetime
+
+from flask import url_for
+from sqlalchemy import func
+
+from auth import user_cache
+from conditional import ContentVersions
+from counters import Counters
+from extensions import db, jobs, page_cache, passwords
+from retention import Retention
+from search import SearchIndex
+
+
+# User Model
+class User(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String(80), unique=True, nullable=False)
+    email = db.Column(db.String(120), unique=True, nullable=False)
+    password_hash = db.Column(db.String(255), nullable=False)  # scrypt hashes run past 120 characters
+    role = db.Column(db.String(20), default='student')
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    is_admin = db.Column(db.Boolean, default=False)  # Added admin field
+
+    __table_args__ = (
+        db.Index('ix_user_created_at_id', 'created_at', 'id'),  # admin user list
+        db.Index('ix_user_role_is_admin', 'role', 'is_admin'),  # admin role counts
+    )
+
+    def set_password(self, password):
+        self.password_hash = passwords.hash(password)
+
+    def check_password(self, password):
+        return passwords.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return passwords.needs_rehash(self.password_hash)
+
+    def is_coordinator(self):
+        return self.role == 'coordinator'
+
+
+# Announcement Model
+class Announcement(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    is_urgent = db.Column(db.Boolean, default=False)
+
+    __table_args__ = (
+        db.Index('ix_announcement_created_at_id', 'created_at', 'id'),  # home page, admin list
+        db.Index('ix_announcement_author_stats', 'author', 'is_urgent', 'created_at'),  # admin stats
+    )
+
+
+# Updated Question Model
+class Question(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    category = db.Column(db.String(50), default='general')
+    author = db.Column(db.String(100), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    is_resolved = db.Column(db.Boolean, default=False)
+    is_urgent = db.Column(db.Boolean, default=False)
+    answer_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Relationship with answers
+    answers = db.relationship('Answer', backref='question', lazy=True, cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_question_created_at_id', 'created_at', 'id'),
+    )
+
+
+# Updated Answer Model
+class Answer(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    question_id = db.Column(db.Integer, db.ForeignKey('question.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    is_accepted = db.Column(db.Boolean, default=False)
+
+
+# Discussion Model (for community forum)
+class Discussion(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    topic = db.Column(db.String(50), default='general')
+    author = db.Column(db.String(100), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    reply_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Relationship with replies
+    replies = db.relationship('DiscussionReply', backref='discussion', lazy=True, cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_discussion_created_at_id', 'created_at', 'id'),
+    )
+
+
+# DiscussionReply Model
+class DiscussionReply(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    discussion_id = db.Column(db.Integer, db.ForeignKey('discussion.id', ondelete='CASCADE'), nullable=False,
+                              index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+# Community Comment Model
+class CommunityComment(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    post_id = db.Column(db.Integer, db.ForeignKey('community_post.id', ondelete='CASCADE'), nullable=False, index=True)
+
+
+# Community Post Model
+class CommunityPost(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    content = db.Column(db.Text, nullable=False)
+    author = db.Column(db.String(100), nullable=False)
+    category = db.Column(db.String(50), default='general')
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    is_pinned = db.Column(db.Boolean, nullable=False, default=False)
+    comment_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Relationship with comments. The database deletes them with the post
+    # (see migration 9), so deleting a post never loads its comments.
+    comments = db.relationship('CommunityComment', backref='post', lazy=True, cascade='all, delete-orphan',
+                               passive_deletes=True)
+
+    __table_args__ = (
+        db.Index('ix_community_post_pinned_created_at_id', 'is_pinned', 'created_at', 'id'),
+    )
+
+
+# Member Directory Model
+class MemberProfile(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    full_name = db.Column(db.String(100), nullable=False)
+    phone = db.Column(db.String(20))
+    location = db.Column(db.String(100))
+    profession = db.Column(db.String(100))
+    bio = db.Column(db.Text)
+    profile_picture = db.Column(db.String(200))
+    is_public = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship with User
+    user = db.relationship('User', backref=db.backref('profile', uselist=False))
+
+    __table_args__ = (
+        db.Index('ix_member_profile_public_created_at_id', 'is_public', 'created_at', 'id'),
+    )
+
+
+# Volunteer Opportunity Model
+class VolunteerOpportunity(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text, nullable=False)
+    organization = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(100))
+    contact_email = db.Column(db.String(120))
+    contact_phone = db.Column(db.String(20))
+    skills_needed = db.Column(db.String(300))
+    time_commitment = db.Column(db.String(100))
+    is_urgent = db.Column(db.Boolean, nullable=False, default=False)
+    is_active = db.Column(db.Boolean, default=True)
+    created_by = db.Column(db.String(100), nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    application_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+
+    # Relationship with volunteer applications
+    applications = db.relationship('VolunteerApplication', backref='opportunity', lazy=True,
+                                   cascade='all, delete-orphan')
+
+    __table_args__ = (
+        db.Index('ix_volunteer_opportunity_created_at_id', 'created_at', 'id'),  # admin list
+        db.Index('ix_volunteer_opportunity_active_listing', 'is_active', 'is_urgent', 'created_at', 'id'),
+    )
+
+
+# Volunteer Application Model
+class VolunteerApplication(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    opportunity_id = db.Column(db.Integer, db.ForeignKey('volunteer_opportunity.id', ondelete='CASCADE'),
+                               nullable=False)
+    applicant_name = db.Column(db.String(100), nullable=False)
+    applicant_email = db.Column(db.String(120), nullable=False)
+    applicant_phone = db.Column(db.String(20))
+    message = db.Column(db.Text)
+    skills = db.Column(db.String(300))
+    status = db.Column(db.String(20), default='pending')  # pending, approved, rejected
+    applied_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Duplicate-application check; also serves lookups by opportunity_id alone
+        db.Index('ix_volunteer_application_opportunity_email', 'opportunity_id', 'applicant_email'),
+        db.Index('ix_volunteer_application_email_applied_at', 'applicant_email', 'applied_at', 'id'),
+        db.Index('ix_volunteer_application_applied_at_id', 'applied_at', 'id'),
+        db.Index('ix_volunteer_application_status', 'status'),
+    )
+
+
+# Gallery Image Model
+class GalleryImage(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    filename = db.Column(db.String(255), nullable=False)  # relative to the static folder
+    title = db.Column(db.String(200), nullable=False)
+    description = db.Column(db.Text)
+    content_hash = db.Column(db.String(64), unique=True, nullable=False)  # sha256, for dedupe
+    size_bytes = db.Column(db.Integer)
+    width = db.Column(db.Integer)
+    height = db.Column(db.Integer)
+    # EXIF capture time when the file has one, otherwise the upload time
+    taken_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    uploaded_by = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_gallery_image_taken_at_id', 'taken_at', 'id'),  # gallery listing
+    )
+
+
+# Site-wide counters read by the admin dashboard (see `counters` below)
+class SiteStat(db.Model):
+    key = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, default=0, nullable=False)
+
+
+# Last-change stamp per content area, used for ETag/Last-Modified
+class ContentVersion(db.Model):
+    tag = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+
+
+# Background job waiting in the durable queue (JOBS_DURABLE); see jobs.py
+class Job(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    task = db.Column(db.String(200), nullable=False)  # import path of the function
+    payload = db.Column(db.Text, nullable=False)  # JSON keyword arguments
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, running, done, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    last_error = db.Column(db.Text)
+    run_after = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_job_status_run_after', 'status', 'run_after'),  # claiming due jobs
+    )
+
+
+# Server-side session data; the cookie only carries the id (see sessions.py)
+class WebSession(db.Model):
+    __tablename__ = 'web_session'
+
+    id = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)  # tagged JSON
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+
+# ============================================================================
+# Denormalized counters, kept current by mapper events
+# ============================================================================
+def announcement_month_key(created_at):
+    return f"announcements:{created_at:%Y-%m}"
+
+
+counters = Counters(SiteStat)
+counters.child_count(Answer.question_id, Question.answer_count)
+counters.child_count(DiscussionReply.discussion_id, Discussion.reply_count)
+counters.child_count(CommunityComment.post_id, CommunityPost.comment_count)
+counters.child_count(VolunteerApplication.opportunity_id, VolunteerOpportunity.application_count)
+
+counters.stat(
+    User,
+    key=lambda user: 'users',
+    recount=lambda: {'users': User.query.count()},
+)
+counters.stat(
+    VolunteerOpportunity,
+    key=lambda opp: 'active_opportunities' if opp.is_active else None,
+    recount=lambda: {'active_opportunities': VolunteerOpportunity.query.filter_by(is_active=True).count()},
+)
+counters.stat(
+    VolunteerApplication,
+    key=lambda application: 'pending_applications' if application.status == 'pending' else None,
+    recount=lambda: {'pending_applications': VolunteerApplication.query.filter_by(status='pending').count()},
+)
+counters.stat(
+    Announcement,
+    key=lambda ann: announcement_month_key(ann.created_at),
+    recount=lambda: {
+        f"announcements:{month}": count
+        for month, count in Announcement.query.with_entities(
+            func.strftime('%Y-%m', Announcement.created_at), func.count()
+        ).group_by(func.strftime('%Y-%m', Announcement.created_at)).all()
+    },
+)
+
+
+# ============================================================================
+# Full-text search index (FTS5), kept current by mapper events
+# ============================================================================
+search_index = SearchIndex()
+search_index.register(
+    MemberProfile, 'member', code=1,
+    fields=lambda member: (member.full_name, ' '.join(filter(None, [member.profession, member.location, member.bio]))),
+    when=lambda member: member.is_public,
+    url=lambda hit: url_for('members.member_detail', member_id=hit.ref_id),
+)
+search_index.register(
+    Question, 'question', code=2,
+    fields=lambda question: (question.title, question.content),
+    url=lambda hit: url_for('qa.question_detail', question_id=hit.ref_id),
+)
+search_index.register(
+    Answer, 'answer', code=3,
+    fields=lambda answer: (answer.author, answer.content),
+    parent=lambda answer: answer.question_id,
+    url=lambda hit: url_for('qa.question_detail', question_id=hit.parent_id),
+)
+search_index.register(
+    Discussion, 'discussion', code=4,
+    fields=lambda discussion: (discussion.title, discussion.content),
+    url=lambda hit: url_for('community.community_forum'),
+)
+search_index.register(
+    DiscussionReply, 'discussion_reply', code=5,
+    fields=lambda reply: (reply.author, reply.content),
+    parent=lambda reply: reply.discussion_id,
+    url=lambda hit: url_for('community.community_forum'),
+)
+search_index.register(
+    CommunityPost, 'post', code=6,
+    fields=lambda post: (post.title, post.content),
+    url=lambda hit: url_for('community.community'),
+)
+search_index.register(
+    VolunteerOpportunity, 'opportunity', code=7,
+    fields=lambda opp: (opp.title, ' '.join(filter(None, [opp.organization, opp.description, opp.skills_needed,
+                                                          opp.location]))),
+    when=lambda opp: opp.is_active,
+    url=lambda hit: url_for('volunteer.volunteer_detail', opportunity_id=hit.ref_id),
+)
+
+
+# ============================================================================
+# Rendered-page cache, invalidated when the underlying rows are committed
+# ============================================================================
+page_cache.watch(db.session)
+page_cache.invalidate_on(Announcement, 'announcements')
+page_cache.invalidate_on(CommunityPost, 'community')
+page_cache.invalidate_on(CommunityComment, 'community')
+page_cache.invalidate_on(MemberProfile, 'members')
+page_cache.invalidate_on(VolunteerOpportunity, 'volunteer')
+page_cache.invalidate_on(GalleryImage, 'gallery')
+
+# Database-backed version stamps so every worker agrees on ETags
+content_versions = ContentVersions(ContentVersion)
+content_versions.watch(db.session)
+content_versions.track(Announcement, 'announcements')
+content_versions.track(Question, 'questions')
+content_versions.track(Answer, 'questions')
+content_versions.track(CommunityPost, 'community')
+content_versions.track(CommunityComment, 'community')
+content_versions.track(VolunteerOpportunity, 'volunteer')
+
+
+# ============================================================================
+# Data retention: old rows move to the archive database (see retention.py)
+# ============================================================================
+retention = Retention(db, counters, search_index, content_versions, page_cache)
+retention.policy(
+    'announcements', Announcement, Announcement.created_at,
+    columns=('title', 'author', 'created_at'),
+)
+retention.policy(
+    'posts', CommunityPost, CommunityPost.created_at,
+    # Pinned posts stay, and so does a post until its last comment is old too
+    where=lambda cutoff: [CommunityPost.is_pinned.isnot(True),
+                          ~CommunityPost.comments.any(CommunityComment.created_at >= cutoff)],
+    children=[CommunityComment.post_id],
+    columns=('title', 'author', 'category', 'created_at', 'comment_count'),
+)
+retention.policy(
+    'discussions', Discussion, Discussion.created_at,
+    where=lambda cutoff: [~Discussion.replies.any(DiscussionReply.created_at >= cutoff)],
+    children=[DiscussionReply.discussion_id],
+    columns=('title', 'author', 'topic', 'created_at', 'reply_count'),
+)
+retention.policy(
+    'closed_opportunities', VolunteerOpportunity, VolunteerOpportunity.updated_at,
+    where=lambda cutoff: [VolunteerOpportunity.is_active.is_(False)],
+    children=[VolunteerApplication.opportunity_id],
+    columns=('title', 'organization', 'updated_at', 'application_count'),
+)
+retention.policy(
+    'applications', VolunteerApplication, VolunteerApplication.applied_at,
+    # Pending applications wait for a coordinator however old they are
+    where=lambda cutoff: [VolunteerApplication.status != 'pending'],
+    columns=('opportunity_id', 'applicant_name', 'status', 'applied_at'),
+)
+
+# Jobs enqueued inside a transaction are released (or stored) when it commits
+jobs.watch(db.session, Job)
+
+# Signed-in users are cached between requests until their row changes
+user_cache.watch(db.session, User)
@@ -0,0 +1,171 @@
+import base64
+import json
+from datetime import datetime
+
+from flask import g, request, url_for
+from sqlalchemy import and_, literal, or_, tuple_
+
+# Page size limits shared by every list route
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+class KeysetPage:
+    """One page of rows plus the cursor needed to fetch the next page"""
+
+    def __init__(self, items, next_cursor, after, limit):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.after = after
+        self.limit = limit
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def is_first(self):
+        return not self.after
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(values):
+    """Turn the sort key of the last row into an opaque, URL-safe cursor"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def _coerce(value, kind):
+    """`value` as an instance of `kind` (None: anything); raises ValueError if it isn't one"""
+    if kind is None or value is None:
+        return value
+    if kind is datetime and isinstance(value, str):
+        return datetime.fromisoformat(value)
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, kind) and not (kind is int and isinstance(value, bool)):
+        return value
+    raise ValueError(f'{value!r} is not a {kind.__name__}')
+
+
+def decode_cursor(cursor, size, types=None):
+    """Return the sort key stored in a cursor, or None if it is malformed.
+
+    With `types` (one python type per value, or None to accept anything)
+    a value of the wrong type also makes the cursor malformed, so a
+    tampered cursor gives the first page rather than a failed query.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            return None
+        values = [_decode_value(v) for v in values]
+        if types is not None:
+            values = [_coerce(value, kind) for value, kind in zip(values, types)]
+        return values
+    except (ValueError, TypeError):
+        return None
+
+
+def _python_type(column):
+    try:
+        return column.type.python_type
+    except NotImplementedError:
+        return None
+
+
+def page_size(default=None):
+    """Read ?limit= from the request, clamped to MAX_PAGE_SIZE.
+
+    Without a default, the blueprint's policy (g.page_size) decides.
+    """
+    default = default or g.get('page_size', DEFAULT_PAGE_SIZE)
+    limit = request.args.get('limit', default, type=int)
+    return max(1, min(limit or default, MAX_PAGE_SIZE))
+
+
+def _seek_condition(order, values):
+    """Build the WHERE clause that resumes an ordering after the given key.
+
+    When every column sorts the same way this is a row-value comparison,
+    (a, b, c) < (x, y, z), which SQLite turns into an index range seek.
+    Mixed directions fall back to the expanded form
+    a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z).
+    """
+    # Bind values as typed literals so booleans compare like any other value
+    bound = [literal(value, column.type) for (column, _), value in zip(order, values)]
+
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        columns = tuple_(*[column for column, _ in order])
+        key = tuple_(*bound)
+        return columns < key if directions.pop() else columns > key
+
+    clauses = []
+    for i, (column, descending) in enumerate(order):
+        equal_prefix = [col == val for (col, _), val in zip(order[:i], bound[:i])]
+        step = column < bound[i] if descending else column > bound[i]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def paginate_keyset(query, order, after=None, limit=None, cursor_arg='after'):
+    """Fetch one page of `query` ordered by `order`.
+
+    `order` is a list of (column, descending) pairs that must end on a unique
+    column (normally the primary key) so the ordering is total. The cursor
+    for the page is read from request.args[cursor_arg] unless given.
+    """
+    if after is None:
+        after = request.args.get(cursor_arg, '')
+    if limit is None:
+        limit = page_size()
+
+    query = query.order_by(*[col.desc() if desc else col.asc() for col, desc in order])
+
+    values = decode_cursor(after, len(order), [_python_type(column) for column, _ in order]) if after else None
+    if values is not None:
+        query = query.filter(_seek_condition(order, values))
+    else:
+        after = ''
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, col.key) for col, _ in order])
+
+    return KeysetPage(items, next_cursor, after, limit)
+
+
+def page_url(cursor_arg='after', cursor=None):
+    """URL for the current view with the cursor swapped, keeping other filters"""
+    args = request.args.to_dict()
+    args.pop(cursor_arg, None)
+    if cursor:
+        args[cursor_arg] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
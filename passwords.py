@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+import statistics
+import threading
+import time
+from collections import OrderedDict
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+# Werkzeug method strings: 'scrypt:N:r:p' or 'pbkdf2:sha256:iterations'
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+def _hash_prefix(method):
+    # Werkzeug fills in defaults ('scrypt' -> 'scrypt:32768:8:1'), so compare
+    # stored hashes with a real hash's prefix rather than the method string
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+class PasswordPolicy:
+    """How passwords are hashed and checked.
+
+    `method` is the KDF and cost for new hashes; a stored hash made with any
+    other method still verifies and is re-hashed after the next login. Only
+    `max_concurrent` checks run at once per process, so a burst of logins
+    queues instead of taking every core. Successful checks are remembered
+    for `verified_ttl` seconds, keyed by an HMAC of the stored hash and the
+    password, so logging in again soon after (another tab or device) skips
+    the KDF; changing the password changes the key.
+    """
+
+    def __init__(self, method=DEFAULT_METHOD, max_concurrent=2, verified_ttl=300, max_entries=10000):
+        self.method = method
+        self._prefix = None  # set by init_app(), or on first use
+        self.verified_ttl = verified_ttl
+        self.max_entries = max_entries
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._secret = b''
+        self._verified = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self._prefix = _hash_prefix(self.method)
+        self.verified_ttl = app.config['PASSWORD_VERIFIED_TTL']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_MAX_CONCURRENT'])
+        self._secret = app.config['SECRET_KEY'].encode()
+
+    def hash(self, password):
+        with self._slots:
+            return generate_password_hash(password, method=self.method)
+
+    def needs_rehash(self, password_hash):
+        if self._prefix is None:
+            self._prefix = _hash_prefix(self.method)
+        return password_hash.split('$', 1)[0] != self._prefix
+
+    def _key(self, password_hash, password):
+        return hmac.new(self._secret, f'{password_hash}\0{password}'.encode(), hashlib.sha256).digest()
+
+    def verify(self, password_hash, password):
+        key = self._key(password_hash, password) if self.verified_ttl else None
+        if key is not None:
+            with self._lock:
+                expires = self._verified.get(key)
+                if expires is not None and expires > time.monotonic():
+                    return True
+
+        with self._slots:
+            ok = check_password_hash(password_hash, password)
+
+        if ok and key is not None:
+            with self._lock:
+                self._verified[key] = time.monotonic() + self.verified_ttl
+                self._verified.move_to_end(key)
+                while len(self._verified) > self.max_entries:
+                    self._verified.popitem(last=False)
+        return ok
+
+
+# ============================================================================
+# Calibration (`flask calibrate-passwords`)
+# ============================================================================
+def time_method(method, runs=3):
+    """Median seconds to hash one password with `method`"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        generate_password_hash('calibration-password', method=method)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def calibrate(target_ms, algorithm='scrypt', runs=3):
+    """Timings of candidate costs and the strongest one within `target_ms`.
+
+    scrypt doubles N (memory grows with it: 128 * N * r bytes per hash);
+    pbkdf2 times 100k iterations and scales linearly. Returns
+    (method, [(candidate, ms), ...]).
+    """
+    if algorithm == 'pbkdf2':
+        base = 100_000
+        ms = time_method(f'pbkdf2:sha256:{base}', runs) * 1000
+        iterations = max(base, int(base * target_ms / ms) // 10_000 * 10_000)
+        method = f'pbkdf2:sha256:{iterations}'
+        return method, [(f'pbkdf2:sha256:{base}', ms), (method, time_method(method, runs) * 1000)]
+
+    results = []
+    method = 'scrypt:16384:8:1'
+    for log_n in range(14, 19):
+        candidate = f'scrypt:{2 ** log_n}:8:1'
+        ms = time_method(candidate, runs) * 1000
+        results.append((candidate, ms))
+        if ms > target_ms:
+            break
+        method = candidate
+    return method, results
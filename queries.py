@@ -0,0 +1,21 @@
+from sqlalchemy import func
+
+
+def _ids(rows):
+    return [row.id for row in rows]
+
+
+def status_counts(fk_column, status_column, parents):
+    """Map parent id -> {status: count} for child rows, in one GROUP BY query"""
+    ids = _ids(parents)
+    if not ids:
+        return {}
+
+    rows = fk_column.class_.query.with_entities(fk_column, status_column, func.count()).filter(
+        fk_column.in_(ids)
+    ).group_by(fk_column, status_column).all()
+
+    counts = {parent_id: {} for parent_id in ids}
+    for parent_id, status, count in rows:
+        counts[parent_id][status] = count
+    return counts
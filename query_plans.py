@@ -0,0 +1,83 @@
+import re
+
+from sqlalchemy import event
+
+_LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+_INDEX = re.compile(r'USING (?:COVERING )?INDEX (\w+)')
+
+
+def is_full_scan(detail, subqueries=(), limited=False, allowed_indexes=()):
+    """True for an EXPLAIN QUERY PLAN step that reads a whole table or sorts it.
+
+    SQLite reports table scans as "SCAN <table>". A scan that walks an index
+    in order ("USING INDEX", "USING COVERING INDEX") still reads all of it
+    unless a LIMIT stops it, so it only passes when the statement is
+    `limited` or the index is in `allowed_indexes`. Scans of a subquery's own
+    (already indexed) output are fine.
+    """
+    if detail.startswith('USE TEMP B-TREE'):
+        return True
+    if not detail.startswith('SCAN ') or detail.startswith('SCAN CONSTANT ROW'):
+        return False
+    if detail.split()[1] in subqueries:
+        return False
+    index = _INDEX.search(detail)
+    if index is None and 'USING INTEGER PRIMARY KEY' not in detail:
+        return True
+    if limited:
+        return False
+    return index is None or index.group(1) not in allowed_indexes
+
+
+def full_scans(details, statement='', allowed_indexes=()):
+    """The steps of one query plan that are full scans"""
+    subqueries = {detail.split()[1] for detail in details
+                  if detail.startswith(('CO-ROUTINE ', 'MATERIALIZE '))}
+    limited = bool(_LIMIT.search(statement))
+    return [detail for detail in details if is_full_scan(detail, subqueries, limited, allowed_indexes)]
+
+
+def capture_selects(engines, fn):
+    """Run fn() and return every (statement, parameters) SELECT it issued on any of `engines`"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        fn()
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return captured
+
+
+def explain(engine, statement, parameters):
+    with engine.connect() as connection:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+
+def check_routes(app, db, urls, session_values=None, allowed_indexes=()):
+    """Request each URL and EXPLAIN every SELECT the route runs.
+
+    `allowed_indexes` may be read whole without a LIMIT (see is_full_scan).
+
+    Returns a list of (url, statement, plan_details, problem_details).
+    """
+    client = app.test_client()
+    if session_values:
+        with client.session_transaction() as sess:
+            sess.update(session_values)
+
+    results = []
+    for url in urls:
+        statements = capture_selects(list(db.engines.values()), lambda: client.get(url))
+        for statement, parameters in statements:
+            details = explain(db.engine, statement, parameters)
+            problems = full_scans(details, statement, allowed_indexes)
+            results.append((url, statement, details, problems))
+    return results
@@ -0,0 +1,43 @@
+import time
+
+from cache import LRUCache
+
+
+class RateLimiter:
+    """Fixed-window attempt counter per key (e.g. per IP or per username).
+
+    Counts live in a cache backend, so with CACHE_URL pointing at Redis
+    every worker shares them. Read-then-write is not atomic across workers;
+    a few attempts may slip through under a race, which is fine for a
+    brute-force brake.
+    """
+
+    def __init__(self, backend=None, window=300, prefix='ratelimit:'):
+        self.backend = backend or LRUCache(max_entries=10000)
+        self.window = window
+        self.prefix = prefix
+
+    def configure(self, backend, window=None):
+        self.backend = backend
+        if window is not None:
+            self.window = window
+
+    def _entry(self, key):
+        entry = self.backend.get(self.prefix + key)
+        if entry is None or entry[1] <= time.time():
+            return 0, time.time() + self.window
+        return entry
+
+    def count(self, key):
+        return self._entry(key)[0]
+
+    def blocked(self, key, limit):
+        return self.count(key) >= limit
+
+    def hit(self, key):
+        count, resets_at = self._entry(key)
+        self.backend.set(self.prefix + key, (count + 1, resets_at), ttl=max(1, int(resets_at - time.time()) + 1))
+        return count + 1
+
+    def reset(self, key):
+        self.backend.delete(self.prefix + key)
@@ -0,0 +1,275 @@
+import calendar
+import os
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, MetaData, Table, delete, func, insert, select, tuple_
+from sqlalchemy.engine import make_url
+
+from logs import get_logger
+from pagination import KeysetPage, decode_cursor, encode_cursor
+
+log = get_logger(__name__)
+
+# Bind key of the archive database in SQLALCHEMY_BINDS
+ARCHIVE = 'archive'
+
+
+def archive_url(primary_url):
+    """A sibling SQLite file (ojoto_union.db -> ojoto_union_archive.db); None for other databases"""
+    url = make_url(primary_url)
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:') or url.query.get('uri'):
+        return None
+    root, extension = os.path.splitext(url.database)
+    return url.set(database=f'{root}_archive{extension or ".db"}').render_as_string(hide_password=False)
+
+
+def init_archive(app):
+    """Add the archive bind; call before db.init_app().
+
+    ARCHIVE_DATABASE_URL names the archive of a server database; for SQLite
+    it is a second file next to the first. With neither, nothing is archived.
+    """
+    url = app.config.get('ARCHIVE_DATABASE_URL') or archive_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url:
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[ARCHIVE] = url
+
+
+def months_before(moment, months):
+    """`moment` moved back by calendar months, clamped to the end of a shorter month"""
+    year, month = divmod(moment.year * 12 + moment.month - 1 - months, 12)
+    day = min(moment.day, calendar.monthrange(year, month + 1)[1])
+    return moment.replace(year=year, month=month + 1, day=day)
+
+
+class RetentionPolicy:
+    """Rows of `model` whose `date_column` is older than the configured number
+    of months, and that pass `where(cutoff)`, move to the archive together
+    with their `children` (foreign-key columns pointing at them)."""
+
+    def __init__(self, name, model, date_column, where=None, children=(), columns=()):
+        self.name = name
+        self.model = model
+        self.date_column = date_column
+        self.where = where or (lambda cutoff: ())
+        self.children = list(children)
+        self.columns = columns
+
+    @property
+    def models(self):
+        # Children first: that is the order they are deleted in
+        return [fk_column.class_ for fk_column in self.children] + [self.model]
+
+    def due(self, cutoff):
+        return [self.date_column < cutoff, *self.where(cutoff)]
+
+
+class Retention:
+    """Moves rows past their retention period into a separate archive database.
+
+    Each batch is one short transaction on the live database: the chosen rows
+    and their children are deleted with RETURNING, and the counters, search
+    entries and content versions the ORM hooks would have updated are
+    adjusted alongside. The returned rows are written to the archive before
+    that transaction commits, so a failure leaves a row in both databases
+    (the next run replaces the archived copy) and never in neither.
+    """
+
+    def __init__(self, db, counters, search_index, content_versions, page_cache):
+        self.db = db
+        self.counters = counters
+        self.search_index = search_index
+        self.content_versions = content_versions
+        self.page_cache = page_cache
+        self.policies = {}
+        self.metadata = MetaData()
+        self.tables = {}
+        self._created = set()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+    def policy(self, name, model, date_column, where=None, children=(), columns=()):
+        """Archive old `model` rows; `columns` are what the archive browser lists"""
+        policy = RetentionPolicy(name, model, date_column, where, children, columns)
+        self.policies[name] = policy
+        for child in policy.models:
+            self._archive_table(child)
+        archived = self.tables[model]
+        Index(f'ix_archived_{archived.name}_{date_column.key}_id', archived.c[date_column.key], archived.c.id)
+        for fk_column in policy.children:
+            child = self.tables[fk_column.class_]
+            Index(f'ix_archived_{child.name}_{fk_column.key}', child.c[fk_column.key])
+        return policy
+
+    def _archive_table(self, model):
+        # The same columns without constraints: parents (users, opportunities
+        # that are still open) needn't be in the archive
+        if model not in self.tables:
+            source = model.__table__
+            columns = [Column(column.name, column.type, primary_key=column.primary_key, autoincrement=False)
+                       for column in source.columns]
+            self.tables[model] = Table(source.name, self.metadata, *columns,
+                                       Column('archived_at', DateTime, nullable=False))
+        return self.tables[model]
+
+    # ------------------------------------------------------------------
+    # Archiving
+    # ------------------------------------------------------------------
+    @property
+    def enabled(self):
+        return ARCHIVE in self.db.engines
+
+    @property
+    def archive_engine(self):
+        engine = self.db.engines[ARCHIVE]
+        if engine not in self._created:
+            self.metadata.create_all(engine)
+            self._created.add(engine)
+        return engine
+
+    @staticmethod
+    def cutoff(months, now=None):
+        """Rows dated before this are due; None when a policy is switched off (0 months)"""
+        if not months:
+            return None
+        return months_before(now or datetime.utcnow(), months)
+
+    def due_count(self, session, policy, cutoff):
+        return session.scalar(select(func.count()).select_from(policy.model).where(*policy.due(cutoff)))
+
+    def archive_batch(self, session, policy, cutoff, batch_size):
+        """Move up to `batch_size` due rows of `policy` (and their children); returns how many"""
+        model = policy.model
+        ids = session.scalars(
+            select(model.id).where(*policy.due(cutoff)).order_by(policy.date_column, model.id).limit(batch_size)
+        ).all()
+        if not ids:
+            return 0
+
+        moved = {}
+        for fk_column in policy.children:
+            moved[fk_column.class_] = self._delete(session, fk_column.class_, fk_column.in_(ids))
+        moved[model] = self._delete(session, model, model.id.in_(ids))
+        page_tags = self._forget(session, policy, moved)
+        self._store(moved)
+        session.commit()
+        if page_tags:
+            self.page_cache.invalidate(*page_tags)
+        return len(moved[model])
+
+    def archive_all(self, session, months, batch_size, pause=None):
+        """Archive every due row, policy by policy; returns {policy name: rows moved}.
+
+        `months` maps policy names to retention in months. `pause()` runs
+        between batches so other writers get the database in between.
+        """
+        moved = {}
+        for name, policy in self.policies.items():
+            cutoff = self.cutoff(months.get(name, 0))
+            moved[name] = 0
+            while cutoff is not None:
+                count = self.archive_batch(session, policy, cutoff, batch_size)
+                moved[name] += count
+                if count < batch_size:
+                    break
+                if pause:
+                    pause()
+            if moved[name]:
+                log.info('rows archived', extra={'policy': name, 'rows': moved[name]})
+        return moved
+
+    @staticmethod
+    def _delete(session, model, condition):
+        table = model.__table__
+        return session.execute(delete(table).where(condition).returning(*table.c)).all()
+
+    def _forget(self, session, policy, moved):
+        """What the ORM delete hooks would have done for `moved`; returns the page-cache tags to drop"""
+        connection = session.connection()
+        version_tags, page_tags = set(), set()
+        for model, rows in moved.items():
+            if not rows:
+                continue
+            self.counters.adjust(connection, model, rows, delta=-1)
+            ids = [row.id for row in rows]
+            for kind, spec in self.search_index.kinds.items():
+                if spec['model'] is model:
+                    self.search_index.remove(session, kind, ids)
+            version_tags.update(self.content_versions.model_tags.get(model, ()))
+            page_tags.update(self.page_cache.model_tags.get(model, ()))
+        # Parents of the archived rows that stay behind (children's parents are gone too)
+        self.counters.adjust_children(connection, policy.model, moved[policy.model], delta=-1)
+        if version_tags:
+            self.content_versions.bump(connection, *version_tags)
+        return page_tags
+
+    def _store(self, moved):
+        archived_at = datetime.utcnow()
+        with self.archive_engine.begin() as connection:
+            for model, rows in moved.items():
+                if rows:
+                    table = self.tables[model]
+                    connection.execute(delete(table).where(table.c.id.in_([row.id for row in rows])))
+                    connection.execute(insert(table), [{**row._asdict(), 'archived_at': archived_at}
+                                                       for row in rows])
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def archived_count(self, policy):
+        with self.archive_engine.connect() as connection:
+            return connection.scalar(select(func.count()).select_from(self.tables[policy.model]))
+
+    def archived_page(self, policy, after='', limit=50):
+        """Archived rows of `policy`, newest first, one keyset page at a time"""
+        table = self.tables[policy.model]
+        date_column = table.c[policy.date_column.key]
+        statement = select(table).order_by(date_column.desc(), table.c.id.desc())
+        values = decode_cursor(after, 2, (datetime, int)) if after else None
+        if values is not None:
+            statement = statement.where(tuple_(date_column, table.c.id) < tuple_(*values))
+        else:
+            after = ''
+        with self.archive_engine.connect() as connection:
+            rows = connection.execute(statement.limit(limit + 1)).all()
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor([getattr(last, policy.date_column.key), last.id])
+        return KeysetPage(items, next_cursor, after, limit)
+
+    # ------------------------------------------------------------------
+    # Upkeep
+    # ------------------------------------------------------------------
+    def optimize(self, session, vacuum_ratio):
+        """ANALYZE both databases and VACUUM either once `vacuum_ratio` of its pages are free.
+
+        Returns {bind name: stats}. Archiving leaves free pages behind in the
+        live file; they are reused by new rows, so VACUUM only pays once a
+        good share of the file is empty.
+        """
+        self.search_index.optimize(session)
+        session.commit()
+        engines = {'primary': self.db.engine}
+        if self.enabled:
+            engines[ARCHIVE] = self.archive_engine
+        return {name: optimize_sqlite(engine, vacuum_ratio) for name, engine in engines.items()
+                if engine.dialect.name == 'sqlite'}
+
+
+def optimize_sqlite(engine, vacuum_ratio):
+    """Refresh planner statistics of one SQLite file, then VACUUM it if it is mostly free pages"""
+    # VACUUM can't run inside a transaction
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        # Sampled, so it takes milliseconds however large the tables are
+        connection.exec_driver_sql('PRAGMA analysis_limit=1000')
+        connection.exec_driver_sql('ANALYZE')
+        pages = connection.exec_driver_sql('PRAGMA page_count').scalar()
+        free = connection.exec_driver_sql('PRAGMA freelist_count').scalar()
+        vacuumed = bool(pages) and free / pages >= vacuum_ratio
+        if vacuumed:
+            connection.exec_driver_sql('VACUUM')
+            # Give the rewritten pages back to the file system now, not at the next checkpoint
+            connection.exec_driver_sql('PRAGMA wal_checkpoint(TRUNCATE)')
+        return {'pages': pages, 'free_pages': free, 'vacuumed': vacuumed}
@@ -0,0 +1,86 @@
+import time
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# Bind key of the read-only pool in SQLALCHEMY_BINDS
+REPLICA = 'replica'
+
+# Flask session key holding the time until which this browser reads from the
+# primary, so whoever just wrote something sees it on the next page
+STICKY_KEY = '_db_primary_until'
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+def replica_url(primary_url):
+    """Read-only URI onto the same SQLite file; None for other databases.
+
+    In WAL mode readers on this pool never wait for, or hold up, a writer on
+    the primary pool, and an accidental write fails instead of taking the lock.
+    """
+    url = make_url(primary_url)
+    if url.get_backend_name() != 'sqlite' or url.database in (None, '', ':memory:') or url.query.get('uri'):
+        return None
+    return f'sqlite:///file:{url.database}?mode=ro&uri=true'
+
+
+def reads_from_replica():
+    """True inside a GET/HEAD request to a blueprint whose policy allows replica
+    reads, unless this browser wrote something in the last few seconds"""
+    if not has_request_context() or request.method not in READ_METHODS:
+        return False
+    if g.get('database') != REPLICA:
+        return False
+    return session.get(STICKY_KEY, 0) < time.time()
+
+
+def _mark_written(db_session):
+    db_session.info['wrote'] = True
+    if has_request_context():
+        g.db_wrote = True
+
+
+class RoutingSession(Session):
+    """db.session that sends the SELECTs of replica-policy GET requests to the
+    replica bind, and everything else (flushes, UPDATE/DELETE statements,
+    raw connections) to the primary.
+
+    Once a session has written it stays on the primary until it is removed
+    at the end of the request, so a view always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if clause is not None and getattr(clause, 'is_dml', False):
+            _mark_written(self)
+        elif (bind is None and not self._flushing and not self.info.get('wrote')
+              and getattr(clause, 'is_select', False)
+              and REPLICA in self._db.engines and reads_from_replica()):
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(db_session, flush_context):
+    _mark_written(db_session)
+
+
+def _stick_to_primary(response):
+    if g.get('db_wrote'):
+        session[STICKY_KEY] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+    return response
+
+
+def init_routing(app):
+    """Add the replica bind and read-your-writes stickiness; call before db.init_app().
+
+    DATABASE_REPLICA_URL names a replica of a server database; for SQLite the
+    replica is a read-only pool on the same file. With neither, every query
+    goes to the primary.
+    """
+    url = app.config.get('DATABASE_REPLICA_URL') or replica_url(app.config['SQLALCHEMY_DATABASE_URI'])
+    if url:
+        app.config.setdefault('SQLALCHEMY_BINDS', {})[REPLICA] = url
+    app.after_request(_stick_to_primary)
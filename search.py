@@ -0,0 +1,203 @@
+import re
+
+from markupsafe import Markup, escape
+from sqlalchemy import Integer, bindparam, event, text
+
+from pagination import KeysetPage, decode_cursor, encode_cursor
+
+# Markers SQLite puts around matched terms in snippets; swapped for <mark>
+# only after the snippet text itself has been HTML-escaped.
+_OPEN, _CLOSE = '\x02', '\x03'
+
+
+def match_expression(query):
+    """Turn free text into a safe FTS5 query: every word must match, as a prefix"""
+    words = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class SearchHit:
+    def __init__(self, kind, ref_id, parent_id, title, snippet, rank, rowid):
+        self.kind = kind
+        self.ref_id = ref_id
+        self.parent_id = parent_id
+        self.title = title
+        self.rank = rank
+        self.rowid = rowid
+        self.snippet = Markup(
+            str(escape(snippet)).replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+        )
+        self.url = None
+
+
+class SearchIndex:
+    """FTS5 index over several models, kept current by mapper events.
+
+    Each registered kind maps a model row to (title, body). Rows for which
+    `when(row)` is false (e.g. private profiles) are kept out of the index.
+    Set-based writes that bypass the ORM must call rebuild() or reindex().
+
+    Entries are stored at rowid = ref_id * KIND_SLOTS + code, so keeping a
+    row's entry current is a primary-key delete/insert rather than a scan of
+    the (unindexed) kind/ref_id columns.
+    """
+
+    KIND_SLOTS = 16
+
+    def __init__(self):
+        self.kinds = {}
+
+    def register(self, model, kind, code, fields, url, when=None, parent=None):
+        """Index `model` rows under `kind`, stored with the fixed rowid `code`.
+
+        fields(row) -> (title, body); url(hit) -> link for a result;
+        parent(row) -> id stored alongside, for rows shown via their parent.
+        """
+        assert 0 <= code < self.KIND_SLOTS
+        self.kinds[kind] = {
+            'model': model, 'code': code, 'fields': fields, 'url': url,
+            'when': when or (lambda row: True), 'parent': parent or (lambda row: None),
+        }
+
+        @event.listens_for(model, 'after_insert')
+        def after_insert(mapper, connection, target):
+            self._write(connection, kind, target)
+
+        @event.listens_for(model, 'after_update')
+        def after_update(mapper, connection, target):
+            self._write(connection, kind, target)
+
+        @event.listens_for(model, 'after_delete')
+        def after_delete(mapper, connection, target):
+            self._remove(connection, kind, [target.id])
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _rowid(self, kind, ref_id):
+        return ref_id * self.KIND_SLOTS + self.kinds[kind]['code']
+
+    def _remove(self, connection, kind, ref_ids):
+        if ref_ids:
+            connection.execute(
+                text("DELETE FROM search_index WHERE rowid IN :rowids")
+                .bindparams(bindparam('rowids', expanding=True)),
+                {'rowids': [self._rowid(kind, ref_id) for ref_id in ref_ids]},
+            )
+
+    def remove(self, session, kind, ref_ids):
+        """Drop index entries for rows deleted with set-based SQL"""
+        self._remove(session.connection(), kind, list(ref_ids))
+
+    def _row(self, kind, target):
+        spec = self.kinds[kind]
+        title, body = spec['fields'](target)
+        return {
+            'rowid': self._rowid(kind, target.id), 'kind': kind, 'ref_id': target.id,
+            'parent_id': spec['parent'](target), 'title': title or '', 'body': body or '',
+        }
+
+    def _write(self, connection, kind, target):
+        self._remove(connection, kind, [target.id])
+        if self.kinds[kind]['when'](target):
+            self._insert_many(connection, [self._row(kind, target)])
+
+    def reindex(self, session, kind, rows):
+        """Rewrite the index entries of `rows` (all of one kind)"""
+        connection = session.connection()
+        for row in rows:
+            self._write(connection, kind, row)
+
+    def add(self, session, kind, rows):
+        """Index new `rows` of one kind (written with set-based INSERTs) in one statement"""
+        when = self.kinds[kind]['when']
+        entries = [self._row(kind, row) for row in rows if when(row)]
+        if entries:
+            self._insert_many(session, entries)
+
+    def rebuild(self, session, batch_size=1000):
+        """Drop and repopulate the whole index from the base tables"""
+        session.execute(text("DELETE FROM search_index"))
+        total = 0
+        for kind, spec in self.kinds.items():
+            rows = spec['model'].query.yield_per(batch_size)
+            batch = []
+            for row in rows:
+                if spec['when'](row):
+                    batch.append(self._row(kind, row))
+                if len(batch) >= batch_size:
+                    self._insert_many(session, batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                self._insert_many(session, batch)
+                total += len(batch)
+        self.optimize(session)
+        session.commit()
+        return total
+
+    @staticmethod
+    def optimize(session):
+        """Merge the index's segments (after a rebuild or many deletes) so queries read fewer pages"""
+        session.execute(text("INSERT INTO search_index (search_index) VALUES ('optimize')"))
+
+    @staticmethod
+    def _insert_many(executor, rows):
+        executor.execute(
+            text("INSERT INTO search_index (rowid, kind, ref_id, parent_id, title, body) "
+                 "VALUES (:rowid, :kind, :ref_id, :parent_id, :title, :body)"),
+            rows,
+        )
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def matching_ids(self, kind, query):
+        """Subquery of ref_ids of `kind` matching `query`, for use in .in_()"""
+        return text(
+            "SELECT ref_id FROM search_index WHERE search_index MATCH :match AND kind = :kind"
+        ).bindparams(match=match_expression(query), kind=kind).columns(ref_id=Integer)
+
+    def search(self, session, query, kinds=None, after='', limit=20):
+        """Ranked search across every kind (or just `kinds`), one page at a time.
+
+        Results are ordered by bm25 rank with titles weighted above bodies;
+        the cursor is the (rank, rowid) of the last hit on the page.
+        """
+        match = match_expression(query)
+        if not match:
+            return KeysetPage([], None, '', limit)
+
+        kinds = [kind for kind in (kinds or self.kinds) if kind in self.kinds]
+        params = {'match': match, 'limit': limit + 1}
+        kind_filter = ''
+        if kinds:
+            names = [f':kind{i}' for i in range(len(kinds))]
+            kind_filter = f" AND kind IN ({', '.join(names)})"
+            params.update({f'kind{i}': kind for i, kind in enumerate(kinds)})
+
+        seek = ''
+        key = decode_cursor(after, 2, (float, int)) if after else None
+        if key is not None:
+            seek = "WHERE (rank, rid) > (:after_rank, :after_rid)"
+            params.update(after_rank=key[0], after_rid=key[1])
+        else:
+            after = ''
+
+        sql = text(
+            "SELECT kind, ref_id, parent_id, title, snippet, rank, rid FROM ("
+            "  SELECT kind, ref_id, parent_id, title,"
+            f"   snippet(search_index, 4, '{_OPEN}', '{_CLOSE}', '…', 16) AS snippet,"
+            "    bm25(search_index, 0, 0, 0, 10.0, 1.0) AS rank, rowid AS rid"
+            f"  FROM search_index WHERE search_index MATCH :match{kind_filter}"
+            f") {seek} ORDER BY rank, rid LIMIT :limit"
+        )
+        rows = session.execute(sql, params).all()
+        hits = [SearchHit(*row) for row in rows[:limit]]
+        for hit in hits:
+            hit.url = self.kinds[hit.kind]['url'](hit)
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor([hits[-1].rank, hits[-1].rowid])
+        return KeysetPage(hits, next_cursor, after, limit)
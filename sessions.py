@@ -0,0 +1,168 @@
+import secrets
+from datetime import datetime
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from sqlalchemy import delete, insert, select, update
+from werkzeug.datastructures import CallbackDict
+
+from cache import LRUCache, make_backend
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data kept on the server; the cookie only carries `sid`"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.modified = False
+        self.accessed = True
+        self.new_sid = False
+
+    def regenerate(self):
+        """Move the data to a fresh id (on login and logout, against session fixation)"""
+        self.new_sid = True
+        self.modified = True
+
+
+# ============================================================================
+# Stores: load(sid) -> (data, expires_at) or None, save(), delete()
+# ============================================================================
+class CacheSessionStore:
+    """Sessions in a cache backend: an LRUCache for a single process, Redis
+    (CACHE_URL) for several processes or nodes"""
+
+    def __init__(self, backend, prefix='session:'):
+        self.backend = backend
+        self.prefix = prefix
+
+    def load(self, sid):
+        entry = self.backend.get(self.prefix + sid)
+        if entry is None or entry[1] <= datetime.utcnow():
+            return None
+        return entry
+
+    def save(self, sid, data, expires_at):
+        ttl = int((expires_at - datetime.utcnow()).total_seconds()) + 1
+        self.backend.set(self.prefix + sid, (data, expires_at), ttl=ttl)
+
+    def delete(self, sid):
+        self.backend.delete(self.prefix + sid)
+
+
+class DatabaseSessionStore:
+    """Sessions in the web_session table, shared by every worker using the
+    database. Reads and writes go straight to the primary engine, outside
+    the request's ORM session."""
+
+    def __init__(self, db):
+        self.db = db
+
+    @property
+    def table(self):
+        # Views (and with them the models) load on first use; sessions are read before that
+        from models import WebSession
+
+        return WebSession.__table__
+
+    def load(self, sid):
+        table = self.table
+        with self.db.engine.connect() as connection:
+            row = connection.execute(
+                select(table.c.data, table.c.expires_at)
+                .where(table.c.id == sid, table.c.expires_at > datetime.utcnow())
+            ).first()
+        return tuple(row) if row is not None else None
+
+    def save(self, sid, data, expires_at):
+        table = self.table
+        with self.db.engine.begin() as connection:
+            updated = connection.execute(
+                update(table).where(table.c.id == sid).values(data=data, expires_at=expires_at)
+            ).rowcount
+            if not updated:
+                connection.execute(insert(table).values(id=sid, data=data, expires_at=expires_at))
+
+    def delete(self, sid):
+        with self.db.engine.begin() as connection:
+            connection.execute(delete(self.table).where(self.table.c.id == sid))
+
+    def purge_expired(self):
+        with self.db.engine.begin() as connection:
+            return connection.execute(delete(self.table).where(self.table.c.expires_at <= datetime.utcnow())).rowcount
+
+
+# ============================================================================
+# Flask integration
+# ============================================================================
+class ServerSideSessionInterface(SessionInterface):
+    """Stores session data in `store` under a random id sent as the cookie.
+
+    The cookie stays a fixed ~43 bytes however much the session holds. An
+    unchanged session is only written back when less than half of its
+    lifetime is left, so most requests do one read and no write.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store):
+        self.store = store
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            loaded = self.store.load(sid)
+            if loaded is not None:
+                data, expires_at = loaded
+                return ServerSession(self.serializer.loads(data), sid, expires_at)
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        response.vary.add('Cookie')
+
+        if not session:
+            if session.sid is not None and session.modified:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.new_sid and session.sid is not None:
+            self.store.delete(session.sid)
+            session.sid = None
+        created = session.sid is None
+        if created:
+            session.sid = secrets.token_urlsafe(32)
+
+        now = datetime.utcnow()
+        lifetime = app.permanent_session_lifetime
+        if session.modified or created or session.expires_at - now < lifetime / 2:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)), now + lifetime)
+
+        if created or session.modified or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name, session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+                domain=domain, path=path,
+            )
+
+
+def make_session_store(app, db):
+    """The store named by SESSION_STORE: 'database', 'cache' or 'memory'"""
+    kind = app.config['SESSION_STORE']
+    if kind == 'database':
+        return DatabaseSessionStore(db)
+    if kind == 'cache':
+        return CacheSessionStore(make_backend(app.config['CACHE_URL']))
+    if kind == 'memory':
+        return CacheSessionStore(LRUCache(max_entries=app.config['SESSION_MAX_ENTRIES']))
+    raise ValueError(f"Unknown SESSION_STORE {kind!r}")
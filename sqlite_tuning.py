@@ -0,0 +1,58 @@
+import sqlite3
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# writer commits; NORMAL sync is durable across app crashes (not power loss)
+# in WAL mode; busy_timeout makes writers queue instead of failing with
+# "database is locked".
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,  # ms
+    'mmap_size': 256 * 1024 * 1024,  # bytes of the file mapped into memory
+    'cache_size': -32000,  # negative = KiB, i.e. ~32 MB per connection
+    'temp_store': 'MEMORY',
+}
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+_pragmas = dict(DEFAULT_PRAGMAS)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        apply_pragmas(dbapi_connection, _pragmas)
+
+
+def tune_sqlite(pragmas=None):
+    """Run `pragmas` on every SQLite connection any engine opens (idempotent)"""
+    _pragmas.clear()
+    _pragmas.update(DEFAULT_PRAGMAS, **(pragmas or {}))
+    if not event.contains(Engine, 'connect', _set_sqlite_pragmas):
+        event.listen(Engine, 'connect', _set_sqlite_pragmas)
+    return dict(_pragmas)
+
+
+def pool_options(threads):
+    """Engine options sized for one worker process running `threads` threads.
+
+    Each request thread holds at most one connection, so a pool of that size
+    never makes a request wait on another; the small overflow covers CLI and
+    background work sharing the process.
+    """
+    return {
+        'pool_size': threads,
+        'max_overflow': max(2, threads // 2),
+        'pool_timeout': 10,
+        'pool_recycle': 3600,
+    }
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from sqlalchemy import case, func, select
+
+
+def month_start(now=None):
+    """Midnight on the first day of the current (UTC) month"""
+    now = now or datetime.utcnow()
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def count_where(condition):
+    """COUNT of rows matching `condition`, for use inside aggregate()"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def count_distinct(column):
+    """Number of distinct values of `column` across its whole table.
+
+    Written as a count over a GROUP BY so SQLite can walk an index on the
+    column instead of building a temporary B-tree for COUNT(DISTINCT).
+    """
+    grouped = select(column).group_by(column).subquery()
+    return select(func.count()).select_from(grouped).scalar_subquery()
+
+
+def count_of(model, *conditions):
+    """Scalar subquery counting another table, so it can ride along in aggregate()"""
+    return select(func.count()).select_from(model).where(*conditions).scalar_subquery()
+
+
+def aggregate(query, **columns):
+    """Compute every named aggregate over `query` in a single SELECT.
+
+    Example:
+        aggregate(User.query, total=func.count(User.id),
+                  admins=count_where(User.is_admin == True))
+    """
+    names = list(columns)
+    row = query.with_entities(*[columns[name].label(name) for name in names]).one()
+    return {name: row[i] or 0 for i, name in enumerate(names)}
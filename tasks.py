@@ -0,0 +1,42 @@
+from flask import current_app
+
+from extensions import db, jobs
+from logs import get_logger
+
+log = get_logger(__name__)
+
+# Background tasks run by the job queue (see jobs.py). Each is referred to
+# by its import path, e.g. jobs.enqueue('tasks.archive_old_content').
+
+
+def archive_old_content():
+    """Archive one batch per retention policy, then queue the next round.
+
+    Each round is a few short transactions, so visitors' writes slip in
+    between them; once nothing is left, both databases are tidied up.
+    """
+    from models import retention
+
+    if not retention.enabled:
+        return
+    config = current_app.config
+    batch_size = config['RETENTION_BATCH_SIZE']
+    moved = {}
+    for name, policy in retention.policies.items():
+        cutoff = retention.cutoff(config['RETENTION_MONTHS'].get(name, 0))
+        if cutoff is not None:
+            moved[name] = retention.archive_batch(db.session, policy, cutoff, batch_size)
+    if any(moved.values()):
+        log.info('rows archived', extra={'rows': moved})
+    if any(count == batch_size for count in moved.values()):
+        jobs.enqueue('tasks.archive_old_content', unique=True)
+    else:
+        jobs.enqueue('tasks.optimize_databases', unique=True)
+
+
+def optimize_databases():
+    """ANALYZE the live and archive databases, and VACUUM whichever is mostly free pages"""
+    from models import retention
+
+    stats = retention.optimize(db.session, current_app.config['VACUUM_FREE_RATIO'])
+    log.info('databases optimized', extra={'databases': stats})
@@ -1,18 +1,25 @@
 import os
-from app import app, db
+from app import create_app
+from commands import init_db
+from extensions import db
 from datetime import datetime
+import models  # noqa: F401  (registers the tables with db.metadata)
 
 
 def fix_database():
     print("🔧 Fixing database issues...")
 
+    app = create_app()
     with app.app_context():
         try:
             # Drop all tables and recreate them
             db.drop_all()
+            with db.engine.begin() as connection:
+                connection.exec_driver_sql('DROP TABLE IF EXISTS schema_version')
+                connection.exec_driver_sql('DROP TABLE IF EXISTS search_index')
             print("✅ Dropped all tables")
 
-            db.create_all()
+            init_db()
             print("✅ Recreated all tables")
 
             print("🎉 Database fixed successfully!")
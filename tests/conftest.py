@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from app import create_app
+
+# The database as it was before schema migrations existed (version 0)
+BASELINE_DB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'ojoto_union.db')
+
+
+def make_app(database):
+    """An application on `database`; run `init-db` before using it"""
+    return create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': f'sqlite:///{database}'})
+
+
+@pytest.fixture
+def app(tmp_path):
+    """An application on a new database (plus its archive) in a temporary folder"""
+    app = make_app(tmp_path / 'ojoto_union.db')
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    return app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def walk_pages(app, query, url, limit=1):
+    """Every row a keyset `query()` lists, following its cursors page by page"""
+    seen, after = [], ''
+    while True:
+        with app.test_request_context(f'{url}?limit={limit}&after={after}'):
+            page = query()
+            seen.extend(page.items)
+        if not page.has_next:
+            return seen
+        after = page.next_cursor
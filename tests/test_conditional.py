@@ -0,0 +1,29 @@
+from extensions import db
+from models import CommunityPost
+
+
+def test_if_none_match_gets_304(client):
+    first = client.get('/community')
+    assert first.status_code == 200
+    assert first.headers['ETag']
+
+    again = client.get('/community', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
+    assert again.data == b''
+
+
+def test_a_write_changes_the_etag(app, client):
+    etag = client.get('/community').headers['ETag']
+    with app.app_context():
+        db.session.add(CommunityPost(title='New post', content='-', author='ada'))
+        db.session.commit()
+
+    response = client.get('/community', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert b'New post' in response.data
+
+
+def test_if_modified_since_is_ignored(client):
+    response = client.get('/community', headers={'If-Modified-Since': 'Fri, 01 Jan 2100 00:00:00 GMT'})
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
@@ -0,0 +1,38 @@
+import shutil
+import sqlite3
+
+import migrations
+from blueprints.community.queries import post_page
+from extensions import db
+from models import CommunityPost, counters, search_index
+
+from conftest import BASELINE_DB, make_app, walk_pages
+
+
+def test_init_db_upgrades_a_baseline_database(tmp_path):
+    database = tmp_path / 'ojoto_union.db'
+    shutil.copy(BASELINE_DB, database)
+    with sqlite3.connect(database) as connection:
+        # Rows written by the original app, one with a NULL sort key
+        connection.executemany(
+            'INSERT INTO community_post (title, content, author, created_at, is_pinned) VALUES (?, ?, ?, ?, ?)',
+            [('older post', '-', 'ada', '2024-01-01 00:00:00.000000', None),
+             ('newer post', '-', 'ada', '2024-02-01 00:00:00.000000', 0)],
+        )
+    connection.close()
+
+    app = make_app(database)
+    result = app.test_cli_runner().invoke(args=['init-db'])
+    assert result.exit_code == 0, result.output
+    assert f'Migration {migrations.latest_version()}' in result.output
+
+    # A request context, since search hits carry their URLs
+    with app.test_request_context():
+        assert migrations.current_version(db.session.connection()) == migrations.latest_version()
+        assert counters.get('users') == 1
+        assert CommunityPost.query.filter(CommunityPost.is_pinned.is_(None)).count() == 0
+        assert [hit.title for hit in search_index.search(db.session, 'older')] == ['older post']
+
+    # The NULL is_pinned was filled in, so the keyset seek reaches that post
+    assert [post.title for post in walk_pages(app, post_page, '/community')] == ['newer post', 'older post']
+    assert app.test_client().get('/community').status_code == 200
@@ -0,0 +1,46 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from blueprints.community.queries import post_page
+from extensions import db
+from models import CommunityPost
+from pagination import decode_cursor, encode_cursor
+
+from conftest import walk_pages
+
+
+def test_cursor_round_trip():
+    values = [True, datetime(2024, 5, 1, 12, 30, 15, 250), 42]
+    assert decode_cursor(encode_cursor(values), 3, (bool, datetime, int)) == values
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor',
+    base64.urlsafe_b64encode(b'{"a": 1}').decode(),  # not a list
+    encode_cursor([1]),  # too short
+    encode_cursor(['yesterday', 1]),  # not a date
+    encode_cursor([datetime(2024, 1, 1), 'x']),  # not an id
+    encode_cursor([datetime(2024, 1, 1), True]),  # bools aren't ids
+])
+def test_bad_cursor_is_rejected(cursor):
+    assert decode_cursor(cursor, 2, (datetime, int)) is None
+
+
+def test_bad_cursor_gives_the_first_page(client):
+    assert client.get('/community?after=garbage').status_code == 200
+    assert client.get(f'/community?after={encode_cursor(["x", "y", "z"])}').status_code == 200
+
+
+def test_pages_list_every_row_once(app):
+    with app.app_context():
+        db.session.add_all([
+            CommunityPost(title=f'post {i}', content='-', author='ada', is_pinned=i % 3 == 0,
+                          created_at=datetime(2024, 1, 1 + i % 2))
+            for i in range(7)
+        ])
+        db.session.commit()
+
+    titles = [post.title for post in walk_pages(app, post_page, '/community', limit=2)]
+    assert sorted(titles) == [f'post {i}' for i in range(7)]
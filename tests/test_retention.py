@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import Announcement, CommunityComment, CommunityPost, SiteStat, counters, retention
+
+
+def stats():
+    return {row.key: row.value for row in SiteStat.query.all()}
+
+
+def test_archive_moves_old_rows_and_keeps_counts(app):
+    old = datetime.utcnow() - timedelta(days=5 * 365)
+    with app.app_context():
+        db.session.add_all([
+            *[Announcement(title=f'old {i}', content='-', author='ada', created_at=old) for i in range(3)],
+            Announcement(title='new', content='-', author='ada'),
+            CommunityPost(title='old post', content='-', author='ada', created_at=old, comments=[
+                CommunityComment(content='-', author='bo', created_at=old) for _ in range(2)
+            ]),
+            CommunityPost(title='old pinned post', content='-', author='ada', created_at=old, is_pinned=True),
+            CommunityPost(title='new post', content='-', author='ada'),
+        ])
+        db.session.commit()
+
+        # Batches of two, so more than one round is needed
+        moved = retention.archive_all(db.session, app.config['RETENTION_MONTHS'], batch_size=2)
+        assert moved['announcements'] == 3
+        assert moved['posts'] == 1
+        assert retention.archived_count(retention.policies['announcements']) == 3
+        assert retention.archived_count(retention.policies['posts']) == 1
+
+        assert [a.title for a in Announcement.query.all()] == ['new']
+        assert sorted(p.title for p in CommunityPost.query.all()) == ['new post', 'old pinned post']
+        assert CommunityComment.query.count() == 0
+
+        # The counters adjusted while archiving match a full recount
+        adjusted = {key: value for key, value in stats().items() if value}
+        counters.reconcile(db.session)
+        assert adjusted == {key: value for key, value in stats().items() if value}
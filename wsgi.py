@@ -0,0 +1,4 @@
+"""WSGI entry point: gunicorn -c gunicorn.conf.py wsgi:application"""
+from app import create_app
+
+application = create_app()